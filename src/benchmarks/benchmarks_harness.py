@@ -0,0 +1,234 @@
+"""Benchmark harness.
+
+This module times benchmarks, summarizes them and compares them with stored baselines.
+
+A benchmark is a context manager factory: entering it opens and configures the sessions and yields a callable that
+runs one iteration of the workflow and returns the number of items it processed (points, samples, pins, ...). Only
+the iterations are timed, so the configuration does not count. The timed iterations run without tracemalloc, which
+slows down allocations; the peak memory is measured by one more iteration with tracemalloc running.
+
+Baselines are stored in a JSON file, one entry per benchmark. A result regresses when its median latency or its peak
+memory exceeds the baseline by more than a threshold. The median is compared rather than the throughput, which is
+computed over all the iterations and so moves with every outlier; the throughput can still be compared on request.
+"""
+
+# Module imports
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+
+
+class Benchmark:
+    """A workflow to benchmark.
+
+    Arguments
+    ---------
+    - name: Unique name, used as the key of the baseline.
+    - setup: Callable returning a context manager that yields the callable running one iteration.
+    - unit: Unit of the items counted by the iterations, for the report.
+    - description: One line describing what an iteration does.
+    """
+
+    def __init__(self, name, setup, unit="items", description=""):
+        self.name = name
+        self.setup = setup
+        self.unit = unit
+        self.description = description
+
+
+class BenchmarkResult:
+    """Summary of the iterations of a benchmark.
+
+    Attributes
+    ----------
+    - name, unit: Those of the benchmark.
+    - iterations: Number of timed iterations.
+    - items: Items processed by one iteration.
+    - throughput: Items processed per second, over all the timed iterations.
+    - mean, p50, p90, p99, max: Latency of one iteration, in seconds.
+    - peak_memory: Peak memory allocated by one iteration, in bytes.
+    """
+
+    FIELDS = ("iterations", "items", "throughput", "mean", "p50", "p90", "p99", "max", "peak_memory")
+
+    def __init__(self, name, unit, latencies, items, peak_memory):
+        ordered = sorted(latencies)
+        self.name = name
+        self.unit = unit
+        self.iterations = len(ordered)
+        self.items = items
+        self.throughput = items * len(ordered) / sum(ordered) if sum(ordered) > 0 else math.inf
+        self.mean = statistics.fmean(ordered)
+        self.p50 = _percentile(ordered, 50)
+        self.p90 = _percentile(ordered, 90)
+        self.p99 = _percentile(ordered, 99)
+        self.max = ordered[-1]
+        self.peak_memory = peak_memory
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        return (f"BenchmarkResult({self.name!r}, throughput={self.throughput:.3e} {self.unit}/s, p50={self.p50:.3e}, "
+                f"p99={self.p99:.3e}, peak_memory={self.peak_memory})")
+
+
+class Regression:
+    """A metric of a result that is worse than its baseline by more than the threshold."""
+
+    def __init__(self, name, metric, baseline, value):
+        self.name = name
+        self.metric = metric
+        self.baseline = baseline
+        self.value = value
+
+    @property
+    def change(self):
+        """Relative change from the baseline (positive: worse)."""
+        if self.metric == "throughput":
+            return self.baseline / self.value - 1 if self.value else math.inf
+        return self.value / self.baseline - 1 if self.baseline else math.inf
+
+    def __repr__(self):
+        return f"Regression({self.name!r}, {self.metric}: {self.baseline:.3e} -> {self.value:.3e}, {self.change:+.1%})"
+
+
+def run_benchmark(benchmark, iterations=50, warmup=5, min_time=0.0):
+    """Run a benchmark and return its BenchmarkResult.
+
+    Arguments
+    ---------
+    - benchmark: Benchmark to run.
+    - iterations: Minimum number of timed iterations.
+    - warmup: Number of iterations run first, untimed (caches, lazy imports, ...).
+    - min_time: Minimum total time of the timed iterations, in seconds; more iterations are run until it is reached.
+    """
+    with benchmark.setup() as iteration:
+        for _ in range(warmup):
+            iteration()
+
+        # Collections triggered by earlier benchmarks should not land in this one
+        gc.collect()
+        latencies = []
+        items = 0
+        while len(latencies) < iterations or sum(latencies) < min_time:
+            start = time.perf_counter()
+            items = iteration()
+            latencies.append(time.perf_counter() - start)
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline_memory = tracemalloc.get_traced_memory()[0]
+        iteration()
+        peak_memory = tracemalloc.get_traced_memory()[1] - baseline_memory
+        if not tracing:
+            tracemalloc.stop()
+
+    return BenchmarkResult(benchmark.name, benchmark.unit, latencies, items, peak_memory)
+
+
+def compare(results, baseline, threshold=0.10, metrics=("p50", "peak_memory")):
+    """Return the Regression of every metric of the results that is worse than the baseline by more than 'threshold'.
+
+    Arguments
+    ---------
+    - results: BenchmarkResult list.
+    - baseline: Dictionary of benchmark name to its stored metrics (see BaselineStore); benchmarks without a baseline
+      are skipped.
+    - threshold: Relative change allowed, e.g. 0.10 for 10 %.
+    - metrics: Metrics compared (BenchmarkResult.FIELDS). Latencies and memory regress when they increase, throughput
+      when it decreases.
+    """
+    regressions = []
+    for result in results:
+        stored = baseline.get(result.name)
+        if stored is None:
+            continue
+        for metric in metrics:
+            regression = Regression(result.name, metric, stored[metric], getattr(result, metric))
+            if regression.change > threshold:
+                regressions.append(regression)
+    return regressions
+
+
+class BaselineStore:
+    """Baseline results, stored in a JSON file.
+
+    Arguments
+    ---------
+    - path: Path of the JSON file; neither it nor its directory needs to exist yet.
+
+    Attributes
+    ----------
+    - results: Dictionary of benchmark name to its metrics (BenchmarkResult.FIELDS).
+    - machine: Description of the machine the baselines were measured on, as returned by machine_info().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.results = {}
+        self.machine = {}
+        if os.path.exists(path):
+            with open(path) as file:
+                contents = json.load(file)
+            self.results = contents.get("results", {})
+            self.machine = contents.get("machine", {})
+
+    def update(self, results):
+        """Replace the baselines of the given results; the others are kept."""
+        for result in results:
+            self.results[result.name] = result.to_dict()
+        self.machine = machine_info()
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump({"machine": self.machine, "results": self.results}, file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.path)
+
+
+def machine_info():
+    """Return what identifies the machine and interpreter, since baselines are only comparable on the same ones."""
+    return {"node": platform.node(), "machine": platform.machine(), "processor": platform.processor(),
+            "python": platform.python_version(), "implementation": platform.python_implementation()}
+
+
+def format_results(results, regressions=()):
+    """Return a table of the results, with the regressed metrics flagged."""
+    flagged = {(regression.name, regression.metric) for regression in regressions}
+
+    def cell(result, metric, text):
+        return text + (" !" if (result.name, metric) in flagged else "")
+
+    lines = [f"{'Benchmark':<32}{'Throughput':>22}{'p50':>14}{'p90':>12}{'p99':>12}{'Peak memory':>16}"]
+    for result in results:
+        lines.append(f"{result.name:<32}"
+                     f"{cell(result, 'throughput', f'{result.throughput:.3e} {result.unit}/s'):>22}"
+                     f"{cell(result, 'p50', _format_time(result.p50)):>14}"
+                     f"{_format_time(result.p90):>12}"
+                     f"{_format_time(result.p99):>12}"
+                     f"{cell(result, 'peak_memory', f'{result.peak_memory / 1024:.1f} KiB'):>16}")
+    return "\n".join(lines)
+
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def _percentile(ordered, percent):
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return math.nan
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
@@ -0,0 +1,361 @@
+"""Benchmark suite of the example workflows.
+
+This example benchmarks the hot path of every example workflow against the simulated sessions of src/simulated, so it
+runs on any machine and measures the Python code of the examples and helpers rather than the instruments:
+
+- nidcpower.sequence_sweep: hardware-timed voltage sweep, fetched and its voltages extracted into a list.
+- nidcpower.pulse_train: sequence of voltage pulses, fetched and their voltages extracted into a list.
+- nidcpower.transient_record: continuous measure record fetched and its voltages converted to an array.
+- niscope.read_plot_prep: read() of a record, wrapped with samples_view() and its time axis.
+- niscope.segmented_fetch: multi-record acquisition fetched in chunks into a preallocated array.
+- nidmm.waveform_fetch: waveform acquisition read with read_status() and fetch_waveform() on two DMMs.
+- niswitch.software_scan: scan list advanced by software triggers until the scan completes.
+- niswitch.dmm_handshaking_scan: continuous scan handshaking with a DMM, whose backlog is read and fetched.
+- nidigital.continuity_leakage: continuity and leakage steps of a multi-site pin map, evaluated against their limits.
+- nisyscfg.inventory: hardware inventory of a system with several chassis, in a single query.
+- nisyscfg.fleet_inventory: hardware and software inventory of many targets, collected concurrently.
+
+The simulated driver calls take no time by default (their latency is only accounted), so the results reflect the
+code that runs on the test stations; --realtime makes them wait for the modeled time as well.
+
+Results are compared with the baselines of the machine, and any metric worse than its baseline by more than the
+threshold (20 % by default, above the run-to-run noise of a busy machine) is flagged; the script then exits with status
+1, so it can gate a change. Baselines are only comparable on the machine they were measured on, so none is stored with
+the examples: the first run measures them, in ~/.nidriver-python-examples/benchmarks_baseline.json unless --baseline
+gives another file. Update them with --update-baseline after an intended change.
+"""
+
+# Module imports
+import contextlib
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmarks_harness import Benchmark, BaselineStore, compare, format_results, machine_info, run_benchmark
+
+SOURCE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLE_DIRECTORIES = ("simulated", "niscope", os.path.join("nidigital", "Continuity and Leakage"), "nisyscfg")
+DEFAULT_BASELINE_PATH = os.path.join(os.path.expanduser("~"), ".nidriver-python-examples", "benchmarks_baseline.json")
+
+for directory in EXAMPLE_DIRECTORIES:
+    if os.path.join(SOURCE_DIRECTORY, directory) not in sys.path:
+        sys.path.append(os.path.join(SOURCE_DIRECTORY, directory))
+
+
+@contextlib.contextmanager
+def dcpower_sequence_sweep(points=1000):
+    import nidcpower
+
+    with nidcpower.Session(resource_name="PXI1Slot2", channels="0", seed=0) as session:
+        session.source_mode = nidcpower.SourceMode.SEQUENCE
+        session.output_function = nidcpower.OutputFunction.DC_VOLTAGE
+        session.current_limit = 0.01
+        session.set_sequence(values=list(np.linspace(1.0, 5.0, points)), source_delays=[0.005] * points)
+
+        def iteration():
+            with session.initiate():
+                session.wait_for_event(event_id=nidcpower.Event.SEQUENCE_ENGINE_DONE, timeout=10)
+                measurements = session.fetch_multiple(count=points)
+            measured_voltage = [measurement[0] for measurement in measurements]
+            return len(measured_voltage)
+
+        yield iteration
+
+
+@contextlib.contextmanager
+def dcpower_pulse_train(pulses=500):
+    import nidcpower
+
+    with nidcpower.Session(resource_name="PXI1Slot3", channels="0", seed=0) as session:
+        session.source_mode = nidcpower.SourceMode.SEQUENCE
+        session.output_function = nidcpower.OutputFunction.PULSE_VOLTAGE
+        session.pulse_current_limit = 10e-3
+        session.pulse_on_time = 200e-6
+        session.pulse_off_time = 50e-6
+        session.configure_aperture_time(aperture_time=0.1e-3, units=nidcpower.ApertureTimeUnits.SECONDS)
+        session.set_sequence(values=[2.0] * pulses, source_delays=[50e-6] * pulses)
+
+        def iteration():
+            with session.initiate():
+                session.wait_for_event(event_id=nidcpower.Event.SEQUENCE_ENGINE_DONE)
+                measurements = session.fetch_multiple(count=pulses)
+            voltage_points = [measurement[0] for measurement in measurements]
+            return len(voltage_points)
+
+        yield iteration
+
+
+@contextlib.contextmanager
+def dcpower_transient_record(record_length=5000):
+    import nidcpower
+
+    with nidcpower.Session(resource_name="PXI1Slot2", channels=0, reset=True, seed=0) as session:
+        session.source_mode = nidcpower.SourceMode.SEQUENCE
+        session.output_function = nidcpower.OutputFunction.DC_VOLTAGE
+        session.voltage_level_range = 6
+        session.aperture_time = 0
+        session.set_sequence([0, 1, 2], [1e-3, 1e-3, 0])
+        session.measure_when = nidcpower.MeasureWhen.ON_MEASURE_TRIGGER
+        session.measure_trigger_type = nidcpower.TriggerType.DIGITAL_EDGE
+        session.measure_record_length = record_length
+        session.measure_record_length_is_finite = False
+
+        def iteration():
+            with session.initiate():
+                measurements = session.channels[0].fetch_multiple(count=session.measure_record_length)
+            voltage_points = np.fromiter((measurement[0] for measurement in measurements), np.float64, len(measurements))
+            return voltage_points.size
+
+        yield iteration
+
+
+@contextlib.contextmanager
+def scope_read_plot_prep(num_samples=100000):
+    import niscope
+    from niscope_waveform_numpy import samples_view, waveform_time_axis
+
+    with niscope.Session(resource_name="PXI1Slot4", seed=0) as session:
+        session.configure_vertical(range=5.0, coupling=niscope.VerticalCoupling.AC)
+        session.configure_horizontal_timing(min_sample_rate=50000000, min_num_pts=num_samples, ref_position=50.0,
+                                            num_records=1, enforce_realtime=True)
+
+        def iteration():
+            waveforms = session.channels["1"].read(num_samples=num_samples)
+            samples = samples_view(waveforms[0])
+            x_time = waveform_time_axis(waveforms[0])
+            return min(samples.size, x_time.size)
+
+        yield iteration
+
+
+@contextlib.contextmanager
+def scope_segmented_fetch(num_records=1000, num_samples=1000):
+    import niscope
+    from niscope_segmented_acquisition import configure_segmented_acquisition, fetch_records
+    from niscope_waveform_numpy import allocate_samples
+
+    with niscope.Session(resource_name="PXI1Slot4", seed=0) as session:
+        configure_segmented_acquisition(session, num_records, num_samples, min_sample_rate=250e6)
+        session.configure_trigger_edge(trigger_source="0", level=0.0, trigger_coupling=niscope.TriggerCoupling.DC)
+        out = allocate_samples(num_samples, num_records)
+
+        def iteration():
+            with session.initiate():
+                records = fetch_records(session.channels["0"], num_records, num_samples, out=out)
+            return records.num_records * num_samples
+
+        yield iteration
+
+
+@contextlib.contextmanager
+def dmm_waveform_fetch(waveform_points=10000):
+    import nidmm
+
+    with nidmm.Session(resource_name="PXI1Slot5", seed=0) as dmm1, nidmm.Session(resource_name="PXI1Slot6", seed=1) as dmm2:
+        sessions = [dmm1, dmm2]
+        for session in sessions:
+            session.configure_waveform_acquisition(measurement_function=nidmm.Function.WAVEFORM_VOLTAGE, range=10,
+                                                   rate=1e6, waveform_points=waveform_points)
+            session.configure_trigger(trigger_source=nidmm.TriggerSource.IMMEDIATE)
+
+        def iteration():
+            measurements = []
+            for session in sessions:
+                session.initiate()
+            for session in sessions:
+                backlog, acquisition_state = session.read_status()
+                measurements.append(np.asarray(session.fetch_waveform(backlog)))
+            for session in sessions:
+                session.abort()
+            return sum(measurement.size for measurement in measurements)
+
+        yield iteration
+
+
+@contextlib.contextmanager
+def switch_software_scan(num_channels=16):
+    import niswitch
+
+    with niswitch.Session(resource_name="PXI2564", topology="2564/16-SPST", simulate=False, reset_device=False) as session:
+        session.scan_list = "".join(f"ch{channel}->com{channel};" for channel in range(num_channels))
+        session.trigger_input = niswitch.TriggerInput.SOFTWARE_TRIG
+        session.continuous_scan = False
+
+        def iteration():
+            scanned = 0
+            with session.initiate():
+                while session.is_scanning:
+                    session.send_software_trigger()
+                    scanned += 1
+            return scanned
+
+        yield iteration
+
+
+@contextlib.contextmanager
+def switch_dmm_handshaking_scan(num_channels=16, samples_to_fetch=5):
+    import nidmm
+    import niswitch
+
+    with niswitch.Session(resource_name="PXI2564", topology="2564/16-SPST", simulate=False, reset_device=True) as switch_session, \
+            nidmm.Session(resource_name="DMM", id_query=False, reset_device=False, seed=0) as dmm_session:
+        switch_session.trigger_input = niswitch.TriggerInput.TTL0
+        switch_session.scan_advanced_output = niswitch.ScanAdvancedOutput.TTL1
+        switch_session.continuous_scan = True
+        switch_session.scan_list = "".join(f"ch{channel}->com{channel};" for channel in range(num_channels))
+        switch_session.commit()
+        dmm_session.configure_measurement_absolute(measurement_function=nidmm.Function.DC_VOLTS, range=10.0, resolution_absolute=1e-3)
+        dmm_session.configure_trigger(trigger_source=nidmm.TriggerSource.PXI_TRIG1)
+        # A sample count of 0 acquires continuously, as long as the switch scans
+        dmm_session.configure_multi_point(trigger_count=1, sample_count=0, sample_trigger=nidmm.SampleTrigger.IMMEDIATE)
+        dmm_session.meas_complete_dest = nidmm.MeasurementCompleteDest.PXI_TRIG0
+
+        def iteration():
+            with dmm_session.initiate(), switch_session.initiate():
+                backlog, acquisition_state = dmm_session.read_status()
+                measurements = dmm_session.fetch_multi_point(array_size=max(backlog, samples_to_fetch), maximum_time=5000)
+            return len(measurements)
+
+        yield iteration
+
+
+@contextlib.contextmanager
+def ppmu_continuity_leakage(num_sites=8, num_dut_pins=16):
+    import nidigital
+    from nidigital_parametric_flow import ParametricFlow, continuity_and_leakage_steps
+    from nidigital_pin_map import load_pin_map
+
+    with tempfile.TemporaryDirectory() as directory:
+        pin_map_path = os.path.join(directory, "Benchmark.pinmap")
+        with open(pin_map_path, "w") as pin_map_file:
+            pin_map_file.write(_pin_map(num_sites, num_dut_pins))
+
+        with nidigital.Session(resource_name="PXIe6570", reset_device=False, options={}, seed=0) as session:
+            pin_map = load_pin_map(session, pin_map_path)
+            flow = ParametricFlow(session, pin_map)
+            steps = continuity_and_leakage_steps()
+
+            def iteration():
+                step_results = flow.run(steps)
+                return sum(step_result.results.size for step_result in step_results)
+
+            yield iteration
+            flow.disconnect()
+
+
+@contextlib.contextmanager
+def syscfg_inventory(num_chassis=4):
+    import nisyscfg
+    from nisyscfg_inventory import read_inventory
+
+    target = "benchmark-station"
+    nisyscfg.systems[target] = nisyscfg.default_system(target, num_chassis, {slot: "PXIe-4139" for slot in range(2, 19)})
+    try:
+        def iteration():
+            with nisyscfg.Session(target=target) as session:
+                inventory = read_inventory(session, target)
+            modules = {chassis.name: inventory.modules(chassis.name) for chassis in inventory.chassis}
+            return len(inventory.chassis) + sum(len(chassis_modules) for chassis_modules in modules.values())
+
+        yield iteration
+    finally:
+        del nisyscfg.systems[target]
+
+
+@contextlib.contextmanager
+def syscfg_fleet_inventory(num_targets=16):
+    from nisyscfg_multi_target_inventory import InventoryCollector
+
+    targets = [f"station{index:02d}" for index in range(num_targets)]
+    collector = InventoryCollector(max_workers=8, timeout=30)
+
+    def iteration():
+        snapshot = collector.collect(targets)
+        if snapshot.failed:
+            raise RuntimeError(f"Inventory failed on {', '.join(snapshot.failed)}.")
+        return len(snapshot.devices())
+
+    yield iteration
+
+
+BENCHMARKS = [Benchmark("nidcpower.sequence_sweep", dcpower_sequence_sweep, "points", "1000-point voltage sweep"),
+              Benchmark("nidcpower.pulse_train", dcpower_pulse_train, "pulses", "500 voltage pulses"),
+              Benchmark("nidcpower.transient_record", dcpower_transient_record, "samples", "5000-sample measure record"),
+              Benchmark("niscope.read_plot_prep", scope_read_plot_prep, "samples", "100k-sample read()"),
+              Benchmark("niscope.segmented_fetch", scope_segmented_fetch, "samples", "1000 records of 1000 samples"),
+              Benchmark("nidmm.waveform_fetch", dmm_waveform_fetch, "points", "2 DMMs, 10k-point waveforms"),
+              Benchmark("niswitch.software_scan", switch_software_scan, "channels", "16-entry scan list"),
+              Benchmark("niswitch.dmm_handshaking_scan", switch_dmm_handshaking_scan, "readings",
+                        "continuous 16-channel scan with a DMM"),
+              Benchmark("nidigital.continuity_leakage", ppmu_continuity_leakage, "measurements", "8 sites x 16 pins, 4 steps"),
+              Benchmark("nisyscfg.inventory", syscfg_inventory, "devices", "4 chassis of 17 modules"),
+              Benchmark("nisyscfg.fleet_inventory", syscfg_fleet_inventory, "devices", "16 targets")]
+
+
+def run_suite(names=None, iterations=50, warmup=5, min_time=0.0, realtime=False):
+    """Run the benchmarks (all of them, or those whose name starts with one of 'names') and return their results."""
+    import simulated_session
+
+    simulated_session.install(timing=simulated_session.TimingModel(realtime=realtime))
+    try:
+        selected = [benchmark for benchmark in BENCHMARKS
+                    if not names or any(benchmark.name.startswith(name) for name in names)]
+        return [run_benchmark(benchmark, iterations, warmup, min_time) for benchmark in selected]
+    finally:
+        simulated_session.uninstall()
+
+
+def _pin_map(num_sites, num_dut_pins):
+    """Contents of a pin map with the groups of the continuity and leakage steps, on 'num_sites' sites."""
+    power_pins = ["Vcc", "Vdd"]
+    dut_pins = [f"IO{index}" for index in range(num_dut_pins)]
+    pins = power_pins + dut_pins
+
+    def group(name, members):
+        return f'<PinGroup name="{name}">' + "".join(f'<PinReference pin="{pin}" />' for pin in members) + "</PinGroup>"
+
+    connections = "".join(f'<Connection pin="{pin}" siteNumber="{site}" instrument="PXIe6570" channel="{site * len(pins) + index}" />'
+                          for site in range(num_sites) for index, pin in enumerate(pins))
+    return ('<?xml version="1.0" encoding="utf-8"?>'
+            '<PinMap xmlns="http://www.ni.com/TestStand/SemiconductorModule/PinMap.xsd" schemaVersion="1.5">'
+            f'<Instruments><NIDigitalPatternInstrument name="PXIe6570" numberOfChannels="{num_sites * len(pins)}" group="Digital" /></Instruments>'
+            '<Pins>' + "".join(f'<DUTPin name="{pin}" />' for pin in pins) + '</Pins>'
+            '<PinGroups>' + group("Power", power_pins) + group("DUTPins", dut_pins) + group("All_Pins", pins) + '</PinGroups>'
+            '<Sites>' + "".join(f'<Site siteNumber="{site}" />' for site in range(num_sites)) + '</Sites>'
+            f'<Connections>{connections}</Connections></PinMap>')
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the example workflows against simulated sessions.")
+    parser.add_argument("names", nargs="*", help="Run only the benchmarks whose name starts with one of these.")
+    parser.add_argument("--iterations", type=int, default=50, help="Minimum number of timed iterations.")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum timed duration of a benchmark, in seconds.")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Relative regression flagged, e.g. 0.20 for 20 %%.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline JSON file.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baselines.")
+    parser.add_argument("--realtime", action="store_true", help="Wait for the modeled time of the driver calls.")
+    arguments = parser.parse_args()
+
+    results = run_suite(arguments.names, arguments.iterations, min_time=arguments.min_time, realtime=arguments.realtime)
+    store = BaselineStore(arguments.baseline)
+    regressions = compare(results, store.results, arguments.threshold)
+    print(format_results(results, regressions))
+
+    if store.machine and store.machine != machine_info():
+        print(f"\nBaselines were measured on another machine ({store.machine.get('node')}); comparisons are indicative only.")
+    missing = [result.name for result in results if result.name not in store.results]
+    if missing:
+        print(f"\nNo baseline for: {', '.join(missing)}")
+    for regression in regressions:
+        print(f"REGRESSION {regression.name} {regression.metric}: {regression.baseline:.3e} -> {regression.value:.3e} ({regression.change:+.1%})")
+
+    if arguments.update_baseline or not store.results:
+        store.update(results)
+        store.save()
+        print(f"\nBaselines saved to {arguments.baseline}")
+    elif regressions:
+        sys.exit(1)
@@ -11,18 +11,23 @@ Should the PinMap be changed, make sure to update the code appropriately.
 import nidigital
 import os
 
+from nidigital_pin_map import load_pin_map
+from nidigital_ppmu_results import PinResultsEvaluator, format_results
+
 force_current = 100e-6
 high_limit = 0.8  # diode forward voltage high limit
 low_limit = 0.0   # diode forward voltage low limit
+force_currents = [force_current, force_current * -1]  # positive and negative clamping diodes
 voltages = []     # list that stores voltage measurements
-pass_fail = ""
 
 with nidigital.Session(resource_name="PXIe6570", reset_device=False, options={}) as session:
     # Store directory path
     dir = os.path.join(os.path.dirname(__file__))
 
     pin_map_filename = os.path.join(dir, 'PinMap.pinmap')
-    session.load_pin_map(file_path=pin_map_filename)
+    # The pin map is parsed once and only loaded if the session does not already have the same pin map loaded
+    pin_map = load_pin_map(session, pin_map_filename)
+    pin_map.require("All_Pins", "Power", "DUTPins")
 
     # Set all pins to PPMU mode
     session.channels["All_Pins"].selected_function = nidigital.SelectedFunction.PPMU
@@ -40,28 +45,16 @@ with nidigital.Session(resource_name="PXIe6570", reset_device=False, options={})
     session.channels["DUTPins"].ppmu_voltage_limit_low = -1.5
     session.channels["DUTPins"].ppmu_voltage_limit_high = 1.5
     session.channels["DUTPins"].ppmu_output_function = nidigital.PPMUOutputFunction.CURRENT
-    session.channels["DUTPins"].ppmu_current_level = force_current
     pin_info = session.channels["DUTPins"].get_pin_results_pin_information()
 
-    # Loop twice to test the positive and negative clamping diodes
-    for i in range(2):
+    # Test the positive, then the negative clamping diodes
+    for current in force_currents:
+        session.channels["DUTPins"].ppmu_current_level = current
         session.channels["DUTPins"].ppmu_source()
         voltages.append(session.channels["DUTPins"].ppmu_measure(measurement_type=nidigital.PPMUMeasurementType.VOLTAGE))
 
-        # Loop through each pin data and display the measurement results
-        for j in range(len(pin_info)):
-
-            # Compare measurement result to limits and determine pass or failure with possible cause
-            if abs(voltages[i][j]) >= abs(low_limit) and abs(voltages[i][j]) <= abs(high_limit):
-                pass_fail = "Pass"
-            else:
-                pass_fail = "Fail"
-
-            print(f'{pin_info[j][0]} on Site {pin_info[j][1]} '
-                  f'@ {session.channels["DUTPins"].ppmu_current_level:.3e} A: '
-                  f'{voltages[i][j]:.3f} V --> {pass_fail}')
+    # Compare all measurement results to the limits at once. The magnitudes are compared, so the same limits apply to both diodes
+    results = PinResultsEvaluator(pin_info).evaluate(voltages, conditions=force_currents, low_limit=low_limit, high_limit=high_limit, absolute=True)
+    print("\n".join(format_results(results, condition_unit="A", measurement_unit="V")))
 
-        # Negate all values to test negative clamping diode
-        session.channels["DUTPins"].ppmu_current_level = force_current * -1     
-    
     session.channels[""].selected_function = nidigital.SelectedFunction.DISCONNECT
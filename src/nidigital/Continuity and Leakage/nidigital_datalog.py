@@ -0,0 +1,322 @@
+"""NI-Digital PPMU binary datalog.
+
+This module stores PPMU results (one record per DUT, test, site and pin) in a compact, columnar binary file instead of
+printing them.
+
+Results are appended to an in-memory buffer; full buffers are handed to a writer thread, which writes them as a chunk
+with one contiguous array per column. The pin and test names added since the previous chunk are written just before
+it, so the datalog can be read by name even if the run is interrupted. An index (JSON, next to the datalog, written on
+close) records, for every chunk, its location, its range of DUT ids and its test numbers, together with all the names.
+Reading back only maps the chunks and columns that are needed, and yield can be computed with NumPy without parsing any
+text.
+
+File layout:
+- <name>.dlog: FILE_MAGIC, then records. A chunk is CHUNK_MAGIC, its number of rows (uint32), and one array per column
+  of COLUMNS, in order. A names record is NAMES_MAGIC, its length (uint32) and JSON: {"pins": [[index, name], ...],
+  "tests": {number: name}}.
+- <name>.dlog.index.json: pins, tests and chunk index. If it is missing (interrupted run), the records are scanned instead.
+"""
+
+# Module imports
+import json
+import os
+import queue
+import threading
+
+import numpy as np
+
+FILE_MAGIC = b"NIDIGITAL-DLOG\n\0"
+CHUNK_MAGIC = b"DLCHUNK\0"
+NAMES_MAGIC = b"DLNAMES\0"
+INDEX_SUFFIX = ".index.json"
+COLUMNS = [("dut_id", "<u8"),
+           ("test_number", "<u4"),
+           ("site", "<u2"),
+           ("pin", "<u2"),
+           ("condition", "<f8"),
+           ("measurement", "<f8"),
+           ("low_limit", "<f8"),
+           ("high_limit", "<f8"),
+           ("passed", "?")]
+ROW_DTYPE = np.dtype(COLUMNS)
+
+
+class DatalogWriter:
+    """Append PPMU results to a datalog from a background writer thread.
+
+    Arguments
+    ---------
+    - path: Path of the datalog file.
+    - chunk_records: Number of records buffered before a chunk is written.
+    - num_buffers: Number of chunk buffers, which is how far logging can get ahead of the disk.
+    """
+
+    def __init__(self, path, chunk_records=65536, num_buffers=4):
+        self.path = path
+        self.chunk_records = chunk_records
+        self.records_logged = 0
+        self.pins = []          # pin index -> pin name
+        self.tests = {}         # test number -> test name
+        self.chunks = []        # chunk index entries
+        self._pin_indices = {}
+        self._new_pins = []     # (index, name) of the pins not yet written to the datalog
+        self._new_tests = {}    # test number -> name, not yet written to the datalog
+
+        self._free = queue.Queue()
+        for _ in range(num_buffers):
+            self._free.put(np.empty(chunk_records, dtype=ROW_DTYPE))
+        self._filled = queue.Queue()
+        self._buffer = self._free.get()
+        self._count = 0
+        self._error = None
+
+        self._file = open(path, "wb")
+        self._file.write(FILE_MAGIC)
+        self._offset = len(FILE_MAGIC)
+        self._thread = threading.Thread(target=self._write, name="nidigital-datalog-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def log(self, dut_id, test_number, results, test_name=None):
+        """Append a result table of nidigital_ppmu_results (any shape) for one insertion and test number.
+
+        'dut_id' is the DUT id of the insertion, or a dictionary of site number to the DUT id tested on that site.
+        """
+        if self._error is not None:
+            raise self._error
+        if test_name is not None and self.tests.get(int(test_number)) != test_name:
+            self.tests[int(test_number)] = test_name
+            self._new_tests[int(test_number)] = test_name
+        results = results.reshape(-1)
+        if isinstance(dut_id, dict):
+            sites, site_inverse = np.unique(results["site"], return_inverse=True)
+            dut_ids = np.array([dut_id[int(site)] for site in sites], dtype=np.uint64)[site_inverse.reshape(-1)]
+        else:
+            dut_ids = np.full(results.size, dut_id, dtype=np.uint64)
+        pins, inverse = np.unique(results["pin"], return_inverse=True)
+        pin_indices = np.array([self._pin_index(pin) for pin in pins], dtype=np.uint16)[inverse]
+
+        start = 0
+        while start < results.size:
+            count = min(results.size - start, self.chunk_records - self._count)
+            rows = self._buffer[self._count:self._count + count]
+            selected = results[start:start + count]
+            rows["dut_id"] = dut_ids[start:start + count]
+            rows["test_number"] = test_number
+            rows["site"] = selected["site"]
+            rows["pin"] = pin_indices[start:start + count]
+            for column in ("condition", "measurement", "low_limit", "high_limit", "passed"):
+                rows[column] = selected[column]
+            self._count += count
+            start += count
+            if self._count == self.chunk_records:
+                self.flush()
+        self.records_logged += results.size
+
+    def flush(self):
+        """Hand the buffered records, preceded by the names they use for the first time, to the writer thread."""
+        if self._count:
+            if self._new_pins or self._new_tests:
+                self._filled.put({"pins": self._new_pins, "tests": self._new_tests})
+                self._new_pins, self._new_tests = [], {}
+            self._filled.put((self._buffer, self._count))
+            self._buffer = self._free.get()
+            self._count = 0
+
+    def close(self):
+        """Write the remaining records and the index, then close the datalog."""
+        if self._thread is None:
+            return
+        self.flush()
+        self._filled.put(None)
+        self._thread.join()
+        self._thread = None
+        self._file.close()
+        with open(self.path + INDEX_SUFFIX, "w") as index_file:
+            json.dump({"pins": self.pins, "tests": self.tests, "chunks": self.chunks}, index_file)
+        if self._error is not None:
+            raise self._error
+
+    def _pin_index(self, pin):
+        if pin not in self._pin_indices:
+            self._pin_indices[pin] = len(self.pins)
+            self._new_pins.append((len(self.pins), str(pin)))
+            self.pins.append(str(pin))
+        return self._pin_indices[pin]
+
+    def _write(self):
+        """Writer thread: write every filled buffer as one columnar chunk, and every names record."""
+        while True:
+            item = self._filled.get()
+            if item is None:
+                break
+            if isinstance(item, dict):
+                try:
+                    if self._error is None:
+                        names = json.dumps(item).encode()
+                        self._file.write(NAMES_MAGIC + len(names).to_bytes(4, "little") + names)
+                        self._offset += len(NAMES_MAGIC) + 4 + len(names)
+                except Exception as error:
+                    self._error = error
+                continue
+            buffer, count = item
+            try:
+                if self._error is None:
+                    rows = buffer[:count]
+                    self._file.write(CHUNK_MAGIC + count.to_bytes(4, "little"))
+                    for column, _ in COLUMNS:
+                        self._file.write(np.ascontiguousarray(rows[column]).tobytes())
+                    # Complete chunks reach the file even if the run is interrupted before close()
+                    self._file.flush()
+                    self.chunks.append({"offset": self._offset, "records": count,
+                                        "dut_min": int(rows["dut_id"].min()), "dut_max": int(rows["dut_id"].max()),
+                                        "tests": np.unique(rows["test_number"]).tolist()})
+                    self._offset += len(CHUNK_MAGIC) + 4 + count * ROW_DTYPE.itemsize
+            except Exception as error:
+                self._error = error
+            finally:
+                self._free.put(buffer)
+
+
+class DatalogReader:
+    """Read back a datalog, column by column.
+
+    Attributes
+    ----------
+    - pins: Pin names, indexed by the 'pin' column.
+    - tests: Dictionary of test number to test name.
+    - chunks: Chunk index entries.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        index_path = path + INDEX_SUFFIX
+        if os.path.exists(index_path):
+            with open(index_path) as index_file:
+                index = json.load(index_file)
+            self.pins = index["pins"]
+            self.tests = {int(number): name for number, name in index["tests"].items()}
+            self.chunks = index["chunks"]
+        else:
+            self.pins, self.tests, self.chunks = self._scan()
+
+    def read(self, columns=None, dut_ids=None, test_numbers=None):
+        """Return a dictionary of column name to array, for the selected DUTs and tests (all by default).
+
+        Chunks whose DUT range or tests cannot match the selection are not read at all.
+        """
+        columns = columns or [column for column, _ in COLUMNS]
+        wanted_duts = None if dut_ids is None else np.asarray(list(dut_ids), dtype=np.uint64)
+        wanted_tests = None if test_numbers is None else np.asarray(list(test_numbers), dtype=np.uint32)
+        parts = {column: [] for column in columns}
+
+        for chunk in self.chunks:
+            if wanted_duts is not None and not np.any((wanted_duts >= chunk["dut_min"]) & (wanted_duts <= chunk["dut_max"])):
+                continue
+            if wanted_tests is not None and not np.isin(wanted_tests, chunk["tests"]).any():
+                continue
+            mask = None
+            if wanted_duts is not None:
+                mask = np.isin(self._column(chunk, "dut_id"), wanted_duts)
+            if wanted_tests is not None:
+                test_mask = np.isin(self._column(chunk, "test_number"), wanted_tests)
+                mask = test_mask if mask is None else mask & test_mask
+            for column in columns:
+                values = self._column(chunk, column)
+                parts[column].append(values if mask is None else values[mask])
+
+        return {column: np.concatenate(values) if values else np.empty(0, dtype=ROW_DTYPE[column])
+                for column, values in parts.items()}
+
+    def yield_by_test(self):
+        """Return a dictionary of test number to the fraction of parts that passed it on every pin.
+
+        A part is a DUT id on a site, so the parts tested together in a multi-site insertion logged under a single DUT id
+        are counted separately.
+        """
+        data = self.read(["dut_id", "site", "test_number", "passed"])
+        parts = np.stack([data["test_number"].astype(np.uint64), data["dut_id"], data["site"].astype(np.uint64)])
+        keys, inverse = np.unique(parts, axis=1, return_inverse=True)
+        # A part passes a test only if all of its records for that test passed
+        dut_passed = np.ones(keys.shape[1], dtype=bool)
+        np.logical_and.at(dut_passed, inverse.reshape(-1), data["passed"])
+        tests, test_inverse = np.unique(keys[0], return_inverse=True)
+        passed = np.bincount(test_inverse.reshape(-1), weights=dut_passed)
+        total = np.bincount(test_inverse.reshape(-1))
+        return {int(test): float(p / t) for test, p, t in zip(tests, passed, total)}
+
+    def _column(self, chunk, column):
+        """Memory-map one column of one chunk."""
+        offset = chunk["offset"] + len(CHUNK_MAGIC) + 4
+        for name, dtype in COLUMNS:
+            if name == column:
+                return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=(chunk["records"],))
+            offset += np.dtype(dtype).itemsize * chunk["records"]
+        raise KeyError(f"Unknown datalog column '{column}'.")
+
+    def _scan(self):
+        """Rebuild the names and the chunk index by walking the records, for datalogs without an index file."""
+        pins = {}
+        tests = {}
+        chunks = []
+        size = os.path.getsize(self.path)
+        with open(self.path, "rb") as datalog_file:
+            if datalog_file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"{self.path} is not a datalog file.")
+            offset = len(FILE_MAGIC)
+            while offset + len(CHUNK_MAGIC) + 4 <= size:
+                datalog_file.seek(offset)
+                header = datalog_file.read(len(CHUNK_MAGIC) + 4)
+                if header[:len(NAMES_MAGIC)] == NAMES_MAGIC:
+                    length = int.from_bytes(header[len(NAMES_MAGIC):], "little")
+                    if offset + len(NAMES_MAGIC) + 4 + length > size:
+                        break
+                    names = json.loads(datalog_file.read(length))
+                    pins.update((index, name) for index, name in names["pins"])
+                    tests.update((int(number), name) for number, name in names["tests"].items())
+                    offset += len(NAMES_MAGIC) + 4 + length
+                    continue
+                if header[:len(CHUNK_MAGIC)] != CHUNK_MAGIC:
+                    break
+                records = int.from_bytes(header[len(CHUNK_MAGIC):], "little")
+                end = offset + len(CHUNK_MAGIC) + 4 + records * ROW_DTYPE.itemsize
+                if end > size:
+                    break   # last chunk was not completely written
+                chunk = {"offset": offset, "records": records}
+                dut_ids = self._column(chunk, "dut_id")
+                chunk.update(dut_min=int(dut_ids.min()), dut_max=int(dut_ids.max()),
+                             tests=np.unique(self._column(chunk, "test_number")).tolist())
+                chunks.append(chunk)
+                offset = end
+        return [pins[index] for index in sorted(pins)], tests, chunks
+
+
+if __name__ == "__main__":
+    import nidigital
+
+    from nidigital_parametric_flow import ParametricFlow, continuity_and_leakage_steps
+    from nidigital_pin_map import load_pin_map
+
+    num_duts = 100
+    datalog_path = "ppmu_results.dlog"
+
+    with nidigital.Session(resource_name="PXIe6570", reset_device=False, options={}) as session:
+        pin_map = load_pin_map(session, os.path.join(os.path.dirname(__file__), 'PinMap.pinmap'))
+        flow = ParametricFlow(session, pin_map)
+        steps = continuity_and_leakage_steps()
+
+        with DatalogWriter(datalog_path) as datalog:
+            for dut_id in range(num_duts):
+                # Test numbers follow the declared step order, whatever order the flow runs them in
+                for step_result in flow.run(steps):
+                    datalog.log(dut_id, steps.index(step_result.step), step_result.results, test_name=step_result.step.name)
+        flow.disconnect()
+
+    reader = DatalogReader(datalog_path)
+    for test_number, test_yield in reader.yield_by_test().items():
+        print(f"{reader.tests[test_number]:<30} yield: {100 * test_yield:.2f} %")
@@ -11,17 +11,21 @@ Should the PinMap be changed, make sure to update the code appropriately.
 import nidigital
 import os
 
+from nidigital_pin_map import load_pin_map
+from nidigital_ppmu_results import PinResultsEvaluator, format_results
+
 test_voltages = [0, 3]
 current_limit = 25e-6
 currents = []  # list that stores current measurements
-pass_fail = [] # list that stores Pass/Fail results
 
 with nidigital.Session(resource_name="PXIe6570", reset_device=False, options={}) as session:
     # Store directory path
     dir = os.path.join(os.path.dirname(__file__))
 
     pin_map_filepath = os.path.join(dir, 'PinMap.pinmap')
-    session.load_pin_map(file_path=pin_map_filepath)
+    # The pin map is parsed once and only loaded if the session does not already have the same pin map loaded
+    pin_map = load_pin_map(session, pin_map_filepath)
+    pin_map.require("All_Pins", "Power", "DUTPins")
 
     # Set all pins to PPMU mode
     session.channels["All_Pins"].selected_function = nidigital.SelectedFunction.PPMU
@@ -46,8 +50,8 @@ with nidigital.Session(resource_name="PXIe6570", reset_device=False, options={})
         session.channels["DUTPins"].ppmu_source()
         currents.append(session.channels["DUTPins"].ppmu_measure(measurement_type=nidigital.PPMUMeasurementType.CURRENT))
 
-        # Loop through each pin data and display the measurement results
-        for j in range(len(pin_info)):
-            print(f'{pin_info[j][0]} on Site {pin_info[j][1]} @ {test_voltages[i]}V: {currents[i][j]:3e}A --> {"Pass" if currents[i][j] <= current_limit else "Fail"}')
-    
+    # Compare all measurement results to the limit at once, and display them
+    results = PinResultsEvaluator(pin_info).evaluate(currents, conditions=test_voltages, high_limit=current_limit)
+    print("\n".join(format_results(results, condition_unit="V", measurement_unit="A", measurement_format=".3e")))
+
     session.channels[""].selected_function = nidigital.SelectedFunction.DISCONNECT
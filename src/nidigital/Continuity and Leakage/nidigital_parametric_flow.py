@@ -0,0 +1,229 @@
+"""NI-Digital Parametric test flow (Continuity + Leakage).
+
+This example demonstrates how to run the Continuity test (both clamping diodes) and the Leakage test (all test voltages)
+of nidigital_continuity.py and nidigital_leakage.py in a single session.
+
+Each test step only declares the PPMU settings it needs. The flow keeps track of what was last written to every pin
+group, orders the steps so that expensive changes (selected function, output function and ranges) happen as rarely as
+possible, and only writes the attributes that differ from the previous step. The time spent configuring, sourcing and
+measuring is reported for every step.
+
+The example is intended to work with any DUT, provided the same PinMap structure and groups are used.
+"""
+
+# Module imports
+import os
+import time
+
+import nidigital
+
+from nidigital_pin_map import channels, load_pin_map
+from nidigital_ppmu_results import PinResultsEvaluator, format_results
+
+# Relative cost of writing an attribute, used to order the steps. Other attributes cost 1.
+ATTRIBUTE_COSTS = {"selected_function": 20,
+                   "ppmu_output_function": 10,
+                   "ppmu_current_level_range": 10,
+                   "ppmu_current_limit_range": 10}
+
+# Attributes that take effect without sourcing the pins again
+NO_SOURCE_ATTRIBUTES = {"selected_function", "ppmu_aperture_time", "ppmu_aperture_time_units"}
+
+# Settle times are slept until this long before their end and busy-waited after, as time.sleep() overshoots by ~1 ms
+SETTLE_SPIN_MARGIN = 2e-3   # s
+
+_UNSET = object()
+
+
+class TestStep:
+    """One PPMU measurement and the settings it needs.
+
+    Arguments
+    ---------
+    - name: Name of the step, used in the results.
+    - settings: Dictionary of pin group name to {attribute name: value} needed by this step.
+    - measure_group: Pin group measured by this step.
+    - measurement_type: nidigital.PPMUMeasurementType measured.
+    - condition: Value of the forced level, reported with the results.
+    - low_limit, high_limit, absolute: Limits, see PinResultsEvaluator.evaluate().
+    - settle_time: Time to wait between sourcing and measuring, in seconds.
+    """
+
+    def __init__(self, name, settings, measure_group, measurement_type, condition, low_limit=float("-inf"), high_limit=float("inf"), absolute=False, settle_time=0.0):
+        self.name = name
+        self.settings = settings
+        self.measure_group = measure_group
+        self.measurement_type = measurement_type
+        self.condition = condition
+        self.low_limit = low_limit
+        self.high_limit = high_limit
+        self.absolute = absolute
+        self.settle_time = settle_time
+
+
+class StepResult:
+    """Results and timing of one executed step. Times are in seconds.
+
+    The source time includes the settle time, which is the one achieved between sourcing and measuring (0 when the step
+    did not source).
+    """
+
+    def __init__(self, step, results, attributes_written, configure_time, source_time, measure_time, settle_time=0.0):
+        self.step = step
+        self.results = results
+        self.attributes_written = attributes_written
+        self.configure_time = configure_time
+        self.source_time = source_time
+        self.measure_time = measure_time
+        self.settle_time = settle_time
+
+    @property
+    def total_time(self):
+        return self.configure_time + self.source_time + self.measure_time
+
+
+class ParametricFlow:
+    """Run PPMU test steps in one session, writing only the attributes that change between steps.
+
+    Arguments
+    ---------
+    - session: NI-Digital session with the pin map loaded.
+    - pin_map: PinMap of the session, used to check the group names of the steps.
+
+    The written state is tracked per group name, so each attribute of a pin should always be set through the same group.
+    """
+
+    def __init__(self, session, pin_map):
+        self.session = session
+        self.pin_map = pin_map
+        self._state = {}        # (group, attribute) -> value last written
+        self._evaluators = {}   # group -> PinResultsEvaluator
+
+    def apply(self, settings):
+        """Write the settings that differ from the current state.
+
+        Returns the groups that must source again for the new settings to take effect, and the number of attributes written.
+        """
+        source_groups = []
+        written = 0
+        for group, attributes in settings.items():
+            needs_source = False
+            for attribute, value in attributes.items():
+                if self.write(group, attribute, value):
+                    needs_source = needs_source or attribute not in NO_SOURCE_ATTRIBUTES
+                    written += 1
+            if needs_source:
+                source_groups.append(group)
+        return source_groups, written
+
+    def write(self, group, attribute, value):
+        """Write one attribute of a group, unless it already has this value. Returns whether it was written."""
+        if self._state.get((group, attribute), _UNSET) == value:
+            return False
+        setattr(channels(self.session, group), attribute, value)
+        self._state[(group, attribute)] = value
+        return True
+
+    def order(self, steps):
+        """Return the steps ordered, greedily, so each one costs as little as possible to configure after the previous one."""
+        state = dict(self._state)
+        remaining = list(steps)
+        ordered = []
+        while remaining:
+            best = min(remaining, key=lambda step: _change_cost(state, step.settings))
+            remaining.remove(best)
+            ordered.append(best)
+            state.update({(group, attribute): value for group, attributes in best.settings.items() for attribute, value in attributes.items()})
+        return ordered
+
+    def run(self, steps, reorder=True):
+        """Run the steps (reordered unless 'reorder' is False) and return one StepResult per step, in execution order."""
+        self.pin_map.require(*{group for step in steps for group in list(step.settings) + [step.measure_group]})
+        step_results = []
+        for step in (self.order(steps) if reorder else steps):
+            start = time.perf_counter()
+            source_groups, written = self.apply(step.settings)
+            configured = time.perf_counter()
+            # Changed levels, ranges and output functions only take effect once the group sources again
+            for group in source_groups:
+                channels(self.session, group).ppmu_source()
+            settle_time = settle(time.perf_counter(), step.settle_time) if source_groups else 0.0
+            sourced = time.perf_counter()
+            measurements = channels(self.session, step.measure_group).ppmu_measure(measurement_type=step.measurement_type)
+            measured = time.perf_counter()
+
+            results = self._evaluator(step.measure_group).evaluate([measurements], [step.condition], step.low_limit, step.high_limit, step.absolute)
+            step_results.append(StepResult(step, results, written, configured - start, sourced - configured, measured - sourced,
+                                           settle_time))
+        return step_results
+
+    def disconnect(self):
+        """Disconnect every pin and forget the tracked state."""
+        self.session.channels[""].selected_function = nidigital.SelectedFunction.DISCONNECT
+        self._state.clear()
+
+    def _evaluator(self, group):
+        if group not in self._evaluators:
+            self._evaluators[group] = PinResultsEvaluator(channels(self.session, group).get_pin_results_pin_information())
+        return self._evaluators[group]
+
+
+def settle(start, settle_time):
+    """Wait until 'settle_time' seconds after 'start' (a time.perf_counter() value) and return the settle time achieved.
+
+    The end of the wait is busy-waited, so settle times shorter than the resolution of time.sleep() are kept.
+    """
+    deadline = start + settle_time
+    if deadline - time.perf_counter() > SETTLE_SPIN_MARGIN:
+        time.sleep(max(0.0, deadline - SETTLE_SPIN_MARGIN - time.perf_counter()))
+    while time.perf_counter() < deadline:
+        pass
+    return time.perf_counter() - start
+
+
+def _change_cost(state, settings):
+    """Cost of moving from 'state' to the given settings."""
+    return sum(ATTRIBUTE_COSTS.get(attribute, 1)
+               for group, attributes in settings.items()
+               for attribute, value in attributes.items()
+               if state.get((group, attribute), _UNSET) != value)
+
+
+def continuity_and_leakage_steps(force_current=100e-6, diode_low_limit=0.0, diode_high_limit=0.8, test_voltages=(0, 3), current_limit=25e-6, aperture_time=20e-6):
+    """Return the steps of nidigital_continuity.py and nidigital_leakage.py, with the same settings and limits."""
+    common = {"All_Pins": {"selected_function": nidigital.SelectedFunction.PPMU,
+                           "ppmu_aperture_time_units": nidigital.PPMUApertureTimeUnits.SECONDS,
+                           "ppmu_aperture_time": aperture_time}}
+    steps = []
+    for current in (force_current, -force_current):
+        steps.append(TestStep(f"Continuity @ {current:.3e} A",
+                              dict(common,
+                                   Power={"ppmu_output_function": nidigital.PPMUOutputFunction.VOLTAGE, "ppmu_current_limit_range": 10e-3, "ppmu_voltage_level": 0},
+                                   DUTPins={"ppmu_current_level_range": 128e-6, "ppmu_voltage_limit_low": -1.5, "ppmu_voltage_limit_high": 1.5,
+                                            "ppmu_output_function": nidigital.PPMUOutputFunction.CURRENT, "ppmu_current_level": current}),
+                              "DUTPins", nidigital.PPMUMeasurementType.VOLTAGE, current, diode_low_limit, diode_high_limit, absolute=True))
+    for voltage in test_voltages:
+        steps.append(TestStep(f"Leakage @ {voltage} V",
+                              dict(common,
+                                   Power={"ppmu_output_function": nidigital.PPMUOutputFunction.VOLTAGE, "ppmu_current_limit_range": 10e-3, "ppmu_voltage_level": 3.3},
+                                   DUTPins={"ppmu_current_limit_range": 10e-6, "ppmu_output_function": nidigital.PPMUOutputFunction.VOLTAGE,
+                                            "ppmu_voltage_level": voltage}),
+                              "DUTPins", nidigital.PPMUMeasurementType.CURRENT, voltage, high_limit=current_limit))
+    return steps
+
+
+if __name__ == "__main__":
+    with nidigital.Session(resource_name="PXIe6570", reset_device=False, options={}) as session:
+        pin_map = load_pin_map(session, os.path.join(os.path.dirname(__file__), 'PinMap.pinmap'))
+
+        flow = ParametricFlow(session, pin_map)
+        step_results = flow.run(continuity_and_leakage_steps())
+        flow.disconnect()
+
+    for step_result in step_results:
+        print(f"\n{step_result.step.name}: {step_result.attributes_written} attributes written, "
+              f"configure {step_result.configure_time * 1e3:.3f} ms, source {step_result.source_time * 1e3:.3f} ms, "
+              f"measure {step_result.measure_time * 1e3:.3f} ms, settle {step_result.settle_time * 1e6:.1f} us")
+        unit = ("A", "V") if step_result.step.measurement_type == nidigital.PPMUMeasurementType.VOLTAGE else ("V", "A")
+        print("\n".join(format_results(step_result.results, condition_unit=unit[0], measurement_unit=unit[1], measurement_format=".3e")))
+    print(f"\nTotal: {sum(step_result.total_time for step_result in step_results) * 1e3:.3f} ms")
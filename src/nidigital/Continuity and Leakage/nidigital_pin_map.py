@@ -0,0 +1,139 @@
+"""NI-Digital Pin Map cache.
+
+This module parses a .pinmap file once, caches the result by the hash of the file contents, and builds indexes of it:
+pin to channel (per site), group to pins, site to connections and instrument to channels.
+
+load_pin_map() only calls session.load_pin_map() when the session does not already have a pin map with the same
+contents loaded, and the repeated capabilities objects of pins and groups (session.channels[...]) are created once per
+session and reused, instead of being resolved from their names on every test step.
+"""
+
+# Module imports
+import hashlib
+import weakref
+import xml.etree.ElementTree as ElementTree
+
+PIN_MAP_NAMESPACE = "{http://www.ni.com/TestStand/SemiconductorModule/PinMap.xsd}"
+
+_parsed_pin_maps = {}                           # content hash -> PinMap
+_loaded_pin_maps = weakref.WeakKeyDictionary()  # session -> content hash of the pin map loaded in it
+_channels_cache = weakref.WeakKeyDictionary()   # session -> {pin or group name: repeated capabilities object}
+
+
+class Connection:
+    """Connection of a pin, on a site, to a channel of an instrument."""
+
+    __slots__ = ("pin", "site", "instrument", "channel")
+
+    def __init__(self, pin, site, instrument, channel):
+        self.pin = pin
+        self.site = site
+        self.instrument = instrument
+        self.channel = channel
+
+    def __repr__(self):
+        return f"Connection(pin={self.pin!r}, site={self.site}, instrument={self.instrument!r}, channel={self.channel!r})"
+
+
+class PinMap:
+    """Parsed and indexed contents of a .pinmap file.
+
+    Attributes
+    ----------
+    - content_hash: SHA-256 of the file contents.
+    - instruments: Dictionary of instrument name to its attributes (numberOfChannels, group, ...).
+    - dut_pins, system_pins: Pin names, in file order.
+    - sites: Site numbers, in file order.
+    - groups: Dictionary of group name to its pin names.
+    - connections: List of every Connection.
+    - pin_channels: Dictionary of pin name to {site: Connection}.
+    - site_connections: Dictionary of site number to its list of Connection.
+    - instrument_channels: Dictionary of instrument name to its list of Connection.
+    """
+
+    def __init__(self, content, content_hash=None):
+        self.content_hash = content_hash or hashlib.sha256(content).hexdigest()
+        root = ElementTree.fromstring(content)
+
+        self.instruments = {element.get("name"): dict(element.attrib) for element in _children(root, "Instruments")}
+        self.dut_pins = [element.get("name") for element in _children(root, "Pins") if _tag(element) == "DUTPin"]
+        self.system_pins = [element.get("name") for element in _children(root, "Pins") if _tag(element) == "SystemPin"]
+        self.sites = [int(element.get("siteNumber")) for element in _children(root, "Sites")]
+        self.groups = {element.get("name"): [reference.get("pin") for reference in element]
+                       for element in _children(root, "PinGroups")}
+
+        self.connections = []
+        self.pin_channels = {pin: {} for pin in self.dut_pins + self.system_pins}
+        self.site_connections = {site: [] for site in self.sites}
+        self.instrument_channels = {instrument: [] for instrument in self.instruments}
+        for element in _children(root, "Connections"):
+            site = element.get("siteNumber")
+            connection = Connection(element.get("pin"), None if site is None else int(site),
+                                    element.get("instrument"), element.get("channel"))
+            self.connections.append(connection)
+            self.pin_channels.setdefault(connection.pin, {})[connection.site] = connection
+            self.site_connections.setdefault(connection.site, []).append(connection)
+            self.instrument_channels.setdefault(connection.instrument, []).append(connection)
+
+    @property
+    def pins(self):
+        return self.dut_pins + self.system_pins
+
+    def resolve(self, name):
+        """Return the pins of a group, or a list with the pin itself. Raises KeyError for unknown names."""
+        if name in self.groups:
+            return self.groups[name]
+        if name in self.pin_channels:
+            return [name]
+        raise KeyError(f"'{name}' is neither a pin nor a pin group of this pin map.")
+
+    def channels_of(self, name, site=None):
+        """Return the Connections of a pin or group, on every site or on a single one."""
+        return [connection for pin in self.resolve(name) for connection in self.pin_channels[pin].values()
+                if site is None or connection.site == site]
+
+    def require(self, *names):
+        """Check that every pin or group name exists in the pin map, so typos fail before the test runs."""
+        missing = [name for name in names if name not in self.groups and name not in self.pin_channels]
+        if missing:
+            raise KeyError(f"Pin map does not define: {', '.join(missing)}.")
+
+
+def read_pin_map(file_path):
+    """Return the PinMap of a file, parsing it only the first time these exact contents are seen."""
+    with open(file_path, "rb") as pin_map_file:
+        content = pin_map_file.read()
+    content_hash = hashlib.sha256(content).hexdigest()
+    if content_hash not in _parsed_pin_maps:
+        _parsed_pin_maps[content_hash] = PinMap(content, content_hash)
+    return _parsed_pin_maps[content_hash]
+
+
+def load_pin_map(session, file_path):
+    """Load a pin map in a session, unless the same contents are already loaded in it, and return its PinMap."""
+    pin_map = read_pin_map(file_path)
+    if _loaded_pin_maps.get(session) != pin_map.content_hash:
+        session.load_pin_map(file_path=file_path)
+        _loaded_pin_maps[session] = pin_map.content_hash
+        # Repeated capabilities of the previous pin map may refer to pins that no longer exist
+        _channels_cache.pop(session, None)
+    return pin_map
+
+
+def channels(session, name):
+    """Return session.channels[name] for a pin, group or pin list, creating it only once per session."""
+    cache = _channels_cache.setdefault(session, {})
+    if name not in cache:
+        cache[name] = session.channels[name]
+    return cache[name]
+
+
+def _tag(element):
+    """Tag of an element without its XML namespace."""
+    return element.tag.replace(PIN_MAP_NAMESPACE, "")
+
+
+def _children(root, section):
+    """Children of a top-level section (Instruments, Pins, ...) of the pin map, or nothing if it is missing."""
+    element = root.find(PIN_MAP_NAMESPACE + section)
+    return [] if element is None else list(element)
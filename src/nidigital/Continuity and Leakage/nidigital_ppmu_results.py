@@ -0,0 +1,98 @@
+"""NI-Digital PPMU results evaluation.
+
+This module evaluates PPMU measurements against test limits for all pins, sites and test conditions at once.
+
+get_pin_results_pin_information() is read once per pin group, and every ppmu_measure() result is kept as one row of a
+(test conditions x pin/site) NumPy array. The limits are then compared to all the measurements in a single vectorized
+operation, which returns a structured result table with one entry per test condition, pin and site.
+"""
+
+# Module imports
+import numpy as np
+
+RESULT_DTYPE = np.dtype([("condition", "f8"),
+                         ("pin", "U64"),
+                         ("site", "i4"),
+                         ("channel", "U64"),
+                         ("measurement", "f8"),
+                         ("low_limit", "f8"),
+                         ("high_limit", "f8"),
+                         ("passed", "?")])
+
+
+class PinResultsEvaluator:
+    """Evaluate PPMU measurements of one pin group against limits.
+
+    Arguments
+    ---------
+    - pin_info: Result of session.channels[...].get_pin_results_pin_information() for the measured pins.
+    """
+
+    def __init__(self, pin_info):
+        self.pins = np.array([info[0] for info in pin_info])
+        self.sites = np.array([info[1] for info in pin_info], dtype=np.int32)
+        self.channels = np.array([info[2] if len(info) > 2 else "" for info in pin_info])
+
+    @property
+    def num_pins(self):
+        """Number of pin/site combinations returned by every measurement."""
+        return self.pins.size
+
+    def evaluate(self, measurements, conditions, low_limit=-np.inf, high_limit=np.inf, absolute=False):
+        """Compare every measurement to its limits and return the structured result table.
+
+        Arguments
+        ---------
+        - measurements: One ppmu_measure() result per test condition, as a (conditions x pins) array or list of lists.
+        - conditions: Value of the test condition (forced current or voltage) for each row of measurements.
+        - low_limit, high_limit: Limits, either scalars, one per condition, one per pin, or a (conditions x pins) array.
+        - absolute: Compare the magnitude of the measurements and limits, so a single pair of limits applies to both
+          polarities (for example, the positive and negative clamping diodes of a continuity test).
+
+        Returns a (conditions x pins) array of RESULT_DTYPE records.
+        """
+        measurements = np.atleast_2d(np.asarray(measurements, dtype=np.float64))
+        conditions = np.asarray(conditions, dtype=np.float64).reshape(-1)
+        if measurements.shape != (conditions.size, self.num_pins):
+            raise ValueError(f"Expected {conditions.size} x {self.num_pins} measurements, got {measurements.shape}.")
+
+        low = _broadcast_limit(low_limit, measurements.shape)
+        high = _broadcast_limit(high_limit, measurements.shape)
+        if absolute:
+            compared, low, high = np.abs(measurements), np.abs(low), np.abs(high)
+        else:
+            compared = measurements
+
+        results = np.empty(measurements.shape, dtype=RESULT_DTYPE)
+        results["condition"] = conditions[:, np.newaxis]
+        results["pin"] = self.pins
+        results["site"] = self.sites
+        results["channel"] = self.channels
+        results["measurement"] = measurements
+        results["low_limit"] = low
+        results["high_limit"] = high
+        results["passed"] = (compared >= low) & (compared <= high)
+        return results
+
+
+def site_results(results):
+    """Return a dictionary of site number to overall pass/fail, for a result table of any shape."""
+    results = results.reshape(-1)
+    sites = np.unique(results["site"])
+    failed_sites = np.unique(results["site"][~results["passed"]])
+    return {int(site): bool(site not in failed_sites) for site in sites}
+
+
+def format_results(results, condition_unit, measurement_unit, measurement_format=".3f"):
+    """Return the result table as printable lines, one per test condition, pin and site."""
+    return [f'{row["pin"]} on Site {row["site"]} @ {row["condition"]:.3e} {condition_unit}: '
+            f'{row["measurement"]:{measurement_format}} {measurement_unit} --> {"Pass" if row["passed"] else "Fail"}'
+            for row in results.reshape(-1)]
+
+
+def _broadcast_limit(limit, shape):
+    """Broadcast a limit given per condition (column vector), per pin (row vector) or per measurement to 'shape'."""
+    limit = np.asarray(limit, dtype=np.float64)
+    if limit.ndim == 1 and limit.size == shape[0] and limit.size != shape[1]:
+        limit = limit[:, np.newaxis]
+    return np.broadcast_to(limit, shape)
@@ -0,0 +1,216 @@
+"""NI-Digital PPMU aperture and settle time optimizer.
+
+This module characterizes how repeatable the PPMU measurements of a test step are, for every combination of aperture
+time and settle time (delay between ppmu_source() and ppmu_measure()), and picks the shortest combination that meets a
+target noise.
+
+For each combination, the step is sourced and measured several times. The noise is the largest standard deviation of
+a pin across the repetitions, and the settling error is the largest difference between the mean of a pin and its mean
+with the longest aperture and settle time. The selected settings are stored per test step (and per measurement type and
+range, for steps that were not characterized), so production runs of nidigital_parametric_flow.py use them
+automatically through apply_settings().
+"""
+
+# Module imports
+import json
+import os
+import time
+
+import numpy as np
+
+import nidigital
+
+from nidigital_parametric_flow import settle
+from nidigital_pin_map import channels
+
+
+class Characterization:
+    """Noise and settling error of a test step for every aperture time and settle time.
+
+    Attributes
+    ----------
+    - aperture_times, settle_times: Candidate settings, in seconds.
+    - measurements: (apertures x settle times x repetitions x pins) array of measurements.
+    - achieved_settle_times: (apertures x settle times x repetitions) array, settle time achieved before every
+      measurement, in seconds.
+    - noise: (apertures x settle times) array, largest standard deviation of a pin across the repetitions.
+    - settling_error: (apertures x settle times) array, largest difference between the mean of a pin and its mean with
+      the longest aperture and settle time.
+    """
+
+    def __init__(self, aperture_times, settle_times, measurements, achieved_settle_times):
+        self.aperture_times = np.asarray(aperture_times, dtype=np.float64)
+        self.settle_times = np.asarray(settle_times, dtype=np.float64)
+        self.measurements = measurements
+        self.achieved_settle_times = achieved_settle_times
+
+        means = measurements.mean(axis=2)
+        reference = means[self.aperture_times.argmax(), self.settle_times.argmax()]
+        self.noise = measurements.std(axis=2, ddof=1).max(axis=-1)
+        self.settling_error = np.abs(means - reference).max(axis=-1)
+
+    def select(self, target_noise, target_settling_error=None):
+        """Return the (aperture time, settle time) with the shortest total time that meets the targets.
+
+        The settling error target defaults to the noise target. Raises ValueError if no combination meets them.
+        """
+        if target_settling_error is None:
+            target_settling_error = target_noise
+        meets = (self.noise <= target_noise) & (self.settling_error <= target_settling_error)
+        if not meets.any():
+            raise ValueError(f"No aperture and settle time meets a noise of {target_noise:.3e} "
+                             f"(lowest noise measured: {self.noise.min():.3e}).")
+        total_time = self.aperture_times[:, np.newaxis] + self.settle_times[np.newaxis, :]
+        aperture, settle = np.unravel_index(np.where(meets, total_time, np.inf).argmin(), meets.shape)
+        return float(self.aperture_times[aperture]), float(self.settle_times[settle])
+
+
+class SettingsStore:
+    """Selected aperture and settle times, saved to a JSON file.
+
+    Entries are stored under the name of the test step and under its measurement type and range (see range_key()). A
+    step uses the entry of its name if there is one, or else the entry of its range.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as store_file:
+                self.entries = json.load(store_file)
+
+    def save(self):
+        with open(self.path, "w") as store_file:
+            json.dump(self.entries, store_file, indent=2)
+
+    def update(self, step, aperture_time, settle_time, **details):
+        """Store the settings of a step, under its name and its range."""
+        entry = dict(details, aperture_time=aperture_time, settle_time=settle_time)
+        self.entries[step.name] = entry
+        self.entries[range_key(step)] = entry
+
+    def lookup(self, step):
+        """Return the entry of a step, or None if neither its name nor its range was characterized."""
+        return self.entries.get(step.name, self.entries.get(range_key(step)))
+
+
+def range_key(step):
+    """Return the key identifying the measurement type and range of a step, e.g. 'CURRENT @ 1e-05 A'."""
+    settings = step.settings.get(step.measure_group, {})
+    if settings.get("ppmu_output_function") == nidigital.PPMUOutputFunction.CURRENT:
+        measure_range = settings.get("ppmu_current_level_range")
+    else:
+        measure_range = settings.get("ppmu_current_limit_range")
+    return f"{step.measurement_type.name} @ {measure_range} A"
+
+
+def characterize(flow, step, aperture_times, settle_times, repetitions=16, previous_settings=None):
+    """Measure a test step 'repetitions' times for every aperture time and settle time, and return the Characterization.
+
+    Arguments
+    ---------
+    - flow: ParametricFlow of the session.
+    - step: TestStep to characterize.
+    - aperture_times, settle_times: Candidate settings, in seconds.
+    - repetitions: Number of measurements of each combination.
+    - previous_settings: Settings (as in TestStep) applied and sourced before every measurement, so the measured settling
+      is the one of the transition the step sees in the flow. By default, the step's own settings are sourced again.
+    """
+    step_channels = [channels(flow.session, name) for name in step.settings]
+    measure_channels = channels(flow.session, step.measure_group)
+    measurements = []
+    achieved_settle_times = []
+
+    for aperture_time in aperture_times:
+        settings = _with_aperture_time(step, aperture_time)
+        for settle_time in settle_times:
+            for _ in range(repetitions):
+                if previous_settings is not None:
+                    for name in flow.apply(previous_settings)[0]:
+                        channels(flow.session, name).ppmu_source()
+                flow.apply(settings)
+                for group_channels in step_channels:
+                    group_channels.ppmu_source()
+                achieved_settle_times.append(settle(time.perf_counter(), settle_time))
+                measurements.append(measure_channels.ppmu_measure(measurement_type=step.measurement_type))
+
+    shape = (len(aperture_times), len(settle_times), repetitions)
+    measurements = np.asarray(measurements, dtype=np.float64).reshape(shape + (-1,))
+    return Characterization(aperture_times, settle_times, measurements, np.reshape(achieved_settle_times, shape))
+
+
+def optimize(flow, steps, store, target_noise, aperture_times, settle_times, repetitions=16, target_settling_error=None):
+    """Characterize every step, store the selected settings, and return a dictionary of step name to Characterization.
+
+    Each step is characterized after the settings of the step before it, as it runs in the flow. The store is saved.
+    """
+    characterizations = {}
+    previous_settings = None
+    for step in flow.order(steps):
+        characterization = characterize(flow, step, aperture_times, settle_times, repetitions, previous_settings)
+        aperture_time, settle_time = characterization.select(target_noise, target_settling_error)
+        index = (list(aperture_times).index(aperture_time), list(settle_times).index(settle_time))
+        store.update(step, aperture_time, settle_time,
+                     noise=float(characterization.noise[index]),
+                     settling_error=float(characterization.settling_error[index]),
+                     achieved_settle_time=float(characterization.achieved_settle_times[index].max()))
+        characterizations[step.name] = characterization
+        previous_settings = step.settings
+    store.save()
+    return characterizations
+
+
+def apply_settings(steps, store):
+    """Set the stored aperture and settle times on the steps (in place) and return them.
+
+    Steps without a stored entry are left unchanged.
+    """
+    for step in steps:
+        entry = store.lookup(step)
+        if entry is None:
+            continue
+        step.settings = _with_aperture_time(step, entry["aperture_time"])
+        step.settle_time = entry["settle_time"]
+    return steps
+
+
+def _with_aperture_time(step, aperture_time):
+    """Return a copy of the settings of a step with another aperture time.
+
+    The aperture time is set through the group the step already sets it with (the measured group otherwise), so the
+    flow keeps tracking it through the same group.
+    """
+    group = next((name for name, attributes in step.settings.items() if "ppmu_aperture_time" in attributes), step.measure_group)
+    settings = dict(step.settings)
+    settings[group] = dict(settings.get(group, {}),
+                           ppmu_aperture_time_units=nidigital.PPMUApertureTimeUnits.SECONDS,
+                           ppmu_aperture_time=aperture_time)
+    return settings
+
+
+if __name__ == "__main__":
+    from nidigital_parametric_flow import ParametricFlow, continuity_and_leakage_steps
+    from nidigital_pin_map import load_pin_map
+
+    aperture_times = [4e-6, 10e-6, 20e-6, 50e-6, 100e-6]
+    settle_times = [0, 50e-6, 100e-6, 250e-6, 500e-6, 1e-3]
+    store_path = os.path.join(os.path.dirname(__file__), 'ppmu_settings.json')
+
+    with nidigital.Session(resource_name="PXIe6570", reset_device=False, options={}) as session:
+        pin_map = load_pin_map(session, os.path.join(os.path.dirname(__file__), 'PinMap.pinmap'))
+        flow = ParametricFlow(session, pin_map)
+        store = SettingsStore(store_path)
+
+        # Characterize once; the leakage steps measure currents, so their noise target is tighter than the continuity one
+        steps = continuity_and_leakage_steps()
+        if not store.entries:
+            optimize(flow, steps[:2], store, target_noise=1e-3, aperture_times=aperture_times, settle_times=settle_times)
+            optimize(flow, steps[2:], store, target_noise=50e-9, aperture_times=aperture_times, settle_times=settle_times)
+        for name, entry in store.entries.items():
+            print(f"{name:<30} aperture {entry['aperture_time'] * 1e6:.0f} us, settle {entry['settle_time'] * 1e6:.0f} us")
+
+        # Production run with the stored settings
+        step_results = flow.run(apply_settings(continuity_and_leakage_steps(), store))
+        flow.disconnect()
+
+    print(f"\nTotal: {sum(step_result.total_time for step_result in step_results) * 1e3:.3f} ms")
@@ -0,0 +1,144 @@
+"""NI-Digital PPMU level sweep.
+
+This module forces a list of voltage or current levels on a pin group and measures every pin at each level, e.g. to
+trace the leakage IV curve of the DUT pins with 50+ points instead of the 2 test voltages of nidigital_leakage.py.
+
+The output function, ranges and aperture are written once, through a ParametricFlow, so nothing that is already
+configured is written again. At each point only the level is written before sourcing and measuring, and the
+measurement goes straight into a preallocated array. The pin information is read once, and the measurements are
+rearranged into a (levels x pins x sites) array in one operation at the end.
+"""
+
+# Module imports
+import time
+
+import numpy as np
+
+import nidigital
+
+from nidigital_parametric_flow import settle
+from nidigital_pin_map import channels
+
+LEVEL_ATTRIBUTES = {nidigital.PPMUOutputFunction.VOLTAGE: "ppmu_voltage_level",
+                    nidigital.PPMUOutputFunction.CURRENT: "ppmu_current_level"}
+
+
+class SweepResult:
+    """Measurements of a PPMU sweep.
+
+    Attributes
+    ----------
+    - levels: Forced levels.
+    - pins: Pin names, in the order of the pin axis.
+    - sites: Site numbers, in the order of the site axis.
+    - measurements: (levels x pins x sites) array; NaN for pins not connected on a site.
+    - elapsed_time: Duration of the sweep, in seconds.
+    - settle_times: Settle time achieved at every level, in seconds.
+    """
+
+    def __init__(self, levels, pins, sites, measurements, elapsed_time, settle_times):
+        self.levels = levels
+        self.pins = pins
+        self.sites = sites
+        self.measurements = measurements
+        self.elapsed_time = elapsed_time
+        self.settle_times = settle_times
+
+    def pin(self, name, site):
+        """Return the curve (one measurement per level) of one pin on one site."""
+        return self.measurements[:, self.pins.index(name), self.sites.index(site)]
+
+
+class PPMUSweep:
+    """Sweep the level of a pin group and measure it at every level.
+
+    Arguments
+    ---------
+    - flow: ParametricFlow of the session, which tracks the configuration already written.
+    - group: Pin group forced and measured.
+    - output_function: nidigital.PPMUOutputFunction forced.
+    - measurement_type: nidigital.PPMUMeasurementType measured.
+    - settings: Dictionary of pin group name to {attribute name: value} written once before the sweep (ranges,
+      limits, aperture and any other groups, like the DUT supply). The PPMU is selected on the swept group unless
+      'selected_function' is set through one of the groups.
+    - settle_time: Time to wait between sourcing and measuring at each level, in seconds.
+    """
+
+    def __init__(self, flow, group, output_function, measurement_type, settings=None, settle_time=0.0):
+        self.flow = flow
+        self.group = group
+        self.measurement_type = measurement_type
+        self.settle_time = settle_time
+        self.settings = dict(settings or {})
+        self.settings[group] = dict(self.settings.get(group, {}), ppmu_output_function=output_function)
+        if not any("selected_function" in attributes for attributes in self.settings.values()):
+            self.settings[group]["selected_function"] = nidigital.SelectedFunction.PPMU
+        self.level_attribute = LEVEL_ATTRIBUTES[output_function]
+
+        # Position of every measurement in the (pins x sites) grid, read once
+        self.flow.pin_map.require(*self.settings)
+        pin_info = channels(flow.session, group).get_pin_results_pin_information()
+        pin_names = [info[0] for info in pin_info]
+        site_numbers = [info[1] for info in pin_info]
+        self.pins = list(dict.fromkeys(pin_names))
+        self.sites = sorted(set(site_numbers))
+        self._pin_index = np.array([self.pins.index(pin) for pin in pin_names])
+        self._site_index = np.array([self.sites.index(site) for site in site_numbers])
+
+    def run(self, levels):
+        """Force every level in turn, measure, and return the SweepResult."""
+        levels = np.asarray(levels, dtype=np.float64)
+        group_channels = channels(self.flow.session, self.group)
+        measurements = np.empty((levels.size, self._pin_index.size))
+        settle_times = np.empty(levels.size)
+
+        start = time.perf_counter()
+        # The other groups (supply, ...) are sourced once; the swept group is sourced at every level
+        for group in self.flow.apply(self.settings)[0]:
+            if group != self.group:
+                channels(self.flow.session, group).ppmu_source()
+        for index, level in enumerate(levels):
+            self.flow.write(self.group, self.level_attribute, float(level))
+            group_channels.ppmu_source()
+            settle_times[index] = settle(time.perf_counter(), self.settle_time)
+            measurements[index] = group_channels.ppmu_measure(measurement_type=self.measurement_type)
+        elapsed_time = time.perf_counter() - start
+
+        grid = np.full((levels.size, len(self.pins), len(self.sites)), np.nan)
+        grid[:, self._pin_index, self._site_index] = measurements
+        return SweepResult(levels, self.pins, self.sites, grid, elapsed_time, settle_times)
+
+
+if __name__ == "__main__":
+    import os
+
+    import matplotlib.pyplot as plt
+
+    from nidigital_parametric_flow import ParametricFlow
+    from nidigital_pin_map import load_pin_map
+
+    test_voltages = np.linspace(-0.5, 3.3, 51)
+
+    with nidigital.Session(resource_name="PXIe6570", reset_device=False, options={}) as session:
+        pin_map = load_pin_map(session, os.path.join(os.path.dirname(__file__), 'PinMap.pinmap'))
+        flow = ParametricFlow(session, pin_map)
+
+        # Same configuration as nidigital_leakage.py, with 51 test voltages
+        sweep = PPMUSweep(flow, "DUTPins", nidigital.PPMUOutputFunction.VOLTAGE, nidigital.PPMUMeasurementType.CURRENT,
+                          settings={"All_Pins": {"selected_function": nidigital.SelectedFunction.PPMU,
+                                                 "ppmu_aperture_time_units": nidigital.PPMUApertureTimeUnits.SECONDS,
+                                                 "ppmu_aperture_time": 20e-6},
+                                    "Power": {"ppmu_output_function": nidigital.PPMUOutputFunction.VOLTAGE,
+                                              "ppmu_current_limit_range": 10e-3, "ppmu_voltage_level": 3.3},
+                                    "DUTPins": {"ppmu_current_limit_range": 10e-6}})
+        result = sweep.run(test_voltages)
+        flow.disconnect()
+
+    print(f"{result.levels.size} levels x {len(result.pins)} pins x {len(result.sites)} sites in {result.elapsed_time * 1e3:.1f} ms")
+    for site_index, site in enumerate(result.sites):
+        for pin_index, pin in enumerate(result.pins):
+            plt.plot(result.levels, result.measurements[:, pin_index, site_index], label=f"{pin} (Site {site})")
+    plt.xlabel("Voltage (V)")
+    plt.ylabel("Leakage current (A)")
+    plt.legend()
+    plt.show()
@@ -0,0 +1,178 @@
+"""NI-FGEN - Software Trigger Scheduler.
+
+This example demonstrates how to send software start triggers to one or more signal generators from a timetable,
+instead of waiting for a key press as done in nifgen_trigger_modes.py.
+
+Trigger times can be given either as offsets from the start of the run, as absolute times (time.time() seconds),
+or as a list of intervals between consecutive triggers. Every deadline is computed from a single reference point
+on a high-resolution clock, so errors in one trigger do not accumulate into the next one (no drift).
+Waiting is done with a coarse sleep followed by a short busy-wait, and the busy-wait margin adapts to the
+oversleep observed on the running system.
+
+The actual-vs-planned latency of every trigger is recorded and summarized once the run finishes.
+"""
+# Module imports
+import math
+import statistics
+import time
+
+import nifgen
+
+
+class TriggerStatistics:
+    """Summary of the actual-vs-planned latency of a set of triggers, in seconds."""
+
+    def __init__(self, latencies):
+        ordered = sorted(latencies)
+        self.count = len(ordered)
+        self.mean = statistics.fmean(ordered) if ordered else math.nan
+        self.std = statistics.pstdev(ordered) if ordered else math.nan
+        self.min = ordered[0] if ordered else math.nan
+        self.max = ordered[-1] if ordered else math.nan
+        self.p50 = _percentile(ordered, 50)
+        self.p99 = _percentile(ordered, 99)
+
+    def __repr__(self):
+        return (f"TriggerStatistics(count={self.count}, mean={self.mean:.3e}, std={self.std:.3e}, "
+                f"min={self.min:.3e}, max={self.max:.3e}, p50={self.p50:.3e}, p99={self.p99:.3e})")
+
+
+class TriggerRecord:
+    """Timing of a single software trigger sent to a single session.
+
+    Attributes
+    ----------
+    - index: position of the trigger in the timetable.
+    - session_index: position of the session in the scheduler's session list.
+    - planned: planned trigger time, in seconds from the start of the run.
+    - actual: time at which send_software_edge_trigger() was called, in seconds from the start of the run.
+    - duration: time spent inside send_software_edge_trigger(), in seconds.
+    """
+
+    __slots__ = ("index", "session_index", "planned", "actual", "duration")
+
+    def __init__(self, index, session_index, planned, actual, duration):
+        self.index = index
+        self.session_index = session_index
+        self.planned = planned
+        self.actual = actual
+        self.duration = duration
+
+    @property
+    def latency(self):
+        """Difference between the actual and the planned trigger time, in seconds."""
+        return self.actual - self.planned
+
+
+class SoftwareTriggerScheduler:
+    """Send software edge triggers to a list of NI-FGEN sessions following a timetable.
+
+    Arguments
+    ---------
+    - sessions: A list of NI-FGEN sessions, already configured and initiated.
+    - trigger: Trigger to send to every session.
+    - trigger_id: Trigger identifier passed to send_software_edge_trigger().
+    - spin_margin: Initial time, in seconds, spent busy-waiting before each deadline.
+    - max_spin_margin: Upper bound for the adaptive busy-wait margin, in seconds.
+    """
+
+    def __init__(self, sessions, trigger=nifgen.Trigger.START, trigger_id="", spin_margin=1e-3, max_spin_margin=20e-3):
+        self.sessions = list(sessions)
+        self.trigger = trigger
+        self.trigger_id = trigger_id
+        self.spin_margin = spin_margin
+        self.max_spin_margin = max_spin_margin
+        self.records = []
+        self._margin_ns = int(spin_margin * 1e9)
+
+    def run_intervals(self, intervals, start_delay=0.0):
+        """Send one trigger after each interval, in seconds, measured from the previous planned trigger."""
+        offsets = []
+        elapsed = start_delay
+        for interval in intervals:
+            if interval < 0:
+                raise ValueError("Trigger intervals must not be negative.")
+            elapsed += interval
+            offsets.append(elapsed)
+        return self.run_timetable(offsets)
+
+    def run_absolute(self, times):
+        """Send one trigger at each absolute time, given in time.time() seconds."""
+        # Map the wall clock onto the high-resolution clock only once, so both clocks never get mixed afterwards
+        wall_now = time.time()
+        offsets = [t - wall_now for t in times]
+        return self.run_timetable(offsets)
+
+    def run_timetable(self, offsets):
+        """Send one trigger at each offset, in seconds, from the start of the run.
+
+        Offsets in the past are fired immediately and show up as positive latencies.
+        Returns the TriggerStatistics of the run.
+        """
+        offsets = list(offsets)
+        if any(later < earlier for earlier, later in zip(offsets, offsets[1:])):
+            raise ValueError("Trigger timetable must be sorted in ascending order.")
+
+        self.records = []
+        start_ns = time.perf_counter_ns()
+        for index, offset in enumerate(offsets):
+            deadline_ns = start_ns + int(offset * 1e9)
+            self._wait_until(deadline_ns)
+            for session_index, session in enumerate(self.sessions):
+                before_ns = time.perf_counter_ns()
+                session.send_software_edge_trigger(trigger=self.trigger, trigger_id=self.trigger_id)
+                after_ns = time.perf_counter_ns()
+                self.records.append(TriggerRecord(index, session_index, offset,
+                                                  (before_ns - start_ns) / 1e9, (after_ns - before_ns) / 1e9))
+        return self.statistics()
+
+    def statistics(self, session_index=None):
+        """Return the latency statistics of the last run, either for all sessions or for a single one."""
+        return TriggerStatistics([record.latency for record in self.records
+                                  if session_index is None or record.session_index == session_index])
+
+    def _wait_until(self, deadline_ns):
+        """Sleep until shortly before the deadline, then busy-wait until it is reached."""
+        remaining_ns = deadline_ns - time.perf_counter_ns()
+        if remaining_ns > self._margin_ns:
+            wake_ns = deadline_ns - self._margin_ns
+            time.sleep(max(0.0, (wake_ns - time.perf_counter_ns()) / 1e9))
+            oversleep_ns = max(0, time.perf_counter_ns() - wake_ns)
+            # Follow the recent oversleep so the busy-wait starts early enough on this system
+            target_ns = min(int(self.max_spin_margin * 1e9), max(int(self.spin_margin * 1e9), 2 * oversleep_ns))
+            self._margin_ns = (3 * self._margin_ns + target_ns) // 4
+        while time.perf_counter_ns() < deadline_ns:
+            pass
+
+
+def _percentile(ordered, percent):
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return math.nan
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+if __name__ == "__main__":
+    number_of_samples = 100
+    trigger_count = 10
+    trigger_interval = 0.5    # seconds between consecutive software triggers
+
+    # Waveforms stepped through by each software trigger, as in nifgen_trigger_modes.py
+    sine_wave = [math.sin(math.pi * 2 * x / number_of_samples) for x in range(number_of_samples)]
+    square_wave = [1.0 if x < (number_of_samples / 2) else -1.0 for x in range(number_of_samples)]
+    ramp_up = [x / number_of_samples for x in range(number_of_samples)]
+
+    with nifgen.Session(resource_name="C1_FGEN_S4", reset_device=True, options={}) as session:
+        session.output_mode = nifgen.OutputMode.SEQ
+        session.arb_sample_rate = 1e6
+        session.trigger_mode = nifgen.TriggerMode.BURST
+        session.start_trigger_type = nifgen.StartTriggerType.SOFTWARE_EDGE
+        waveform_handle = [session.create_waveform(waveform_data_array=waveform) for waveform in [sine_wave, square_wave, ramp_up]]
+        sequence_handle = session.create_arb_sequence(waveform_handle, loop_counts_array=[1, 1, 1])
+        session.configure_arb_sequence(sequence_handle=sequence_handle, gain=1.0, offset=0.0)
+
+        session.initiate()
+        scheduler = SoftwareTriggerScheduler([session])
+        print(scheduler.run_intervals([trigger_interval] * trigger_count))
+        session.abort()
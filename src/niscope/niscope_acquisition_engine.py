@@ -0,0 +1,215 @@
+"""NI-SCOPE - Background Acquisition Engine.
+
+This example demonstrates how to acquire waveforms on a dedicated thread, so the acquisition rate no longer depends on
+how often a consumer (for example a matplotlib animation) asks for new data.
+
+The acquisition thread continuously initiates the digitizer and fetches each record into one of two preallocated buffers,
+alternating between them. Once a record is complete it is published as the latest record, and any number of consumers can
+copy it out. Consumers that are slower than the digitizer simply skip records, which is reported through the counters.
+"""
+# Module imports
+import threading
+import time
+
+import numpy as np
+
+import niscope
+
+
+class AcquisitionEngine:
+    """Continuously acquire single records from one NI-SCOPE channel on a background thread.
+
+    Arguments
+    ---------
+    - session: NI-SCOPE session, already configured for single-record acquisitions.
+    - channel: Channel to fetch from.
+    - num_samples: Number of samples per record.
+    - dtype: NumPy data type of the fetched samples (float64, int8, int16 or int32).
+    - timeout: Fetch timeout, in seconds.
+    """
+
+    def __init__(self, session, channel, num_samples, dtype=np.float64, timeout=5.0):
+        self.session = session
+        self.channel = channel
+        self.num_samples = num_samples
+        self.dtype = np.dtype(dtype)
+        self.timeout = timeout
+        self.x_increment = None
+        self.records_acquired = 0
+        self.records_consumed = 0
+        self.records_dropped = 0
+        self.acquisition_rate = 0.0     # records per second, exponentially averaged
+
+        self._buffers = [np.empty(num_samples, dtype=self.dtype) for _ in range(2)]
+        self._published = None          # index of the buffer holding the latest complete record
+        self._published_info = None
+        self._published_read = True
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._error = None
+        self._start_time = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Start the acquisition thread."""
+        if self._thread is not None:
+            raise RuntimeError("Acquisition engine is already running.")
+        self._stop_event.clear()
+        self._error = None
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._acquire, name="niscope-acquisition", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the acquisition thread and abort the acquisition."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.session.abort()
+        with self._condition:
+            self._condition.notify_all()
+
+    @property
+    def elapsed_time(self):
+        """Time, in seconds, since the engine was started."""
+        return 0.0 if self._start_time is None else time.perf_counter() - self._start_time
+
+    @property
+    def average_acquisition_rate(self):
+        """Records per second acquired since the engine was started."""
+        elapsed = self.elapsed_time
+        return self.records_acquired / elapsed if elapsed > 0 else 0.0
+
+    def subscribe(self):
+        """Return a new RecordConsumer reading from this engine."""
+        return RecordConsumer(self)
+
+    def _acquire(self):
+        """Acquisition thread: initiate, fetch into the free buffer and publish it."""
+        write_index = 0
+        last_time = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                self.session.initiate()
+                waveform_info = self.session.channels[self.channel].fetch_into(waveform=self._buffers[write_index],
+                                                                               num_records=1, timeout=self.timeout)
+                now = time.perf_counter()
+                with self._condition:
+                    if not self._published_read:
+                        self.records_dropped += 1
+                    self._published = write_index
+                    self._published_info = waveform_info[0]
+                    self._published_read = False
+                    self.x_increment = waveform_info[0].x_increment
+                    self.records_acquired += 1
+                    rate = 1.0 / max(now - last_time, 1e-9)
+                    self.acquisition_rate = rate if self.records_acquired == 1 else 0.9 * self.acquisition_rate + 0.1 * rate
+                    self._condition.notify_all()
+                last_time = now
+                # The other buffer is free: it was either never published or it has just been replaced
+                write_index ^= 1
+        except Exception as error:
+            with self._condition:
+                self._error = error
+                self._condition.notify_all()
+
+    def _copy_latest(self, out, after, timeout):
+        """Wait for a record newer than 'after' and copy it into 'out'. Return (sequence, waveform_info)."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.records_acquired > after or self._error is not None
+                                            or self._thread is None, timeout=timeout):
+                raise TimeoutError("No new record was acquired within the timeout.")
+            if self._error is not None:
+                raise self._error
+            if self.records_acquired <= after:
+                raise RuntimeError("Acquisition engine is not running.")
+            # The published buffer is never written while it is published, and the swap needs this lock
+            np.copyto(out, self._buffers[self._published])
+            if not self._published_read:
+                self._published_read = True
+                self.records_consumed += 1
+            return self.records_acquired, self._published_info
+
+
+class RecordConsumer:
+    """Reader of the latest record published by an AcquisitionEngine.
+
+    Every consumer owns its own copy of the samples, so it can keep using them while the engine keeps acquiring.
+    Only the timing attributes of waveform_info should be used: its samples belong to the engine buffers.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.samples = np.empty(engine.num_samples, dtype=engine.dtype)
+        self.waveform_info = None
+        self.sequence = 0
+        self.records_read = 0
+        self.records_skipped = 0
+
+    def read(self, timeout=None):
+        """Wait for a record newer than the last one read, and return its samples."""
+        sequence, self.waveform_info = self.engine._copy_latest(self.samples, self.sequence, timeout)
+        if self.sequence:
+            self.records_skipped += sequence - self.sequence - 1
+        self.sequence = sequence
+        self.records_read += 1
+        return self.samples
+
+    def read_latest(self):
+        """Return the latest record if a new one is available, otherwise the samples already held."""
+        if self.engine.records_acquired > self.sequence:
+            return self.read(timeout=0)
+        return self.samples
+
+
+if __name__ == "__main__":
+    # Plotting is only needed when running this example, not when importing the engine
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as ticker
+    import matplotlib.animation as animation
+
+    # Plot default configurations
+    plt.rcParams["figure.figsize"] = [7.50, 3.50]
+    plt.rcParams["figure.autolayout"] = True
+
+    fig, ax = plt.subplots()
+
+    num_samples = 250
+
+    with niscope.Session(resource_name='PXIe5160', options={}) as session:
+        session.configure_vertical(range=5.0, coupling=niscope.VerticalCoupling.AC)
+        session.configure_horizontal_timing(min_sample_rate=50000000, min_num_pts=num_samples, ref_position=50.0, num_records=1, enforce_realtime=True)
+
+        with AcquisitionEngine(session, channel="1", num_samples=num_samples) as engine:
+            consumer = engine.subscribe()
+            samples = consumer.read(timeout=5.0)
+            x_time = np.arange(num_samples) * engine.x_increment
+
+            line, = ax.plot(x_time, samples)
+
+            def animate(i):
+                """Display the latest record, whatever the acquisition rate is"""
+                line.set_ydata(consumer.read_latest())
+                ax.set_title(f"{engine.acquisition_rate:.1f} records/s, {consumer.records_skipped} not displayed")
+                return line,
+
+            ax.xaxis.set_major_formatter(ticker.EngFormatter(unit="s"))
+            ax.yaxis.set_major_formatter(ticker.EngFormatter(unit="V"))
+            ax.set_xlabel('Time (s)')
+            ax.set_ylabel('Voltage (V)')
+            ax.grid()
+
+            ani = animation.FuncAnimation(fig, animate, interval=100, blit=False, save_count=50)
+            plt.show()
+
+        print(f"Acquired: {engine.records_acquired} records ({engine.average_acquisition_rate:.1f} records/s), "
+              f"never read by any consumer: {engine.records_dropped}")
@@ -0,0 +1,234 @@
+"""NI-SCOPE - Capture to Disk.
+
+This example demonstrates how to stream a long NI-SCOPE acquisition to disk at full rate, for later analysis.
+
+The digitizer runs a segmented acquisition that is allowed to hold more records than fit in onboard memory, and the
+records are fetched chunk by chunk into a pool of preallocated buffers. A writer thread empties the filled buffers to disk,
+so the fetch loop never waits on the file system as long as the disk keeps up on average.
+
+On disk, a capture is made of two files:
+- <name>.scope: a JSON header (x_increment, vertical range, coupling, ...) padded to a 4 KiB boundary, followed by the raw
+  samples of every record, one after the other. The sample region can be memory-mapped as a (records x samples) array.
+- <name>.scope.index: the trigger timestamp (seconds), gain and offset of every record, in the same order. Binary samples
+  are converted to volts with samples * gain + offset.
+Both files are only ever appended to, so a capture that was interrupted can still be read back.
+"""
+# Module imports
+import json
+import os
+import queue
+import threading
+
+import numpy as np
+
+import niscope
+
+from niscope_waveform_numpy import fetch_into_array
+
+
+FILE_MAGIC = b"NISCOPE-CAPTURE\n"
+HEADER_ALIGNMENT = 4096
+INDEX_SUFFIX = ".index"
+INDEX_DTYPE = np.dtype([("trigger_timestamp", "<f8"), ("gain", "<f8"), ("offset", "<f8")])
+
+
+def header_from_session(session, channel):
+    """Return the header values of a capture from the current configuration of a session."""
+    channels = session.channels[channel]
+    return {"channel": str(channel),
+            "sample_rate": session.horz_sample_rate,
+            "x_increment": 1.0 / session.horz_sample_rate,
+            "vertical_range": channels.vertical_range,
+            "vertical_offset": channels.vertical_offset,
+            "vertical_coupling": str(channels.vertical_coupling),
+            "probe_attenuation": channels.probe_attenuation}
+
+
+class CaptureRecorder:
+    """Write records to a capture file from a background writer thread.
+
+    Records are handed over in chunks: take a free chunk with get_buffer(), fill it (for example with fetch_into()),
+    then pass it to submit() together with the WaveformInfo list returned by the fetch.
+
+    Arguments
+    ---------
+    - path: Path of the capture file; the index file is written next to it.
+    - num_samples: Number of samples per record.
+    - header: Dictionary of values stored in the file header (see header_from_session()).
+    - dtype: NumPy data type of the samples.
+    - chunk_records: Number of records per chunk.
+    - num_buffers: Number of preallocated chunks, which is how far the fetch loop can get ahead of the disk.
+    """
+
+    def __init__(self, path, num_samples, header, dtype=np.int16, chunk_records=100, num_buffers=8):
+        self.path = path
+        self.num_samples = num_samples
+        self.dtype = np.dtype(dtype)
+        self.chunk_records = chunk_records
+        self.records_written = 0
+        self.bytes_written = 0
+
+        self._free = queue.Queue()
+        self._filled = queue.Queue()
+        for _ in range(num_buffers):
+            self._free.put(np.empty((chunk_records, num_samples), dtype=self.dtype))
+        self._error = None
+
+        self._data_file = open(path, "wb")
+        self._index_file = open(path + INDEX_SUFFIX, "wb")
+        self._write_header(header)
+        self._thread = threading.Thread(target=self._write, name="niscope-capture-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_buffer(self, timeout=None):
+        """Return a free (chunk_records x num_samples) array, waiting for the writer if all of them are in use."""
+        self._raise_writer_error()
+        try:
+            return self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("The writer thread is not keeping up with the acquisition.") from None
+
+    def submit(self, buffer, waveform_info):
+        """Queue the records of a buffer described by a WaveformInfo list to be written to disk."""
+        index = np.empty(len(waveform_info), dtype=INDEX_DTYPE)
+        index["trigger_timestamp"] = [info.absolute_initial_x - info.relative_initial_x for info in waveform_info]
+        index["gain"] = [getattr(info, "gain", 1.0) for info in waveform_info]
+        index["offset"] = [getattr(info, "offset", 0.0) for info in waveform_info]
+        self._filled.put((buffer, index))
+
+    def close(self):
+        """Write every queued chunk, then close the files."""
+        if self._thread is None:
+            return
+        self._filled.put(None)
+        self._thread.join()
+        self._thread = None
+        self._data_file.close()
+        self._index_file.close()
+        self._raise_writer_error()
+
+    def _write_header(self, header):
+        header = dict(header, num_samples=self.num_samples, dtype=self.dtype.str)
+        encoded = json.dumps(header).encode("utf-8")
+        header_size = -(-(len(FILE_MAGIC) + 4 + len(encoded)) // HEADER_ALIGNMENT) * HEADER_ALIGNMENT
+        self._data_file.write(FILE_MAGIC)
+        self._data_file.write(len(encoded).to_bytes(4, "little"))
+        self._data_file.write(encoded.ljust(header_size - len(FILE_MAGIC) - 4, b" "))
+
+    def _write(self):
+        """Writer thread: write filled chunks and give the buffers back to the fetch loop."""
+        while True:
+            item = self._filled.get()
+            if item is None:
+                break
+            buffer, index = item
+            num_records = len(index)
+            try:
+                if self._error is None:
+                    # Writing the samples before their timestamps keeps the index from pointing past the data
+                    self._data_file.write(memoryview(buffer[:num_records]).cast("B"))
+                    self._index_file.write(index.tobytes())
+                    self.records_written += num_records
+                    self.bytes_written += buffer[:num_records].nbytes
+            except Exception as error:
+                self._error = error
+            finally:
+                self._free.put(buffer)
+
+    def _raise_writer_error(self):
+        if self._error is not None:
+            raise self._error
+
+
+class CaptureFile:
+    """Capture read back from disk, with its samples memory-mapped.
+
+    Attributes
+    ----------
+    - header: Dictionary of values stored in the file header.
+    - samples: Read-only (records x samples) memory-mapped array.
+    - trigger_timestamps: Trigger timestamp of every record, in seconds.
+    - gain, offset: Scaling of every record to volts.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as data_file:
+            if data_file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"{path} is not a capture file.")
+            header_length = int.from_bytes(data_file.read(4), "little")
+            self.header = json.loads(data_file.read(header_length).decode("utf-8"))
+        header_size = -(-(len(FILE_MAGIC) + 4 + header_length) // HEADER_ALIGNMENT) * HEADER_ALIGNMENT
+
+        dtype = np.dtype(self.header["dtype"])
+        num_samples = self.header["num_samples"]
+        record_size = dtype.itemsize * num_samples
+        index = np.fromfile(path + INDEX_SUFFIX, dtype=INDEX_DTYPE)
+        # A capture that was interrupted may end with a partially written record or index entry
+        num_records = min((os.path.getsize(path) - header_size) // record_size, len(index))
+
+        self.trigger_timestamps = index["trigger_timestamp"][:num_records]
+        self.gain = index["gain"][:num_records]
+        self.offset = index["offset"][:num_records]
+        if num_records:
+            self.samples = np.memmap(path, dtype=dtype, mode="r", offset=header_size, shape=(num_records, num_samples))
+        else:
+            self.samples = np.empty((0, num_samples), dtype=dtype)
+
+    @property
+    def num_records(self):
+        return self.samples.shape[0]
+
+    @property
+    def x_increment(self):
+        return self.header["x_increment"]
+
+    def volts(self, records=slice(None)):
+        """Return the selected records (an index or a slice) scaled to volts."""
+        return self.samples[records] * self.gain[records, np.newaxis] + self.offset[records, np.newaxis]
+
+
+def capture(session, channel, recorder, num_records, timeout=5.0):
+    """Acquire 'num_records' records with a single initiate and stream them to a recorder.
+
+    The session must be configured with num_records records per acquisition; with allow_more_records_than_memory
+    enabled, this can be many more records than fit in onboard memory.
+    """
+    channels = session.channels[channel]
+    session.initiate()
+    for first in range(0, num_records, recorder.chunk_records):
+        count = min(recorder.chunk_records, num_records - first)
+        buffer = recorder.get_buffer(timeout=timeout)
+        waveform_info = fetch_into_array(channels, buffer[:count], record_number=first, timeout=timeout)
+        recorder.submit(buffer, waveform_info)
+
+
+if __name__ == "__main__":
+    import time
+
+    num_samples = 10000
+    num_records = 60000     # 1 minute of data with a 1 kHz trigger
+    capture_path = "capture.scope"
+
+    with niscope.Session(resource_name='PXIe5160', options={}) as session:
+        session.configure_vertical(range=5.0, coupling=niscope.VerticalCoupling.DC)
+        session.configure_trigger_edge(trigger_source='0', level=0.0, trigger_coupling=niscope.TriggerCoupling.DC, slope=niscope.TriggerSlope.POSITIVE)
+        session.allow_more_records_than_memory = True
+        session.configure_horizontal_timing(min_sample_rate=50e6, min_num_pts=num_samples, ref_position=50.0, num_records=num_records, enforce_realtime=True)
+
+        start_time = time.perf_counter()
+        # Binary (int16) samples are 4 times smaller than float64 volts; the header keeps what is needed to scale them
+        with CaptureRecorder(capture_path, num_samples, header_from_session(session, "0"), dtype=np.int16) as recorder:
+            capture(session, "0", recorder, num_records)
+        elapsed_time = time.perf_counter() - start_time
+        session.abort()
+
+    print(f"Wrote {recorder.records_written} records ({recorder.bytes_written / 1e6:.1f} MB) in {elapsed_time:.1f} s")
+
+    captured = CaptureFile(capture_path)
+    print(f"Read back {captured.num_records} records, header: {captured.header}")
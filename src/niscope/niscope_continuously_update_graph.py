@@ -1,6 +1,8 @@
 """NI-SCOPE - Continuously Update Graph
 
 This example demonstrates how to continuosly read a waveform, plot it, and update the plot with new sets of data.
+
+Set 'view' to "spectrum" to display the averaged power spectrum of the waveforms instead of the waveforms themselves.
 """
 # Module imports
 import matplotlib.pyplot as plt
@@ -9,6 +11,9 @@ import matplotlib.animation as animation
 
 import niscope
 
+from niscope_spectrum import PowerSpectrumAverager, get_plan, to_dbv
+from niscope_waveform_numpy import allocate_samples, fetch_into_array, time_axis
+
 
 # Plot default configurations
 plt.rcParams["figure.figsize"] = [7.50, 3.50]
@@ -20,18 +25,24 @@ fig, ax = plt.subplots()
 # Number of samples to be read
 num_samples = 250
 
-def update_samples(waveforms):
+# "time" displays the waveform, "spectrum" displays the power spectrum averaged over every waveform read so far
+view = "time"
+
+# Preallocated NumPy array the samples are fetched into on every update, instead of building a new list per read
+samples = allocate_samples(num_samples)
+
+def update_samples():
     """Function used to read from the scope, and constantly update the samples array"""
-    samples = []
-    # The 'samples' attribute returns a memory address. To get the samples list, iterate over waveforms[0].samples and append them to a new list
-    for sample in waveforms[0].samples:     # waveforms[0] corresponds to the first, and only in this example, waveform in the list
-        samples.append(sample)
-    return samples
+    session.initiate()
+    return fetch_into_array(session.channels["1"], out=samples)
 
 def animate(i):
     """Function which constantly reads waveform samples and updates the plot"""
-    waveforms = session.channels["1"].read(num_samples=num_samples)
-    line.set_ydata(update_samples(waveforms=waveforms))
+    update_samples()
+    if view == "spectrum":
+        line.set_ydata(to_dbv(averager.add(samples).average))
+    else:
+        line.set_ydata(samples)
     return line,
 
 with niscope.Session(resource_name='PXIe5160', options={}) as session:
@@ -39,27 +50,38 @@ with niscope.Session(resource_name='PXIe5160', options={}) as session:
     session.configure_vertical(range=5.0, coupling=niscope.VerticalCoupling.AC)
     session.configure_horizontal_timing(min_sample_rate=50000000, min_num_pts=num_samples, ref_position=50.0, num_records=1, enforce_realtime=True)
 
-    # Read and store waveform. Read() returns a list of waveforms, with each channel being an element of the list
-    # The elements within each channel are WaveformInfo class instances, with attributes that can be accessed
-    waveforms = session.channels["1"].read(num_samples=num_samples)
-
-    # The x_increment attribute returns the delta-t (dt) of the waveform. Multiplying this by a range of num_samples ensures that both x and y axes have the same length
-    x_time = [waveforms[0].x_increment * x for x in range(num_samples)]
-
-    # line object which will be used as a return value for the plot animation
-    line, = ax.plot(x_time, update_samples(waveforms=waveforms))
-
-    # Plot configuration
-    ax.xaxis.set_major_formatter(ticker.EngFormatter(unit="s"))
-    ax.yaxis.set_major_formatter(ticker.EngFormatter(unit="V"))
-    ax.set_xlabel('Time (s)')
-    ax.set_ylabel('Voltage (V)')
+    # Acquire and fetch the first waveform. fetch_into_array() returns a list of WaveformInfo class instances, with attributes that can be accessed,
+    # while the samples themselves are written into the 'samples' array
+    waveforms = update_samples()
+
+    # The x_increment attribute returns the delta-t (dt) of the waveform. The time axis is arange(num_samples) * x_increment, so both x and y axes have the same length
+    x_time = time_axis(num_samples, waveforms[0].x_increment)
+
+    if view == "spectrum":
+        # The window and frequency axis are computed once for this record length and sample interval
+        averager = PowerSpectrumAverager(get_plan(num_samples, waveforms[0].x_increment, "hann"))
+        line, = ax.plot(averager.plan.frequencies, to_dbv(averager.add(samples).average))
+
+        # Plot configuration
+        ax.xaxis.set_major_formatter(ticker.EngFormatter(unit="Hz"))
+        ax.set_ylim(-160, 20)
+        ax.set_xlabel('Frequency (Hz)')
+        ax.set_ylabel('Power (dBV)')
+    else:
+        # line object which will be used as a return value for the plot animation
+        line, = ax.plot(x_time, samples)
+
+        # Plot configuration
+        ax.xaxis.set_major_formatter(ticker.EngFormatter(unit="s"))
+        ax.yaxis.set_major_formatter(ticker.EngFormatter(unit="V"))
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Voltage (V)')
     ax.grid()
 
     # Below object is used to iterate over the animate() function and constantly update the plot
     ani = animation.FuncAnimation(fig, animate, interval=100, blit=True, save_count=50)
 
-    plt.title(label="Waveform Graph")
+    plt.title(label="Spectrum Graph" if view == "spectrum" else "Waveform Graph")
     plt.show()
 
     session.abort()
@@ -0,0 +1,164 @@
+"""NI-SCOPE - Mask Test.
+
+This example demonstrates how to screen NI-SCOPE records against an upper and a lower mask envelope.
+
+A mask is a pair of envelopes with one limit per sample. They can be given as arrays, built from piecewise-linear
+(time, voltage) breakpoints, or built around a reference waveform with a tolerance. Every record of a batch, either a
+single record (1-D) from a continuous loop or a 2-D (records x samples) array from a segmented acquisition, is compared
+to both envelopes in one vectorized operation. The result gives, for every record, whether it passed, the index of its
+first violating sample and its number of violating samples.
+"""
+# Module imports
+import numpy as np
+
+
+class Mask:
+    """Upper and lower envelopes a record must stay within.
+
+    Arguments
+    ---------
+    - upper: Upper limit of every sample; use np.inf (or NaN) where there is no upper limit.
+    - lower: Lower limit of every sample; use -np.inf (or NaN) where there is no lower limit.
+    """
+
+    def __init__(self, upper, lower):
+        upper = np.array(upper, dtype=np.float64)
+        lower = np.array(lower, dtype=np.float64)
+        if upper.shape != lower.shape or upper.ndim != 1:
+            raise ValueError("Upper and lower envelopes must be 1-D arrays of the same length.")
+        upper[np.isnan(upper)] = np.inf
+        lower[np.isnan(lower)] = -np.inf
+        if np.any(lower > upper):
+            raise ValueError("The lower envelope must not be above the upper envelope.")
+        upper.flags.writeable = False
+        lower.flags.writeable = False
+        self.upper = upper
+        self.lower = lower
+
+    @property
+    def num_samples(self):
+        return self.upper.size
+
+    @classmethod
+    def from_piecewise(cls, upper_points, lower_points, num_samples, x_increment, initial_x=0.0):
+        """Build a mask from piecewise-linear envelopes.
+
+        Arguments
+        ---------
+        - upper_points, lower_points: Lists of (time, voltage) breakpoints, sorted by time, or None for no limit.
+          Before the first and after the last breakpoint, the envelope keeps the value of that breakpoint.
+        - num_samples, x_increment, initial_x: Time axis of the records the mask applies to.
+        """
+        x_time = initial_x + np.arange(num_samples) * x_increment
+        return cls(_interpolate(upper_points, x_time, np.inf), _interpolate(lower_points, x_time, -np.inf))
+
+    @classmethod
+    def from_reference(cls, reference, tolerance):
+        """Build a mask around a reference waveform, with an absolute tolerance (scalar or per sample) on both sides."""
+        reference = np.asarray(reference, dtype=np.float64)
+        return cls(reference + tolerance, reference - tolerance)
+
+    def evaluate(self, records):
+        """Compare every record (last axis) against the mask and return a MaskResult."""
+        records = np.asarray(records)
+        if records.shape[-1] != self.num_samples:
+            raise ValueError(f"Records have {records.shape[-1]} samples, the mask has {self.num_samples}.")
+        above = records > self.upper
+        below = records < self.lower
+        violations = above | below
+        failed = violations.any(axis=-1)
+        return MaskResult(passed=~failed,
+                          first_violation=np.where(failed, violations.argmax(axis=-1), -1),
+                          violation_count=violations.sum(axis=-1),
+                          upper_violation_count=above.sum(axis=-1),
+                          lower_violation_count=below.sum(axis=-1))
+
+
+class MaskResult:
+    """Result of a mask test, with one element per record.
+
+    Attributes
+    ----------
+    - passed: True where the record stayed within the mask.
+    - first_violation: Index of the first violating sample, or -1 for records that passed.
+    - violation_count: Number of violating samples.
+    - upper_violation_count, lower_violation_count: Number of samples above the upper / below the lower envelope.
+    """
+
+    def __init__(self, passed, first_violation, violation_count, upper_violation_count, lower_violation_count):
+        self.passed = passed
+        self.first_violation = first_violation
+        self.violation_count = violation_count
+        self.upper_violation_count = upper_violation_count
+        self.lower_violation_count = lower_violation_count
+
+    @property
+    def failed_records(self):
+        """Indices of the records that failed (for a 2-D batch)."""
+        return np.flatnonzero(~np.atleast_1d(self.passed))
+
+
+class MaskTester:
+    """Keep running mask test totals over a stream of records or batches of records."""
+
+    def __init__(self, mask):
+        self.mask = mask
+        self.records_tested = 0
+        self.records_failed = 0
+        self.failed_record_numbers = []
+
+    def test(self, records):
+        """Test one record or a batch of records, update the totals, and return the MaskResult."""
+        result = self.mask.evaluate(records)
+        passed = np.atleast_1d(result.passed)
+        self.failed_record_numbers.extend((self.records_tested + result.failed_records).tolist())
+        self.records_tested += passed.size
+        self.records_failed += passed.size - int(passed.sum())
+        return result
+
+    @property
+    def failure_rate(self):
+        return self.records_failed / self.records_tested if self.records_tested else 0.0
+
+
+def _interpolate(points, x_time, no_limit):
+    """Sample a piecewise-linear envelope on a time axis."""
+    if points is None:
+        return np.full(x_time.shape, no_limit)
+    times, values = np.asarray(points, dtype=np.float64).T
+    if np.any(np.diff(times) < 0):
+        raise ValueError("Mask breakpoints must be sorted by time.")
+    return np.interp(x_time, times, values)
+
+
+if __name__ == "__main__":
+    import niscope
+
+    from niscope_segmented_acquisition import acquire_segmented, configure_segmented_acquisition
+
+    num_records = 1000
+    num_samples = 1000
+    num_acquisitions = 10
+
+    with niscope.Session(resource_name='PXIe5160', options={}) as session:
+        session.configure_vertical(range=5.0, coupling=niscope.VerticalCoupling.DC)
+        session.configure_trigger_edge(trigger_source='0', level=0.5, trigger_coupling=niscope.TriggerCoupling.DC, slope=niscope.TriggerSlope.POSITIVE)
+        configure_segmented_acquisition(session, num_records=num_records, num_samples=num_samples, min_sample_rate=50e6)
+
+        # Mask for a 0 V to 1 V step at the trigger point (ref_position = 50 %), with 100 mV of margin
+        x_increment = 1.0 / session.horz_sample_rate
+        trigger_time = num_samples / 2 * x_increment
+        mask = Mask.from_piecewise(upper_points=[(0, 0.1), (trigger_time - 20e-9, 0.1), (trigger_time, 1.1)],
+                                   lower_points=[(0, -0.1), (trigger_time + 20e-9, -0.1), (trigger_time + 60e-9, 0.9)],
+                                   num_samples=num_samples, x_increment=x_increment)
+        tester = MaskTester(mask)
+
+        for acquisition in range(num_acquisitions):
+            records = acquire_segmented(session, channel="0", num_records=num_records, num_samples=num_samples)
+            tester.test(records.samples)
+
+        print(f"Tested {tester.records_tested} records, {tester.records_failed} failed ({100 * tester.failure_rate:.3f} %)")
+        if tester.failed_record_numbers:
+            print(f"First failing records: {tester.failed_record_numbers[:10]}")
+
+        session.abort()
@@ -8,6 +8,8 @@ import matplotlib.ticker as ticker
 
 import niscope
 
+from niscope_waveform_numpy import samples_view, waveform_time_axis
+
 
 # Plot default configurations
 plt.rcParams["figure.figsize"] = [7.50, 3.50]
@@ -17,7 +19,6 @@ plt.rcParams["figure.autolayout"] = True
 fig, ax = plt.subplots()
 
 num_samples = 250   # Number of samples to be read
-samples = []        # List where samples will be stored for plotting
 
 with niscope.Session(resource_name='PXIe5160', options={}) as session:
     # Scope configuration
@@ -29,12 +30,11 @@ with niscope.Session(resource_name='PXIe5160', options={}) as session:
     # The elements within each channel are WaveformInfo class instances, with attributes that can be accessed
     waveforms = session.channels["1"].read(num_samples=num_samples)
 
-    # The 'samples' attribute returns a memory address. To get the samples list, iterate over waveforms[0].samples and append them to a new list
-    for sample in waveforms[0].samples:     # waveforms[0] corresponds to the first, and only in this example, waveform in the list
-        samples.append(sample)
+    # The 'samples' attribute is a memoryview into the fetched buffer. samples_view() wraps it in a NumPy array without copying it
+    samples = samples_view(waveforms[0])    # waveforms[0] corresponds to the first, and only in this example, waveform in the list
 
-    # The x_increment attribute returns the delta-t (dt) of the waveform. Multiplying this by a range of num_samples ensures that both x and y axes have the same length
-    x_time = [waveforms[0].x_increment * x for x in range(num_samples)]
+    # The x_increment attribute returns the delta-t (dt) of the waveform. The time axis is arange(num_samples) * x_increment, so both x and y axes have the same length
+    x_time = waveform_time_axis(waveforms[0])
 
     # Plot configuration
     ax.xaxis.set_major_formatter(ticker.EngFormatter(unit="s"))
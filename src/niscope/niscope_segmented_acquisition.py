@@ -0,0 +1,139 @@
+"""NI-SCOPE - Segmented (Multi-Record) Acquisition.
+
+This example demonstrates how to acquire many records with a single initiate, and fetch them in bulk into a
+2-D NumPy array (records x samples).
+
+The other NI-SCOPE examples acquire one record per initiate/read round trip, which limits the trigger rate to what the
+host can keep up with. In a segmented acquisition the digitizer re-arms itself in hardware after every trigger and stores
+each record in onboard memory, while the host fetches completed records in chunks. The trigger timestamp of every record
+is kept, so the time between triggers can still be analyzed.
+"""
+# Module imports
+import numpy as np
+
+import niscope
+
+from niscope_waveform_numpy import allocate_samples, fetch_into_array
+
+
+class SegmentedRecords:
+    """Records fetched from a segmented acquisition.
+
+    Attributes
+    ----------
+    - samples: 2-D NumPy array (records x samples).
+    - x_increment: Time between two samples, in seconds.
+    - relative_initial_x: Time of the first sample relative to the trigger, in seconds (negative with pretrigger samples).
+    - trigger_timestamps: Absolute time of each record's trigger, in seconds.
+    - relative_offsets: Time of each record's trigger relative to the first record's trigger, in seconds.
+    """
+
+    def __init__(self, samples, x_increment, relative_initial_x, trigger_timestamps):
+        self.samples = samples
+        self.x_increment = x_increment
+        self.relative_initial_x = relative_initial_x
+        self.trigger_timestamps = trigger_timestamps
+        self.relative_offsets = trigger_timestamps - trigger_timestamps[0] if len(trigger_timestamps) else trigger_timestamps
+
+    @property
+    def num_records(self):
+        return self.samples.shape[0]
+
+    @property
+    def trigger_intervals(self):
+        """Time between consecutive triggers, in seconds."""
+        return np.diff(self.trigger_timestamps)
+
+    @property
+    def trigger_rate(self):
+        """Average number of triggers per second over the whole acquisition."""
+        span = self.relative_offsets[-1] if self.num_records > 1 else 0.0
+        return (self.num_records - 1) / span if span > 0 else float("nan")
+
+
+def configure_segmented_acquisition(session, num_records, num_samples, min_sample_rate, ref_position=50.0, allow_more_records_than_memory=False):
+    """Configure the horizontal timing for many records per initiate.
+
+    Arguments
+    ---------
+    - session: NI-SCOPE session, with the vertical and trigger settings already configured.
+    - num_records: Number of records (triggers) acquired per initiate.
+    - num_samples: Number of samples per record.
+    - min_sample_rate: Minimum sample rate, in S/s.
+    - ref_position: Position of the trigger within each record, in percent.
+    - allow_more_records_than_memory: Let the digitizer acquire more records than fit in onboard memory, as long as
+      they are fetched fast enough.
+    """
+    session.allow_more_records_than_memory = allow_more_records_than_memory
+    session.configure_horizontal_timing(min_sample_rate=min_sample_rate, min_num_pts=num_samples, ref_position=ref_position,
+                                        num_records=num_records, enforce_realtime=True)
+
+
+def fetch_records(channels, num_records, num_samples, out=None, chunk_records=100, timeout=5.0):
+    """Fetch all the records of an initiated segmented acquisition.
+
+    Records are fetched in chunks as soon as they are acquired, directly into one 2-D array.
+
+    Arguments
+    ---------
+    - channels: Repeated capabilities object for a single channel, for example session.channels["0"].
+    - num_records: Number of records configured for the acquisition.
+    - num_samples: Number of samples per record.
+    - out: Optional preallocated array (records x samples) to fetch into, reused across acquisitions. For a single
+      record, the 1-D array of allocate_samples() is accepted too.
+    - chunk_records: Number of records fetched per call.
+    - timeout: Timeout of each fetch call, in seconds.
+    """
+    if out is None:
+        out = np.empty((num_records, num_samples), dtype=np.float64)
+    elif num_records == 1 and out.shape == (num_samples,):
+        # A view, so the samples still land in the caller's array
+        out = out.reshape(1, num_samples)
+    if out.shape != (num_records, num_samples):
+        raise ValueError(f"Output array shape must be {(num_records, num_samples)}, got {out.shape}.")
+
+    absolute_initial_x = np.empty(num_records, dtype=np.float64)
+    relative_initial_x = 0.0
+    x_increment = 0.0
+    for first in range(0, num_records, chunk_records):
+        last = min(first + chunk_records, num_records)
+        # Rows of a C-contiguous 2-D array are contiguous, so each chunk is fetched straight into 'out'
+        waveform_info = fetch_into_array(channels, out[first:last], record_number=first, timeout=timeout)
+        absolute_initial_x[first:last] = [info.absolute_initial_x for info in waveform_info]
+        relative_initial_x = waveform_info[0].relative_initial_x
+        x_increment = waveform_info[0].x_increment
+
+    # The first sample of every record is relative_initial_x away from its trigger
+    return SegmentedRecords(out, x_increment, relative_initial_x, absolute_initial_x - relative_initial_x)
+
+
+def acquire_segmented(session, channel, num_records, num_samples, out=None, chunk_records=100, timeout=5.0):
+    """Initiate a configured segmented acquisition and fetch all of its records."""
+    session.initiate()
+    return fetch_records(session.channels[channel], num_records, num_samples, out=out, chunk_records=chunk_records, timeout=timeout)
+
+
+if __name__ == "__main__":
+    import time
+
+    num_records = 1000
+    num_samples = 1000
+
+    with niscope.Session(resource_name='PXIe5160', options={}) as session:
+        # Scope configuration
+        session.configure_vertical(range=5.0, coupling=niscope.VerticalCoupling.DC)
+        session.configure_trigger_edge(trigger_source='0', level=0.0, trigger_coupling=niscope.TriggerCoupling.DC, slope=niscope.TriggerSlope.POSITIVE)
+        configure_segmented_acquisition(session, num_records=num_records, num_samples=num_samples, min_sample_rate=50e6)
+
+        # The same array is reused for every acquisition
+        samples = allocate_samples(num_samples, num_records)
+
+        start_time = time.perf_counter()
+        records = acquire_segmented(session, channel="0", num_records=num_records, num_samples=num_samples, out=samples)
+        elapsed_time = time.perf_counter() - start_time
+
+        print(f"Fetched {records.num_records} records x {num_samples} samples in {elapsed_time:.3f} s")
+        print(f"Trigger rate: {records.trigger_rate:.1f} triggers/s")
+        print(f"Trigger intervals: min {records.trigger_intervals.min():.3e} s, max {records.trigger_intervals.max():.3e} s")
+
+        session.abort()
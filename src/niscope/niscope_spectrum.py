@@ -0,0 +1,240 @@
+"""NI-SCOPE - Spectrum Analysis.
+
+This example demonstrates how to compute the frequency-domain view of fetched NI-SCOPE records: windowed FFT, averaged
+power spectrum, total harmonic distortion (THD) and signal-to-noise ratio (SNR).
+
+Everything that only depends on the record length, the sample interval and the window (window coefficients, scaling,
+frequency axis) is computed once per configuration and cached in a SpectrumPlan. Records are transformed in batches:
+a 2-D (records x samples) array is transformed with a single FFT call along its last axis.
+
+Power spectra are single-sided and expressed in Vrms^2 per bin, so the peak of a tone that falls on a bin reads its
+power. THD and SNR sum the power of every bin in the main lobe of each tone, then correct for the window's equivalent
+noise bandwidth (ENBW).
+
+THD and SNR are exact when the sampling is coherent, i.e. when every record holds an integer number of periods of the
+fundamental so that the tones fall on bins. Otherwise, a tone leaks into bins far beyond its main lobe; the noise is
+then measured away from every tone, where the leakage of the window is below a given level, and extrapolated to the
+bins left out. Use a low-sidelobe window (Blackman-Harris or flat top) for non-coherent tones: the leakage of the Hann
+or Blackman windows only decays slowly and takes many bins, and that of the rectangular window never gets low enough,
+so it requires coherent sampling and leakage_level=None.
+"""
+# Module imports
+import functools
+
+import numpy as np
+
+
+# Cosine-sum window coefficients, and the number of bins on each side of a tone that hold its main lobe
+WINDOWS = {"rectangular": ((1.0,), 1),
+           "hann": ((0.5, 0.5), 2),
+           "hamming": ((0.54, 0.46), 2),
+           "blackman": ((0.42, 0.5, 0.08), 3),
+           "blackmanharris": ((0.35875, 0.48829, 0.14128, 0.01168), 4),
+           "flattop": ((0.21557895, 0.41663158, 0.277263158, 0.083578947, 0.006947368), 5)}
+
+
+@functools.lru_cache(maxsize=32)
+def window(name, num_samples):
+    """Return the (read-only) periodic window of a given name and length, computed once per length."""
+    if name not in WINDOWS:
+        raise ValueError(f"Unknown window '{name}'; expected one of {', '.join(WINDOWS)}.")
+    coefficients, _ = WINDOWS[name]
+    phase = 2.0 * np.pi * np.arange(num_samples) / num_samples
+    values = np.zeros(num_samples)
+    for order, coefficient in enumerate(coefficients):
+        values += (-1) ** order * coefficient * np.cos(order * phase)
+    values.flags.writeable = False
+    return values
+
+
+class SpectrumPlan:
+    """Cached window, scaling and frequency axis for records of one length and sample interval.
+
+    Use get_plan() rather than creating plans directly, so they are shared.
+    """
+
+    def __init__(self, num_samples, x_increment, window_name="hann"):
+        self.num_samples = num_samples
+        self.x_increment = x_increment
+        self.window_name = window_name
+        self.window = window(window_name, num_samples)
+        self.lobe_half_width = WINDOWS[window_name][1]
+        self._leakage_half_widths = {}
+
+        window_sum = self.window.sum()
+        # Equivalent noise bandwidth, in bins: how much the window spreads the power of a tone over adjacent bins
+        self.enbw = num_samples * np.square(self.window).sum() / window_sum ** 2
+        self.frequencies = np.fft.rfftfreq(num_samples, d=x_increment)
+        self.frequencies.flags.writeable = False
+
+        # |X|^2 to single-sided Vrms^2: every bin except DC (and Nyquist for even lengths) also holds the negative frequency
+        scale = np.full(self.frequencies.size, 2.0 / window_sum ** 2)
+        scale[0] = 1.0 / window_sum ** 2
+        if num_samples % 2 == 0:
+            scale[-1] = 1.0 / window_sum ** 2
+        scale.flags.writeable = False
+        self._scale = scale
+
+    @property
+    def resolution(self):
+        """Frequency spacing between two bins, in Hz."""
+        return 1.0 / (self.num_samples * self.x_increment)
+
+    def leakage_half_width(self, level):
+        """Return the number of bins on each side of a tone beyond which its leakage is below 'level'.
+
+        The level is a power relative to the tone, e.g. 1e-10 for -100 dBc. The tone can fall anywhere between two bins,
+        so the span covers the worst case. It is at least the main lobe and at most half the spectrum.
+        """
+        if level not in self._leakage_half_widths:
+            # Response of the window to a tone, every 1/8 bin, relative to its peak
+            oversampling = 8
+            response = np.abs(np.fft.rfft(self.window, n=oversampling * self.num_samples)) ** 2
+            farthest = np.flatnonzero(response >= level * response[0])[-1] / oversampling
+            # A tone half a bin away from a bin puts its leakage at 'farthest' half a bin further
+            half_width = int(np.ceil(farthest + 0.5))
+            self._leakage_half_widths[level] = min(max(half_width, self.lobe_half_width), self.num_samples // 2)
+        return self._leakage_half_widths[level]
+
+    def fft(self, records):
+        """Return the windowed FFT of every record (last axis), as a complex array."""
+        return np.fft.rfft(np.asarray(records) * self.window, axis=-1)
+
+    def power_spectrum(self, records):
+        """Return the single-sided power spectrum, in Vrms^2, of every record (last axis)."""
+        spectrum = self.fft(records)
+        return (spectrum.real ** 2 + spectrum.imag ** 2) * self._scale
+
+
+@functools.lru_cache(maxsize=32)
+def get_plan(num_samples, x_increment, window_name="hann"):
+    """Return the SpectrumPlan of a record configuration, created once and reused afterwards."""
+    return SpectrumPlan(num_samples, x_increment, window_name)
+
+
+def power_spectrum(records, x_increment, window_name="hann"):
+    """Return the single-sided power spectrum, in Vrms^2, of every record (last axis)."""
+    records = np.asarray(records)
+    return get_plan(records.shape[-1], x_increment, window_name).power_spectrum(records)
+
+
+class PowerSpectrumAverager:
+    """Incremental average of the power spectra of records of the same configuration.
+
+    Records can be added one at a time or in batches; only the running sum is kept.
+    """
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.count = 0
+        self._sum = np.zeros(plan.frequencies.size)
+
+    def add(self, records):
+        """Add one record (1-D) or a batch of records (2-D, records x samples) to the average."""
+        spectra = self.plan.power_spectrum(records)
+        if spectra.ndim == 1:
+            self._sum += spectra
+            self.count += 1
+        else:
+            self._sum += spectra.reshape(-1, spectra.shape[-1]).sum(axis=0)
+            self.count += spectra.size // spectra.shape[-1]
+        return self
+
+    def reset(self):
+        self.count = 0
+        self._sum[:] = 0.0
+
+    @property
+    def average(self):
+        """Averaged power spectrum, in Vrms^2."""
+        return self._sum / max(self.count, 1)
+
+
+def to_dbv(power):
+    """Convert a power spectrum in Vrms^2 to dBV (dB relative to 1 Vrms)."""
+    return 10.0 * np.log10(np.maximum(power, 1e-30))
+
+
+def distortion_analysis(power, plan, num_harmonics=5, fundamental_frequency=None, leakage_level=1e-10):
+    """Compute THD and SNR of every power spectrum (last axis) in one vectorized pass.
+
+    Arguments
+    ---------
+    - power: Power spectra, as returned by power_spectrum() or PowerSpectrumAverager.average.
+    - plan: SpectrumPlan used to compute the spectra.
+    - num_harmonics: Number of harmonics, starting at the 2nd, included in the THD.
+    - fundamental_frequency: Frequency of the fundamental, in Hz. By default, the largest non-DC bin of each spectrum.
+    - leakage_level: Leakage of the tones (power relative to each tone) below which bins are counted as noise; see
+      SpectrumPlan.leakage_half_width(). None only leaves the main lobes out, which requires coherent sampling.
+
+    Returns a dictionary of arrays: fundamental frequency (Hz), fundamental power (Vrms^2), THD (ratio) and SNR (dB).
+    """
+    power = np.asarray(power)
+    num_bins = power.shape[-1]
+    half_width = plan.lobe_half_width
+    offsets = np.arange(-half_width, half_width + 1)
+
+    if fundamental_frequency is None:
+        search = power[..., half_width + 1:]
+        fundamental_bin = search.argmax(axis=-1) + half_width + 1
+    else:
+        fundamental_bin = np.full(power.shape[:-1], int(round(fundamental_frequency / plan.resolution)))
+
+    # (... x tones x lobe) bin indices of the fundamental (tone 0) and its harmonics
+    tone_centers = fundamental_bin[..., np.newaxis] * np.arange(1, num_harmonics + 2)
+    tone_bins = tone_centers[..., np.newaxis] + offsets
+    in_band = (tone_bins > half_width) & (tone_bins < num_bins)
+    tone_bins = np.clip(tone_bins, 0, num_bins - 1)
+    flat_bins = tone_bins.reshape(power.shape[:-1] + (-1,))
+    lobe_power = np.take_along_axis(power, flat_bins, axis=-1).reshape(tone_bins.shape)
+    lobe_power = np.where(in_band, lobe_power, 0.0)
+    tone_power = lobe_power.sum(axis=-1) / plan.enbw
+
+    fundamental_power = tone_power[..., 0]
+    harmonic_power = tone_power[..., 1:].sum(axis=-1)
+    # Noise is measured away from DC, the fundamental and the harmonics, where their leakage is negligible, then
+    # extrapolated to the bins left out; overlapping spans are only removed once
+    leakage_half_width = half_width if leakage_level is None else plan.leakage_half_width(leakage_level)
+    leakage_bins = tone_centers[..., np.newaxis] + np.arange(-leakage_half_width, leakage_half_width + 1)
+    leakage_bins = np.where((leakage_bins >= 0) & (leakage_bins < num_bins), leakage_bins, 0)
+    used = np.zeros(power.shape, dtype=bool)
+    used[..., :leakage_half_width + 1] = True
+    np.put_along_axis(used, leakage_bins.reshape(power.shape[:-1] + (-1,)), True, axis=-1)
+    noise_bins = (~used).sum(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        noise_power = np.where(used, 0.0, power).sum(axis=-1) * (num_bins - half_width - 1) / noise_bins / plan.enbw
+        return {"fundamental_frequency": fundamental_bin * plan.resolution,
+                "fundamental_power": fundamental_power,
+                "thd": np.sqrt(harmonic_power / fundamental_power),
+                "snr": 10.0 * np.log10(fundamental_power / noise_power)}
+
+
+if __name__ == "__main__":
+    import niscope
+
+    from niscope_segmented_acquisition import acquire_segmented, configure_segmented_acquisition
+
+    num_records = 100
+    num_samples = 4096
+
+    with niscope.Session(resource_name='PXIe5160', options={}) as session:
+        session.configure_vertical(range=5.0, coupling=niscope.VerticalCoupling.AC)
+        configure_segmented_acquisition(session, num_records=num_records, num_samples=num_samples, min_sample_rate=50e6)
+
+        records = acquire_segmented(session, channel="0", num_records=num_records, num_samples=num_samples)
+        # The tone is not coherent with the sample clock, so a low-sidelobe window keeps its leakage out of the noise
+        plan = get_plan(num_samples, records.x_increment, "blackmanharris")
+
+        # Per-record results, from one batched FFT
+        results = distortion_analysis(plan.power_spectrum(records.samples), plan)
+        print(f"THD: {100 * np.mean(results['thd']):.4f} % (std {100 * np.std(results['thd']):.4f} %)")
+        print(f"SNR: {np.mean(results['snr']):.2f} dB (std {np.std(results['snr']):.2f} dB)")
+
+        # Averaging lowers the variance of the noise floor
+        averager = PowerSpectrumAverager(plan).add(records.samples)
+        averaged = distortion_analysis(averager.average, plan)
+        print(f"Averaged over {averager.count} records: fundamental {averaged['fundamental_frequency']:.1f} Hz, "
+              f"THD {100 * averaged['thd']:.4f} %")
+
+        session.abort()
@@ -0,0 +1,189 @@
+"""NI-SCOPE - Vectorized Waveform Measurements.
+
+This example demonstrates how to compute waveform measurements on the host for many records at once.
+
+Instead of asking the driver for one measurement of one record at a time, the fetched samples are kept in a NumPy array
+whose last axis is the sample axis, for example a 2-D (records x samples) array from a segmented acquisition, or a 3-D
+(devices x channels x samples) array from synchronized digitizers. Every measurement is computed for all records in a
+single vectorized pass, without Python loops over records or samples.
+
+Edge-based measurements (frequency, rise/fall time, duty cycle) use configurable low/mid/high reference levels, either as
+a percentage of each record's min-to-max range or as absolute voltages. Records without the required edges return NaN.
+"""
+# Module imports
+import numpy as np
+
+
+class ReferenceLevels:
+    """Low, mid and high reference levels used by the edge-based measurements.
+
+    Arguments
+    ---------
+    - low, mid, high: Reference levels, either in percent of each record's min-to-max range or in volts.
+    - units: "percent" or "volts".
+    """
+
+    def __init__(self, low=10.0, mid=50.0, high=90.0, units="percent"):
+        if units not in ("percent", "volts"):
+            raise ValueError("Reference level units must be 'percent' or 'volts'.")
+        if not low < mid < high:
+            raise ValueError("Reference levels must satisfy low < mid < high.")
+        self.low = low
+        self.mid = mid
+        self.high = high
+        self.units = units
+
+    def resolve(self, samples):
+        """Return the (low, mid, high) levels in volts, shaped to broadcast against 'samples'."""
+        if self.units == "volts":
+            return self.low, self.mid, self.high
+        base = samples.min(axis=-1, keepdims=True)
+        span = samples.max(axis=-1, keepdims=True) - base
+        return tuple(base + span * (level / 100.0) for level in (self.low, self.mid, self.high))
+
+
+def rms(samples):
+    """Root mean square of every record."""
+    samples = np.asarray(samples, dtype=np.float64)
+    return np.sqrt(np.einsum("...i,...i->...", samples, samples) / samples.shape[-1])
+
+
+def mean(samples):
+    """Mean value of every record."""
+    return np.asarray(samples).mean(axis=-1)
+
+
+def peak_to_peak(samples):
+    """Difference between the maximum and the minimum of every record."""
+    return np.ptp(np.asarray(samples), axis=-1)
+
+
+def frequency(samples, x_increment, reference_levels=None):
+    """Frequency of every record, from the rising crossings of the mid reference level, in Hz."""
+    samples = np.asarray(samples, dtype=np.float64)
+    _, mid, _ = (reference_levels or ReferenceLevels()).resolve(samples)
+    return _frequency(samples, mid, x_increment)
+
+
+def rise_time(samples, x_increment, reference_levels=None):
+    """Time between the low and the high reference crossings of the first rising edge, in seconds."""
+    samples = np.asarray(samples, dtype=np.float64)
+    low, _, high = (reference_levels or ReferenceLevels()).resolve(samples)
+    return _transition_time(samples, low, high, x_increment)
+
+
+def fall_time(samples, x_increment, reference_levels=None):
+    """Time between the high and the low reference crossings of the first falling edge, in seconds."""
+    samples = np.asarray(samples, dtype=np.float64)
+    low, _, high = (reference_levels or ReferenceLevels()).resolve(samples)
+    # A falling edge of the waveform is a rising edge of the negated waveform
+    return _transition_time(-samples, -high, -low, x_increment)
+
+
+def duty_cycle(samples, reference_levels=None):
+    """Percentage of every whole period spent above the mid reference level."""
+    samples = np.asarray(samples, dtype=np.float64)
+    _, mid, _ = (reference_levels or ReferenceLevels()).resolve(samples)
+    return _duty_cycle(samples, mid)
+
+
+def measure(samples, x_increment, reference_levels=None):
+    """Compute every measurement of this module for all records, resolving the reference levels only once.
+
+    Returns a dictionary of NumPy arrays, each with the shape of 'samples' without its last (sample) axis.
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    low, mid, high = (reference_levels or ReferenceLevels()).resolve(samples)
+    return {"rms": rms(samples),
+            "mean": mean(samples),
+            "peak_to_peak": peak_to_peak(samples),
+            "frequency": _frequency(samples, mid, x_increment),
+            "rise_time": _transition_time(samples, low, high, x_increment),
+            "fall_time": _transition_time(-samples, -high, -low, x_increment),
+            "duty_cycle": _duty_cycle(samples, mid)}
+
+
+def _rising_crossings(samples, level):
+    """Boolean mask, one element shorter than the records, of the rising crossings between sample k and k + 1."""
+    return (samples[..., :-1] < level) & (samples[..., 1:] >= level)
+
+
+def _first_index(mask):
+    """Index of the first True element of every record, and whether there is one."""
+    return mask.argmax(axis=-1), mask.any(axis=-1)
+
+
+def _last_index(mask):
+    """Index of the last True element of every record, and whether there is one."""
+    return mask.shape[-1] - 1 - mask[..., ::-1].argmax(axis=-1), mask.any(axis=-1)
+
+
+def _crossing_position(samples, index, level):
+    """Fractional sample position of the crossing between sample 'index' and 'index + 1', by linear interpolation."""
+    index = index[..., np.newaxis]
+    before = np.take_along_axis(samples, index, axis=-1)
+    after = np.take_along_axis(samples, index + 1, axis=-1)
+    level = np.broadcast_to(level, before.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(after != before, (level - before) / (after - before), 0.0)
+    return (index + fraction)[..., 0]
+
+
+def _frequency(samples, mid, x_increment):
+    crossings = _rising_crossings(samples, mid)
+    count = crossings.sum(axis=-1)
+    first, _ = _first_index(crossings)
+    last, _ = _last_index(crossings)
+    span = (_crossing_position(samples, last, mid) - _crossing_position(samples, first, mid)) * x_increment
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((count >= 2) & (span > 0), (count - 1) / span, np.nan)
+
+
+def _transition_time(samples, low, high, x_increment):
+    # The first rising edge is the first crossing of the high level preceded by a crossing of the low level; it starts
+    # at the last low crossing before it, which ignores noise around the low level
+    low_crossings = _rising_crossings(samples, low)
+    positions = np.arange(low_crossings.shape[-1])
+    last_low = np.maximum.accumulate(np.where(low_crossings, positions, -1), axis=-1)
+    high_crossings = _rising_crossings(samples, high) & (last_low >= 0)
+    high_index, found = _first_index(high_crossings)
+    low_index = np.take_along_axis(last_low, high_index[..., np.newaxis], axis=-1)[..., 0]
+    low_index = np.maximum(low_index, 0)
+    duration = (_crossing_position(samples, high_index, high) - _crossing_position(samples, low_index, low)) * x_increment
+    return np.where(found, duration, np.nan)
+
+
+def _duty_cycle(samples, mid):
+    crossings = _rising_crossings(samples, mid)
+    first, _ = _first_index(crossings)
+    last, _ = _last_index(crossings)
+    count = crossings.sum(axis=-1)
+    # Only whole periods count: from the sample after the first rising crossing up to the last rising crossing
+    positions = np.arange(samples.shape[-1])
+    window = (positions > first[..., np.newaxis]) & (positions <= last[..., np.newaxis])
+    high_samples = ((samples >= mid) & window).sum(axis=-1)
+    window_samples = window.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((count >= 2) & (window_samples > 0), 100.0 * high_samples / window_samples, np.nan)
+
+
+if __name__ == "__main__":
+    import niscope
+
+    from niscope_segmented_acquisition import acquire_segmented, configure_segmented_acquisition
+
+    num_records = 1000
+    num_samples = 2000
+
+    with niscope.Session(resource_name='PXIe5160', options={}) as session:
+        session.configure_vertical(range=5.0, coupling=niscope.VerticalCoupling.DC)
+        session.configure_trigger_edge(trigger_source='0', level=0.0, trigger_coupling=niscope.TriggerCoupling.DC, slope=niscope.TriggerSlope.POSITIVE)
+        configure_segmented_acquisition(session, num_records=num_records, num_samples=num_samples, min_sample_rate=50e6)
+
+        records = acquire_segmented(session, channel="0", num_records=num_records, num_samples=num_samples)
+        results = measure(records.samples, records.x_increment, ReferenceLevels(low=10.0, mid=50.0, high=90.0))
+
+        for name, values in results.items():
+            print(f"{name:<15} mean: {np.nanmean(values):.4e}  std: {np.nanstd(values):.4e}")
+
+        session.abort()
@@ -0,0 +1,71 @@
+"""NI-SCOPE - NumPy Waveform Helpers.
+
+This example demonstrates how to work with fetched NI-SCOPE samples as NumPy arrays without copying them.
+
+The 'samples' attribute of a WaveformInfo instance is not a list: it is a memoryview into the buffer the driver fetched into
+(that is why printing it shows a memory address). NumPy can wrap that buffer directly, so there is no need to iterate over it
+and append every sample to a new list. When the same record length is fetched repeatedly, the samples can also be fetched
+into a preallocated, caller-owned NumPy array with fetch_into(), and the time axis can be computed once and reused.
+"""
+# Module imports
+import functools
+
+import numpy as np
+
+import niscope
+
+
+def samples_view(waveform_info, dtype=np.float64):
+    """Return the samples of a WaveformInfo instance as a NumPy array sharing its memory.
+
+    Arguments
+    ---------
+    - waveform_info: WaveformInfo instance returned by read(), fetch() or fetch_into().
+    - dtype: Data type of the samples; read() and fetch() return float64 samples.
+    """
+    samples = waveform_info.samples
+    if isinstance(samples, np.ndarray):
+        # fetch_into() already returns views into the caller's array
+        return samples
+    return np.frombuffer(samples, dtype=dtype)
+
+
+def allocate_samples(num_samples, num_records=1, dtype=np.float64):
+    """Allocate an array that fetch_into_array() can reuse for every acquisition.
+
+    The array is 1-D for a single record and 2-D (records x samples) otherwise.
+    """
+    shape = (num_samples,) if num_records == 1 else (num_records, num_samples)
+    return np.empty(shape, dtype=dtype)
+
+
+def fetch_into_array(channels, out, relative_to=niscope.FetchRelativeTo.PRETRIGGER, offset=0, record_number=0, timeout=5.0):
+    """Fetch the acquired records straight into a caller-owned array and return the WaveformInfo list.
+
+    Arguments
+    ---------
+    - channels: Repeated capabilities object, for example session.channels["1"].
+    - out: C-contiguous float64, int8, int16 or int32 NumPy array, 1-D for one record or 2-D (records x samples).
+    - relative_to, offset, record_number, timeout: Passed on to fetch_into().
+    """
+    if not out.flags.c_contiguous:
+        raise ValueError("The output array must be C-contiguous to be fetched into.")
+    num_records = 1 if out.ndim == 1 else out.shape[0]
+    # fetch_into() needs a flat array; reshape() of a contiguous array is a view, so samples land in 'out' directly
+    return channels.fetch_into(waveform=out.reshape(-1), relative_to=relative_to, offset=offset,
+                               record_number=record_number, num_records=num_records, timeout=timeout)
+
+
+@functools.lru_cache(maxsize=32)
+def time_axis(num_samples, x_increment, initial_x=0.0):
+    """Return the (read-only) time axis of a record, computed once per record length and sample interval."""
+    axis = np.arange(num_samples, dtype=np.float64) * x_increment
+    if initial_x:
+        axis += initial_x
+    axis.flags.writeable = False
+    return axis
+
+
+def waveform_time_axis(waveform_info):
+    """Return the time axis, relative to the first sample, of a WaveformInfo instance."""
+    return time_axis(len(waveform_info.samples), waveform_info.x_increment)
@@ -4,35 +4,38 @@ This examples demonstrates how to get the devices installed in a chassis.
 """
 import nisyscfg
 
+from nisyscfg_inventory import read_inventory
 
-def get_chassis(session):
-    "Filter and find chassis in the system."
-    filter = session.create_filter()
-    filter.is_present = True
-    filter.is_ni_product = True
-    filter.is_chassis = True
-    for chassis in session.find_hardware(filter):
+
+def get_chassis(inventory):
+    "Find chassis in the system."
+    for chassis in inventory.chassis:
         print("Chassis: ", chassis.name)
-    get_modules(session)
+        get_modules(inventory, chassis.name)
+
+
+def get_modules(inventory, chassis):
+    "Find modules installed in a chassis, whatever its number of slots."
+    for module in inventory.modules(chassis):
+        print("Slot " + str(module.slot) + ": ", module.name)
 
 
-def get_modules(session):
-    "Filter and find modules installed in the system."
-    filter = session.create_filter()
-    filter.is_present = True
-    filter.is_ni_product = True
-    filter.is_device = True
-    filter.number_of_slots = 9
-    for slot in range(filter.number_of_slots + 1):
-        filter.slot_number = slot
-        for module in session.find_hardware(filter):
-            print("Slot " + str(slot) + ": ", module.name)
+def get_other_devices(inventory):
+    "Find devices that are not matched to a chassis (standalone devices, or modules of an unknown chassis)."
+    devices = inventory.modules(None)
+    if devices:
+        print("Not in a chassis: ")
+    for device in devices:
+        print(("Slot " + str(device.slot) if device.slot is not None else "Device") + ": ", device.name)
 
 
 def get_installed_devices():
     "Open NI System Configuration session."
     with nisyscfg.Session() as session:
-        get_chassis(session)
+        # All chassis and modules are found with a single query
+        inventory = read_inventory(session)
+    get_chassis(inventory)
+    get_other_devices(inventory)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,185 @@
+"""NI System Configuration - Hardware Inventory.
+
+This module reads all the NI hardware present in a system with a single find_hardware() query, instead of one query per
+slot or per script, and keeps the result in memory.
+
+Every property is read once from the resources, chassis and modules are grouped (modules are matched to the chassis
+they connect to), and the devices are indexed by alias, serial number, product name and (chassis, slot). The
+InventoryService caches the inventory of a target for a given time to live, and can be invalidated explicitly, e.g.
+after a device was added or renamed.
+"""
+
+# Module imports
+import threading
+import time
+
+import nisyscfg
+
+
+class Device:
+    """Properties of one chassis or device, read once from its nisyscfg resource.
+
+    Attributes
+    ----------
+    - name: User alias (e.g. 'PXI1Slot2').
+    - product: Product name (e.g. 'PXIe-5160').
+    - serial_number: Serial number, or None if the device does not report one.
+    - slot: Slot number, or None for devices that are not in a chassis.
+    - chassis: Name of the chassis the device is in, or None.
+    - firmware_revision: Firmware revision, or None if the device firmware cannot be updated.
+    - is_chassis: Whether the resource is a chassis.
+    """
+
+    __slots__ = ("name", "product", "serial_number", "slot", "chassis", "firmware_revision", "is_chassis",
+                 "provides_link", "connects_to_link")
+
+    def __init__(self, name, product, serial_number=None, slot=None, chassis=None, firmware_revision=None, is_chassis=False,
+                 provides_link=None, connects_to_link=None):
+        self.name = name
+        self.product = product
+        self.serial_number = serial_number
+        self.slot = slot
+        self.chassis = chassis
+        self.firmware_revision = firmware_revision
+        self.is_chassis = is_chassis
+        self.provides_link = provides_link
+        self.connects_to_link = connects_to_link
+
+    def __repr__(self):
+        return f"Device(name={self.name!r}, product={self.product!r}, chassis={self.chassis!r}, slot={self.slot})"
+
+    @classmethod
+    def from_resource(cls, resource):
+        """Read the properties of a nisyscfg hardware resource."""
+        supports_firmware_update = _property(resource, "supports_firmware_update", False)
+        return cls(name=resource.expert_user_alias[0],
+                   product=_property(resource, "product_name"),
+                   serial_number=_property(resource, "serial_number"),
+                   slot=_property(resource, "slot_number"),
+                   firmware_revision=_property(resource, "firmware_revision") if supports_firmware_update else None,
+                   is_chassis=bool(_property(resource, "is_chassis", False)),
+                   provides_link=_property(resource, "provides_link_name"),
+                   connects_to_link=_property(resource, "connects_to_link_name"))
+
+
+class Inventory:
+    """Chassis and devices of a system, with indexed lookups.
+
+    Attributes
+    ----------
+    - target: System the inventory was read from.
+    - timestamp: time.time() when the inventory was read.
+    - chassis: Chassis, in name order.
+    - devices: Devices (modules and standalone devices), in (chassis, slot, name) order.
+    - by_name, by_serial_number: Dictionaries of alias / serial number to Device (chassis included).
+    - by_product: Dictionary of product name to its list of Device.
+    - by_slot: Dictionary of (chassis name, slot number) to Device.
+    """
+
+    def __init__(self, resources, target="localhost", timestamp=None):
+        self.target = target
+        self.timestamp = time.time() if timestamp is None else timestamp
+        resources = list(resources)
+
+        # Modules report the link their chassis provides
+        links = {resource.provides_link: resource.name for resource in resources if resource.is_chassis and resource.provides_link}
+        for resource in resources:
+            if not resource.is_chassis and resource.chassis is None:
+                resource.chassis = links.get(resource.connects_to_link)
+
+        self.chassis = sorted((resource for resource in resources if resource.is_chassis), key=lambda resource: resource.name)
+        self.devices = sorted((resource for resource in resources if not resource.is_chassis),
+                              key=lambda device: (device.chassis or "", -1 if device.slot is None else device.slot, device.name))
+        self.by_name = {resource.name: resource for resource in self.chassis + self.devices}
+        self.by_serial_number = {resource.serial_number: resource for resource in self.chassis + self.devices if resource.serial_number}
+        self.by_product = {}
+        for resource in self.chassis + self.devices:
+            self.by_product.setdefault(resource.product, []).append(resource)
+        self.by_slot = {(device.chassis, device.slot): device for device in self.devices if device.slot is not None}
+
+    def modules(self, chassis):
+        """Return the devices installed in a chassis, in slot order."""
+        return [device for device in self.devices if device.chassis == chassis]
+
+    def find(self, name=None, serial_number=None, product=None, chassis=None, slot=None):
+        """Return the devices (chassis included) matching all the given properties."""
+        if name is not None:
+            candidates = [self.by_name[name]] if name in self.by_name else []
+        elif serial_number is not None:
+            candidates = [self.by_serial_number[serial_number]] if serial_number in self.by_serial_number else []
+        elif product is not None:
+            candidates = self.by_product.get(product, [])
+        else:
+            candidates = self.chassis + self.devices
+        return [device for device in candidates
+                if (serial_number is None or device.serial_number == serial_number)
+                and (product is None or device.product == product)
+                and (chassis is None or device.chassis == chassis)
+                and (slot is None or device.slot == slot)]
+
+
+def read_inventory(session, target="localhost"):
+    """Read the inventory of a system with a single find_hardware() query."""
+    filter = session.create_filter()
+    filter.is_present = True
+    filter.is_ni_product = True
+    resources = []
+    for resource in session.find_hardware(filter):
+        if _property(resource, "is_chassis", False) or _property(resource, "is_device", False):
+            resources.append(Device.from_resource(resource))
+    return Inventory(resources, target)
+
+
+class InventoryService:
+    """Inventory of a system, cached for a time to live.
+
+    Arguments
+    ---------
+    - target: System to read the inventory from.
+    - ttl: Time to live of the cached inventory, in seconds.
+    - session_factory: Callable returning a nisyscfg session for a target (nisyscfg.Session by default).
+    """
+
+    def __init__(self, target="localhost", ttl=300.0, session_factory=None):
+        self.target = target
+        self.ttl = ttl
+        self.session_factory = session_factory or (lambda target: nisyscfg.Session(target=target))
+        self._inventory = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return the cached inventory, reading it again if it expired or was invalidated."""
+        with self._lock:
+            if self._inventory is None or time.monotonic() >= self._expires:
+                with self.session_factory(self.target) as session:
+                    self._inventory = read_inventory(session, self.target)
+                self._expires = time.monotonic() + self.ttl
+            return self._inventory
+
+    def invalidate(self):
+        """Discard the cached inventory, so the next get() reads the hardware again."""
+        with self._lock:
+            self._inventory = None
+
+
+def _property(resource, name, default=None):
+    """Value of a resource property, or 'default' for properties the resource does not have."""
+    try:
+        return resource.get_property(name, default)
+    except AttributeError:
+        return default
+
+
+if __name__ == "__main__":
+    service = InventoryService(ttl=60)
+    inventory = service.get()
+
+    for chassis in inventory.chassis:
+        print("Chassis: ", chassis.name)
+        for module in inventory.modules(chassis.name):
+            print(f"  Slot {module.slot}: {module.name} ({module.product}, S/N {module.serial_number})")
+
+    # Later lookups are served from memory
+    for device in service.get().find(product="PXIe-5160"):
+        print(f"PXIe-5160 found: {device.name} in {device.chassis}, slot {device.slot}")
@@ -0,0 +1,218 @@
+"""NI System Configuration - Inventory Snapshots and Drift Detection.
+
+This example demonstrates how to keep a history of the software and firmware installed on test stations, and how to
+report only what changed since the previous audit instead of printing full tables every time.
+
+The state of each station (devices, firmware revisions and software versions) is stored as a record identified by the
+hash of its contents, and a snapshot only maps every station to the hash of its record. A record is stored once however
+many snapshots share it, so the store stays small, and stations whose hash did not change are known to be identical
+without comparing anything. The whole store is a single compact JSON file, loaded with one read.
+
+Later runs only re-query what can change. Devices and their location only change across a restart, so a station whose
+system start time is the one of its last record keeps its stored devices: only its software and the firmware revisions
+of the devices that support firmware updates are read again, instead of every property of every resource. Devices
+hot-plugged without a restart (USB, Ethernet) are only seen by a full read, which removing the target from
+SnapshotStore.start_times forces.
+"""
+
+# Module imports
+import hashlib
+import json
+import os
+import time
+
+from nisyscfg_inventory import Device, Inventory, read_inventory
+from nisyscfg_multi_target_inventory import InventoryCollector, SystemSnapshot
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".nidriver-python-examples", "inventory_snapshots.json")
+
+
+class TargetDiff:
+    """Changes of one target between two snapshots.
+
+    Attributes
+    ----------
+    - software_added, software_removed: Dictionaries of software title to version.
+    - software_changed: Dictionary of software title to (old version, new version).
+    - firmware_changed: Dictionary of device name to (old revision, new revision).
+    - devices_added, devices_removed: Dictionaries of device name to product name.
+    - product_changed, serial_number_changed: Dictionaries of device name to (old value, new value), for devices
+      replaced by another one under the same name.
+    - location_changed: Dictionary of device name to ((old chassis, old slot), (new chassis, new slot)).
+
+    Every field of the records is compared, so two records with different hashes always have a non-empty diff.
+    """
+
+    def __init__(self, old, new):
+        old_software, new_software = old.get("software", {}), new.get("software", {})
+        self.software_added = {new_software[key][0]: new_software[key][1] for key in new_software.keys() - old_software.keys()}
+        self.software_removed = {old_software[key][0]: old_software[key][1] for key in old_software.keys() - new_software.keys()}
+        self.software_changed = {new_software[key][0]: (old_software[key][1], new_software[key][1])
+                                 for key in old_software.keys() & new_software.keys() if old_software[key][1] != new_software[key][1]}
+
+        old_devices, new_devices = old.get("devices", {}), new.get("devices", {})
+        self.devices_added = {name: new_devices[name][0] for name in new_devices.keys() - old_devices.keys()}
+        self.devices_removed = {name: old_devices[name][0] for name in old_devices.keys() - new_devices.keys()}
+        common_devices = old_devices.keys() & new_devices.keys()
+
+        def changed(field):
+            return {name: (old_devices[name][field], new_devices[name][field])
+                    for name in common_devices if old_devices[name][field] != new_devices[name][field]}
+
+        self.product_changed = changed(0)
+        self.serial_number_changed = changed(1)
+        self.location_changed = {name: (tuple(old_devices[name][2:4]), tuple(new_devices[name][2:4]))
+                                 for name in common_devices if old_devices[name][2:4] != new_devices[name][2:4]}
+        self.firmware_changed = changed(4)
+
+    @property
+    def empty(self):
+        return not (self.software_added or self.software_removed or self.software_changed or self.firmware_changed
+                    or self.devices_added or self.devices_removed or self.product_changed or self.serial_number_changed
+                    or self.location_changed)
+
+    def lines(self):
+        """Return the changes as printable lines."""
+        return ([f"+ {title} {version}" for title, version in sorted(self.software_added.items())]
+                + [f"- {title} {version}" for title, version in sorted(self.software_removed.items())]
+                + [f"~ {title} {old} -> {new}" for title, (old, new) in sorted(self.software_changed.items())]
+                + [f"+ device {name} ({product})" for name, product in sorted(self.devices_added.items())]
+                + [f"- device {name} ({product})" for name, product in sorted(self.devices_removed.items())]
+                + [f"~ device {name} {old} -> {new}" for name, (old, new) in sorted(self.product_changed.items())]
+                + [f"~ serial number of {name} {old} -> {new}" for name, (old, new) in sorted(self.serial_number_changed.items())]
+                + [f"~ location of {name} chassis {old[0]} slot {old[1]} -> chassis {new[0]} slot {new[1]}"
+                   for name, (old, new) in sorted(self.location_changed.items())]
+                + [f"~ firmware of {name} {old} -> {new}" for name, (old, new) in sorted(self.firmware_changed.items())])
+
+
+def system_record(system):
+    """Return the record of a SystemSnapshot: its devices (product, serial number, chassis, slot, firmware revision) and software."""
+    devices = {}
+    if system.inventory is not None:
+        devices = {device.name: [device.product, device.serial_number, device.chassis, device.slot, device.firmware_revision]
+                   for device in system.inventory.devices}
+    return {"devices": devices, "software": {key: list(value) for key, value in system.software.items()}}
+
+
+def record_hash(record):
+    """Return the hash identifying the contents of a record."""
+    return hashlib.sha256(json.dumps(record, sort_keys=True, separators=(",", ":")).encode()).hexdigest()[:16]
+
+
+class SnapshotStore:
+    """History of the records of every target, saved to a JSON file.
+
+    Arguments
+    ---------
+    - path: Path of the store file.
+    - max_snapshots: Number of snapshots kept; older ones and the records only they used are dropped.
+
+    Attributes
+    ----------
+    - snapshots: List of snapshots, oldest first. A snapshot is a dictionary with its 'timestamp', 'targets' (target
+      name to record hash) and 'unreachable' (targets that could not be read, which keep their previous record).
+    - records: Dictionary of record hash to record.
+    - start_times: Dictionary of target name to the system start time of its last record, as a string.
+    """
+
+    def __init__(self, path, max_snapshots=100):
+        self.path = path
+        self.max_snapshots = max_snapshots
+        self.snapshots = []
+        self.records = {}
+        self.start_times = {}
+        if os.path.exists(path):
+            with open(path) as store_file:
+                contents = json.load(store_file)
+            self.snapshots = contents["snapshots"]
+            self.records = contents["records"]
+            self.start_times = contents.get("start_times", {})
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as store_file:
+            json.dump({"snapshots": self.snapshots, "records": self.records, "start_times": self.start_times}, store_file,
+                      separators=(",", ":"))
+
+    def read_system(self, session, target):
+        """Return the SystemSnapshot of a target, reading its hardware again only if it restarted since its last record.
+
+        Use it as the 'read' argument of InventoryCollector.
+        """
+        start = time.perf_counter()
+        start_time = str(session.resource.system_start_time)
+        last_record = self.records.get(self.snapshots[-1]["targets"].get(target)) if self.snapshots else None
+        if last_record is not None and self.start_times.get(target) == start_time:
+            # Only the firmware can change without a restart
+            filter = session.create_filter()
+            filter.is_present = True
+            filter.is_ni_product = True
+            filter.supports_firmware_update = True
+            firmware = {resource.expert_user_alias[0]: resource.firmware_revision for resource in session.find_hardware(filter)}
+            devices = [Device(name, product, serial_number, slot, chassis, firmware.get(name, firmware_revision))
+                       for name, (product, serial_number, chassis, slot, firmware_revision) in last_record["devices"].items()]
+            inventory = Inventory(devices, target)
+        else:
+            inventory = read_inventory(session, target)
+        software = {component.id: (component.title, component.version)
+                    for component in session.get_installed_software_components() or []}
+        return SystemSnapshot(target, inventory, software, elapsed_time=time.perf_counter() - start,
+                              system_start_time=start_time)
+
+    def add(self, fleet_snapshot):
+        """Add a FleetSnapshot (nisyscfg_multi_target_inventory) and return the new snapshot entry."""
+        previous = self.snapshots[-1]["targets"] if self.snapshots else {}
+        targets = dict(previous)
+        unreachable = []
+        for target, system in fleet_snapshot.systems.items():
+            if not system.ok:
+                unreachable.append(target)
+                continue
+            record = system_record(system)
+            key = record_hash(record)
+            self.records.setdefault(key, record)
+            targets[target] = key
+            if system.system_start_time is not None:
+                self.start_times[target] = system.system_start_time
+
+        self.snapshots.append({"timestamp": fleet_snapshot.timestamp, "targets": targets, "unreachable": unreachable})
+        if len(self.snapshots) > self.max_snapshots:
+            del self.snapshots[:-self.max_snapshots]
+            used = {key for snapshot in self.snapshots for key in snapshot["targets"].values()}
+            self.records = {key: record for key, record in self.records.items() if key in used}
+        return self.snapshots[-1]
+
+    def diff(self, old=-2, new=-1):
+        """Return a dictionary of target name to TargetDiff between two snapshots (the last two by default).
+
+        Only targets whose record changed are compared and returned; a target missing from one of the snapshots is
+        compared to an empty record.
+        """
+        if len(self.snapshots) < 2:
+            return {}
+        old_targets, new_targets = self.snapshots[old]["targets"], self.snapshots[new]["targets"]
+        return {target: TargetDiff(self.records.get(old_targets.get(target), {}), self.records.get(new_targets.get(target), {}))
+                for target in sorted(old_targets.keys() | new_targets.keys())
+                if old_targets.get(target) != new_targets.get(target)}
+
+
+if __name__ == "__main__":
+    import sys
+
+    targets = sys.argv[1:] or ["localhost"]
+    store = SnapshotStore(DEFAULT_STORE_PATH)
+
+    store.add(InventoryCollector(timeout=30, read=store.read_system).collect(targets))
+    store.save()
+
+    snapshot = store.snapshots[-1]
+    print(f"Snapshot of {len(snapshot['targets'])} targets at {time.ctime(snapshot['timestamp'])}")
+    for target in snapshot["unreachable"]:
+        print(f"{target}: could not be read, previous state kept")
+
+    changes = store.diff()
+    for target, target_diff in changes.items():
+        print(f"\n{target}:")
+        print("\n".join("  " + line for line in target_diff.lines()))
+    if len(store.snapshots) > 1 and not changes:
+        print("No changes since the previous snapshot.")
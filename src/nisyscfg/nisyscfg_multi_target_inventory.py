@@ -0,0 +1,197 @@
+"""NI System Configuration - Multi-Target Inventory.
+
+This example demonstrates how to audit the hardware, firmware revisions and installed software of many test stations
+at once.
+
+Each target is queried in its own thread, with a bounded number of them running at once, so a few slow stations do not
+hold up the others, and every target has its own timeout: a target that does not answer in time is reported as such,
+without waiting for it. Its thread is left behind as a daemon thread, so it makes room for the next target and does
+not keep the interpreter from exiting. The results are merged into a single snapshot, which shows at a glance which
+stations differ.
+
+Sessions are created by a session factory, so the collector can be run against local stand-in targets.
+"""
+
+# Module imports
+import collections
+import queue
+import threading
+import time
+
+import nisyscfg
+
+from nisyscfg_inventory import read_inventory
+
+
+class SystemSnapshot:
+    """Inventory of one target.
+
+    Attributes
+    ----------
+    - target: Name of the system.
+    - inventory: Inventory of its hardware (nisyscfg_inventory), or None if it could not be read.
+    - software: Dictionary of software component id to (title, version).
+    - error: Exception raised while reading the target, 'timeout' if it did not answer in time, or None.
+    - elapsed_time: Time spent reading the target, in seconds.
+    - system_start_time: Time the system started, for readers that check it (see nisyscfg_inventory_snapshots), or None.
+    """
+
+    def __init__(self, target, inventory=None, software=None, error=None, elapsed_time=0.0, system_start_time=None):
+        self.target = target
+        self.inventory = inventory
+        self.software = software or {}
+        self.error = error
+        self.elapsed_time = elapsed_time
+        self.system_start_time = system_start_time
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def firmware(self):
+        """Dictionary of device name to firmware revision, for devices whose firmware can be updated."""
+        if self.inventory is None:
+            return {}
+        return {device.name: device.firmware_revision for device in self.inventory.devices if device.firmware_revision is not None}
+
+
+class FleetSnapshot:
+    """Merged inventory of several targets.
+
+    Attributes
+    ----------
+    - systems: Dictionary of target name to SystemSnapshot, in the order the targets were given.
+    - timestamp: time.time() when the collection started.
+    - elapsed_time: Duration of the collection, in seconds.
+    """
+
+    def __init__(self, systems, timestamp, elapsed_time):
+        self.systems = systems
+        self.timestamp = timestamp
+        self.elapsed_time = elapsed_time
+
+    @property
+    def failed(self):
+        """Dictionary of target name to error, for the targets that could not be read."""
+        return {target: system.error for target, system in self.systems.items() if not system.ok}
+
+    def devices(self):
+        """Return every device of every target, as (target, Device) pairs."""
+        return [(target, device) for target, system in self.systems.items() if system.inventory is not None
+                for device in system.inventory.devices]
+
+    def software_versions(self):
+        """Return a dictionary of software title to {version: [targets]}."""
+        versions = {}
+        for target, system in self.systems.items():
+            for title, version in system.software.values():
+                versions.setdefault(title, {}).setdefault(version, []).append(target)
+        return versions
+
+    def firmware_revisions(self):
+        """Return a dictionary of product name to {firmware revision: [(target, device name)]}."""
+        revisions = {}
+        for target, device in self.devices():
+            if device.firmware_revision is not None:
+                revisions.setdefault(device.product, {}).setdefault(device.firmware_revision, []).append((target, device.name))
+        return revisions
+
+    def drift(self):
+        """Return the software titles and products installed with more than one version across the targets."""
+        return ({title: versions for title, versions in self.software_versions().items() if len(versions) > 1},
+                {product: revisions for product, revisions in self.firmware_revisions().items() if len(revisions) > 1})
+
+
+def read_system(session, target):
+    """Return the SystemSnapshot of a target from an open nisyscfg session."""
+    start = time.perf_counter()
+    inventory = read_inventory(session, target)
+    software = {component.id: (component.title, component.version)
+                for component in session.get_installed_software_components() or []}
+    return SystemSnapshot(target, inventory, software, elapsed_time=time.perf_counter() - start)
+
+
+class InventoryCollector:
+    """Read the inventory of many targets concurrently.
+
+    Arguments
+    ---------
+    - max_workers: Maximum number of targets queried at the same time; targets that timed out no longer count.
+    - timeout: Time allowed to each target, from the moment its query starts, in seconds.
+    - session_factory: Callable returning a nisyscfg session (usable as a context manager) for a target name, e.g. a
+      stand-in for tests. By default, a nisyscfg.Session whose connection timeout is 'timeout'.
+    - read: Callable returning the SystemSnapshot of a target from its open session; read_system() by default.
+    """
+
+    def __init__(self, max_workers=8, timeout=60.0, session_factory=None, read=read_system):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session_factory = session_factory or (lambda target: nisyscfg.Session(target=target, timeout=timeout))
+        self.read = read
+
+    def collect(self, targets):
+        """Query every target and return the FleetSnapshot."""
+        timestamp = time.time()
+        start = time.perf_counter()
+        targets = list(dict.fromkeys(targets))
+        systems = {}
+        results = queue.Queue()     # (target, SystemSnapshot) of the completed queries
+
+        def read(target):
+            query_start = time.monotonic()
+            try:
+                with self.session_factory(target) as session:
+                    system = self.read(session, target)
+            except Exception as error:
+                system = SystemSnapshot(target, error=error, elapsed_time=time.monotonic() - query_start)
+            results.put((target, system))
+
+        waiting = collections.deque(targets)
+        running = {}                # target -> time.monotonic() when its query started
+        while waiting or running:
+            while waiting and len(running) < self.max_workers:
+                target = waiting.popleft()
+                running[target] = time.monotonic()
+                threading.Thread(target=read, args=(target,), name=f"nisyscfg-inventory-{target}", daemon=True).start()
+
+            # Wake up when a query completes or when the earliest running query reaches its timeout
+            try:
+                target, system = results.get(timeout=max(0.0, min(running.values()) + self.timeout - time.monotonic()))
+                # Results of the targets that already timed out are dropped
+                if running.pop(target, None) is not None:
+                    systems[target] = system
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            for target, query_start in list(running.items()):
+                if now >= query_start + self.timeout:
+                    del running[target]
+                    systems[target] = SystemSnapshot(target, error="timeout", elapsed_time=now - query_start)
+
+        return FleetSnapshot({target: systems[target] for target in targets}, timestamp, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Targets are given on the command line, e.g. python nisyscfg_multi_target_inventory.py station01 station02
+    targets = sys.argv[1:] or ["localhost"]
+
+    snapshot = InventoryCollector(max_workers=16, timeout=30).collect(targets)
+    print(f"{len(targets)} targets read in {snapshot.elapsed_time:.1f} s")
+
+    line_format = "{:<25} {:<8} {:<10} {:<10} {:<10}"
+    print(line_format.format("Target", "Status", "Devices", "Software", "Time (s)"), "\n")
+    for target, system in snapshot.systems.items():
+        print(line_format.format(target, "OK" if system.ok else "FAILED",
+                                 len(system.inventory.devices) if system.inventory else "-",
+                                 len(system.software), f"{system.elapsed_time:.1f}"))
+
+    software_drift, firmware_drift = snapshot.drift()
+    for title, versions in software_drift.items():
+        print(f"\n{title}: " + ", ".join(f"{version} on {len(version_targets)} target(s)" for version, version_targets in versions.items()))
+    for product, revisions in firmware_drift.items():
+        print(f"\n{product} firmware: " + ", ".join(f"{revision} on {len(devices)} device(s)" for revision, devices in revisions.items()))
+    for target, error in snapshot.failed.items():
+        print(f"\n{target} could not be read: {error}")
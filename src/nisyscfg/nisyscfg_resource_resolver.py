@@ -0,0 +1,152 @@
+"""NI System Configuration - Resource Resolver.
+
+This module maps logical instrument roles ("scope", "smu", ...) to the resource names of the station, instead of
+hardcoding names like "PXI1Slot2" that differ from one station to another.
+
+Roles are described by the properties of the device they need (product name, chassis, slot, serial number or alias).
+The hardware is discovered once with nisyscfg_inventory and kept in a small file per target, shared by every script and
+process of the station. The file is discovered again when the system has restarted since (which is when PXI hardware
+changes), when it is older than its time to live, when it is invalidated explicitly, when a role matches no device in
+it (a USB or Ethernet device may have been added, or an alias renamed, without a restart) or when the driver cannot open
+a resolved resource.
+"""
+
+# Module imports
+import json
+import os
+import re
+import tempfile
+import time
+
+import nisyscfg
+
+from nisyscfg_inventory import Device, Inventory, read_inventory
+
+# Default cache file, formatted with the target name
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), "nisyscfg_resources_{target}.json")
+ROLE_PROPERTIES = ("name", "serial_number", "product", "chassis", "slot")
+
+
+class ResourceResolver:
+    """Resolve logical roles to resource names.
+
+    Arguments
+    ---------
+    - roles: Dictionary of role name to the device properties it needs, among ROLE_PROPERTIES, plus an optional 'index'
+      to pick among several matching devices, in (chassis, slot) order. A string is a product name.
+    - cache_path: Path of the discovery cache file; by default, DEFAULT_CACHE_PATH for the target.
+    - ttl: Time to live of the cache file, in seconds.
+    - target: System to discover.
+    - session_factory: Callable returning a nisyscfg session for a target name (nisyscfg.Session by default).
+    """
+
+    def __init__(self, roles, cache_path=None, ttl=24 * 3600.0, target="localhost", session_factory=None):
+        self.roles = {role: {"product": spec} if isinstance(spec, str) else dict(spec) for role, spec in roles.items()}
+        self.cache_path = cache_path or DEFAULT_CACHE_PATH.format(target=re.sub(r"[^\w.-]", "_", target))
+        self.ttl = ttl
+        self.target = target
+        self.session_factory = session_factory or (lambda target: nisyscfg.Session(target=target))
+        self._inventory = None
+        self._from_cache = False
+
+    @property
+    def inventory(self):
+        """Inventory of the station, from the cache file while it is valid, discovered otherwise."""
+        if self._inventory is None:
+            with self.session_factory(self.target) as session:
+                system_start_time = str(session.resource.system_start_time)
+                self._inventory = self._read_cache(system_start_time)
+                self._from_cache = self._inventory is not None
+                if self._inventory is None:
+                    self._inventory = read_inventory(session, self.target)
+                    self._write_cache(system_start_time)
+        return self._inventory
+
+    def invalidate(self):
+        """Discard the discovered hardware, so it is discovered again on the next resolution."""
+        self._inventory = None
+        if os.path.exists(self.cache_path):
+            os.remove(self.cache_path)
+
+    def resolve_all(self, role):
+        """Return the names of all the devices matching a role."""
+        if role not in self.roles:
+            raise KeyError(f"Unknown role '{role}'.")
+        criteria = {key: value for key, value in self.roles[role].items() if key in ROLE_PROPERTIES}
+        return [device.name for device in self.inventory.find(**criteria) if not device.is_chassis]
+
+    def resolve(self, role):
+        """Return the resource name of a role. Raises KeyError if no device of the station matches it.
+
+        If no device of the cache file matches the role, the hardware is discovered again before giving up.
+        """
+        names = self.resolve_all(role)
+        index = self.roles[role].get("index", 0)
+        if index >= len(names) and self._from_cache:
+            self.invalidate()
+            names = self.resolve_all(role)
+        if index >= len(names):
+            raise KeyError(f"No device matches role '{role}' ({self.roles[role]}) on {self.target}.")
+        return names[index]
+
+    def open(self, role, session_class, **kwargs):
+        """Open a driver session (e.g. niscope.Session) on the resource of a role.
+
+        If the resource came from the cache file and the driver cannot open it, the hardware is discovered again and the
+        session is opened on the new resource of the role. Other errors, e.g. invalid arguments, are raised as they are.
+        """
+        resource_name = self.resolve(role)
+        try:
+            return session_class(resource_name=resource_name, **kwargs)
+        except Exception as error:
+            if not self._from_cache or not _is_driver_error(error, session_class):
+                raise
+            self.invalidate()
+            return session_class(resource_name=self.resolve(role), **kwargs)
+
+    def _read_cache(self, system_start_time):
+        """Return the Inventory of the cache file, or None if it is missing or no longer valid."""
+        try:
+            with open(self.cache_path) as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        if (cache.get("target") != self.target or cache.get("system_start_time") != system_start_time
+                or time.time() - cache.get("timestamp", 0) > self.ttl):
+            return None
+        return Inventory([Device(*values) for values in cache["devices"]], self.target, cache["timestamp"])
+
+    def _write_cache(self, system_start_time):
+        """Write the inventory to the cache file, atomically so that concurrent processes never read a partial file."""
+        cache = {"target": self.target,
+                 "system_start_time": system_start_time,
+                 "timestamp": self._inventory.timestamp,
+                 "devices": [[getattr(device, name) for name in Device.__slots__]
+                             for device in self._inventory.chassis + self._inventory.devices]}
+        temporary_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as cache_file:
+            json.dump(cache, cache_file)
+        os.replace(temporary_path, self.cache_path)
+
+
+def _is_driver_error(error, session_class):
+    """Whether an error was raised by the driver of a session class (e.g. niscope.errors.DriverError for niscope.Session)."""
+    return type(error).__module__.split(".")[0] == session_class.__module__.split(".")[0]
+
+
+if __name__ == "__main__":
+    import nidcpower
+    import niscope
+
+    # The same roles work on every station, whatever the aliases of its instruments
+    resolver = ResourceResolver({"scope": "PXIe-5160",
+                                 "smu": {"product": "PXIe-4139"},
+                                 "fgen": {"product": "PXIe-5433", "index": 1}})
+    for role in resolver.roles:
+        try:
+            print(f"{role:<6} -> {resolver.resolve(role)}")
+        except KeyError as error:
+            print(f"{role:<6} -> {error}")
+
+    with resolver.open("scope", niscope.Session, options={}) as scope, resolver.open("smu", nidcpower.Session, options={}) as smu:
+        print(f"Opened {scope.instrument_model} and {smu.instrument_model}")
@@ -0,0 +1,162 @@
+"""Declarative Group Builder (TClk).
+
+This example demonstrates how to build a group of any number of homogeneous, TClk-synchronized oscilloscopes or
+waveform generators from a single configuration dictionary, instead of hardcoding one session per module.
+
+The modules can be listed explicitly, or discovered with NI System Configuration by product name. All sessions are
+opened in parallel, the same configuration is applied to each of them (plus optional master-only settings, such as the
+trigger), and NI-TClk configures, synchronizes and initiates the whole group. The time spent in each phase is recorded.
+
+Going from 2 to 17 synchronized modules only requires changing the configuration.
+"""
+# Module imports
+import concurrent.futures
+import contextlib
+import importlib
+import time
+
+import nisyscfg
+import nitclk
+
+
+def discover_resources(product_name, target="localhost"):
+    """Return the resource names (user aliases) of the present NI devices whose product name contains 'product_name'.
+
+    Resources are sorted by slot, then alias, so the first one (the master) is always the same module.
+    """
+    with nisyscfg.Session(target=target) as session:
+        filter = session.create_filter()
+        filter.is_present = True
+        filter.is_ni_product = True
+        filter.is_device = True
+        resources = [(resource.slot_number, resource.expert_user_alias[0])
+                     for resource in session.find_hardware(filter) if product_name in resource.product_name]
+    return [alias for _, alias in sorted(resources)]
+
+
+class TClkGroup:
+    """Group of homogeneous sessions synchronized with NI-TClk, built from a configuration dictionary.
+
+    Configuration keys
+    ------------------
+    - driver: Name of the driver module, "niscope" or "nifgen".
+    - resources: List of resource names. If omitted, modules are discovered using "product".
+    - product: Product name to discover, for example "PXIe-5160".
+    - count: Optional maximum number of discovered modules to use.
+    - target: System to discover modules on (default "localhost").
+    - session_options: Keyword arguments passed to every Session() call (default {"options": {}}).
+    - attributes: Dictionary of attribute values set on every session.
+    - calls: List of (method name, keyword arguments) called on every session, in order.
+    - master_calls: List of (method name, keyword arguments) called on the first session only.
+    - min_tclk_period: Minimum TClk period passed to nitclk.synchronize() (default 0).
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.driver = importlib.import_module(config["driver"])
+        self.resource_names = list(config.get("resources", []))
+        self.sessions = []
+        self.phase_times = {}
+        self._exit_stack = contextlib.ExitStack()
+
+    def __enter__(self):
+        return self.build()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def build(self):
+        """Discover, open, configure and synchronize the whole group. Returns the group itself."""
+        try:
+            if not self.resource_names:
+                with self._phase("discover"):
+                    self.resource_names = discover_resources(self.config["product"], self.config.get("target", "localhost"))
+                    if "count" in self.config:
+                        self.resource_names = self.resource_names[:self.config["count"]]
+                if not self.resource_names:
+                    raise ValueError(f"No '{self.config['product']}' module was found.")
+            self.open()
+            self.configure()
+            self.synchronize()
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def open(self):
+        """Open one session per resource, all in parallel."""
+        session_options = self.config.get("session_options", {"options": {}})
+        with self._phase("open"):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(self.resource_names)) as executor:
+                futures = [executor.submit(self.driver.Session, resource_name=name, **session_options) for name in self.resource_names]
+                # Register every session that did open, so they all get closed if another one failed
+                errors = []
+                for future in futures:
+                    try:
+                        self.sessions.append(self._exit_stack.enter_context(future.result()))
+                    except Exception as error:
+                        errors.append(error)
+            if errors:
+                raise errors[0]
+
+    def configure(self):
+        """Apply the shared configuration to every session, then the master-only configuration."""
+        with self._phase("configure"):
+            for session in self.sessions:
+                for name, value in self.config.get("attributes", {}).items():
+                    setattr(session, name, value)
+                for name, kwargs in self.config.get("calls", []):
+                    getattr(session, name)(**kwargs)
+            for name, kwargs in self.config.get("master_calls", []):
+                getattr(self.sessions[0], name)(**kwargs)
+
+    def synchronize(self):
+        """Configure homogeneous triggers and synchronize the TClk of the whole group."""
+        with self._phase("configure_for_homogeneous_triggers"):
+            nitclk.configure_for_homogeneous_triggers(self.sessions)
+        with self._phase("synchronize"):
+            nitclk.synchronize(self.sessions, min_tclk_period=self.config.get("min_tclk_period", 0))
+
+    def initiate(self):
+        """Initiate the whole group with NI-TClk."""
+        with self._phase("initiate"):
+            nitclk.initiate(self.sessions)
+
+    def abort(self):
+        for session in self.sessions:
+            session.abort()
+
+    def close(self):
+        """Close every session of the group."""
+        self._exit_stack.close()
+        self.sessions = []
+
+    @contextlib.contextmanager
+    def _phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] = time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    import niscope
+
+    # Same settings as nitclk_niscope_ex_multidevice_generic_sync.py, for every PXIe-5160 in the system
+    scope_group_config = {
+        "driver": "niscope",
+        "product": "PXIe-5160",
+        "calls": [("configure_chan_characteristics", {"input_impedance": 1e6, "max_input_frequency": -1.00}),
+                  ("configure_vertical", {"range": 5.00, "coupling": niscope.VerticalCoupling.DC, "offset": 0, "probe_attenuation": 1, "enabled": True}),
+                  ("configure_horizontal_timing", {"min_sample_rate": 100e6, "min_num_pts": 1000, "ref_position": 50, "num_records": 1, "enforce_realtime": True})],
+        "master_calls": [("configure_trigger_edge", {"trigger_source": "0", "level": 0.00, "trigger_coupling": niscope.TriggerCoupling.DC,
+                                                     "slope": niscope.TriggerSlope.POSITIVE, "holdoff": 0, "delay": 0})],
+    }
+
+    with TClkGroup(scope_group_config) as group:
+        group.initiate()
+        print(f"Synchronized {len(group.sessions)} modules: {', '.join(group.resource_names)}")
+        for phase, elapsed in group.phase_times.items():
+            print(f"{phase:<40} {elapsed * 1e3:10.2f} ms")
+        group.abort()
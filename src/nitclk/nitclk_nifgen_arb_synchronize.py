@@ -13,6 +13,8 @@ import math
 import nifgen
 import nitclk
 
+from nitclk_wait_until_done import wait_until_done
+
 
 def create_waveform_data(number_of_samples):
     """Take the number of samples and return an array of waveform data."""
@@ -36,7 +38,13 @@ with nifgen.Session(resource_name="PXI1Slot1", options={}) as session1, nifgen.S
     nitclk.synchronize(session_list, min_tclk_period=0)
     nitclk.initiate(session_list)
 
-    nitclk.is_done()
+    # The generation is continuous, so the group is expected to still be running after the timeout; if it stopped
+    # before, a module was aborted or hit an error
+    try:
+        completion_times = wait_until_done(session_list, timeout=5.0)
+        print(f"Generation stopped after {max(completion_times):.3f} s")
+    except TimeoutError:
+        print("Generating synchronized waveforms")
 
     session1.abort()
     session2.abort()
@@ -0,0 +1,118 @@
+"""Phase-Offset Waveform Planner for Synchronized Waveform Generators (TClk).
+
+This example demonstrates how to generate phased stimulus with several TClk-synchronized waveform generators, where
+every device outputs the same base shape with its own phase, delay and amplitude.
+
+All the per-device waveforms are computed in one vectorized NumPy operation from the base shape. Since the devices
+share the same sample clock, a delay can only be applied in whole samples: every requested delay is rounded to the
+nearest sample at the arbitrary sample rate, and the rounding error is reported. Phases are applied exactly when the
+base shape is given as a function, or rounded to whole samples when it is given as an array.
+
+The waveforms are then downloaded to all the devices concurrently, instead of one device after the other.
+"""
+# Module imports
+import concurrent.futures
+import math
+
+import numpy as np
+
+import nifgen
+import nitclk
+
+
+class DeviceOffset:
+    """Phase, delay and amplitude applied to the base shape for one device.
+
+    Arguments
+    ---------
+    - phase: Phase offset, in degrees of the base shape's period; like a delay, a positive phase shifts the shape later.
+    - delay: Delay, in seconds; rounded to a whole number of samples.
+    - amplitude: Gain applied to the base shape.
+    """
+
+    def __init__(self, phase=0.0, delay=0.0, amplitude=1.0):
+        self.phase = phase
+        self.delay = delay
+        self.amplitude = amplitude
+
+
+class WaveformPlan:
+    """Per-device waveforms computed from a base shape.
+
+    Attributes
+    ----------
+    - waveforms: (devices x samples) array of waveform data.
+    - delay_samples: Delay applied to each device, in whole samples.
+    - delay_error: Difference between the applied and the requested delay of each device, in seconds.
+    """
+
+    def __init__(self, base_shape, num_samples, offsets, arb_sample_rate):
+        self.num_samples = num_samples
+        self.arb_sample_rate = arb_sample_rate
+        self.offsets = list(offsets)
+
+        phase = np.array([offset.phase for offset in self.offsets]) / 360.0
+        delay = np.array([offset.delay for offset in self.offsets])
+        amplitude = np.array([offset.amplitude for offset in self.offsets])
+        self.delay_samples = np.rint(delay * arb_sample_rate).astype(int)
+        self.delay_error = self.delay_samples / arb_sample_rate - delay
+
+        if callable(base_shape):
+            # Evaluate the base shape at the position of every sample of every device, in fractions of a period
+            position = (np.arange(num_samples) - self.delay_samples[:, np.newaxis]) / num_samples - phase[:, np.newaxis]
+            self.waveforms = amplitude[:, np.newaxis] * base_shape(np.mod(position, 1.0))
+        else:
+            base_shape = np.asarray(base_shape, dtype=np.float64)
+            if base_shape.size != num_samples:
+                raise ValueError(f"Base shape has {base_shape.size} samples, expected {num_samples}.")
+            shift = self.delay_samples + np.rint(phase * num_samples).astype(int)
+            index = np.mod(np.arange(num_samples) - shift[:, np.newaxis], num_samples)
+            self.waveforms = amplitude[:, np.newaxis] * base_shape[index]
+
+        peak = np.abs(self.waveforms).max()
+        if peak > 1.0:
+            raise ValueError(f"Waveform data must be normalized to +/-1.0; the largest planned value is {peak:.3f}.")
+
+
+def download(session_list, plan, max_workers=None):
+    """Download the planned waveform of every device concurrently, and return the waveform handles."""
+    if len(session_list) != len(plan.waveforms):
+        raise ValueError(f"{len(plan.waveforms)} waveforms were planned for {len(session_list)} sessions.")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or len(session_list)) as executor:
+        futures = [executor.submit(session.create_waveform, waveform_data_array=waveform)
+                   for session, waveform in zip(session_list, plan.waveforms)]
+        return [future.result() for future in futures]
+
+
+def sine(position):
+    """Base shape: one period of a sine wave, with 'position' in fractions of the period."""
+    return np.sin(2 * math.pi * position)
+
+
+if __name__ == "__main__":
+    import contextlib
+
+    resource_names = ["PXI1Slot1", "PXI1Slot2", "PXI1Slot3", "PXI1Slot4"]
+    arb_sample_rate = 100e6
+    num_samples = 1000
+
+    # Four-phase stimulus, the last device is delayed by 25 ns and generates half the amplitude
+    offsets = [DeviceOffset(phase=0), DeviceOffset(phase=90), DeviceOffset(phase=180), DeviceOffset(phase=270, delay=25e-9, amplitude=0.5)]
+    plan = WaveformPlan(sine, num_samples, offsets, arb_sample_rate)
+    print(f"Delays (samples): {plan.delay_samples}, rounding error (s): {plan.delay_error}")
+
+    with contextlib.ExitStack() as stack:
+        session_list = [stack.enter_context(nifgen.Session(resource_name=name, options={})) for name in resource_names]
+        for session in session_list:
+            session.output_mode = nifgen.OutputMode.ARB
+            session.arb_sample_rate = arb_sample_rate
+        download(session_list, plan)
+
+        nitclk.configure_for_homogeneous_triggers(session_list)
+        nitclk.synchronize(session_list, min_tclk_period=0)
+        nitclk.initiate(session_list)
+
+        input("Generating phased waveforms. Press Enter to stop.")
+
+        for session in session_list:
+            session.abort()
@@ -0,0 +1,137 @@
+"""Concurrent Fetch of Synchronized Digitizers (TClk).
+
+This example demonstrates how to fetch the records of several TClk-synchronized oscilloscopes at the same time,
+instead of one session after the other.
+
+Each session is fetched on its own worker thread, directly into its slice of a single preallocated
+(devices x channels x samples) NumPy array, so the total fetch time stays close to the fetch time of the slowest device.
+
+Since all the devices share the same trigger through NI-TClk, the time of every sample relative to that trigger is known
+from the relative_initial_x attribute of the fetched waveforms. That is used to align the records of all devices on
+the same sample grid.
+"""
+# Module imports
+import concurrent.futures
+import contextlib
+import time
+
+import numpy as np
+
+import niscope
+import nitclk
+
+
+class SynchronizedRecords:
+    """Records fetched from a group of synchronized digitizers.
+
+    Attributes
+    ----------
+    - samples: (devices x channels x samples) array, as fetched.
+    - x_increment: Time between two samples, in seconds.
+    - relative_initial_x: (devices x channels) time of the first sample relative to the trigger, in seconds.
+    - sample_offsets: Number of leading samples to skip on each device so all devices start at the same time.
+    - fetch_times: Time, in seconds, each device took to fetch.
+    """
+
+    def __init__(self, samples, x_increment, relative_initial_x, fetch_times):
+        self.samples = samples
+        self.x_increment = x_increment
+        self.relative_initial_x = relative_initial_x
+        self.fetch_times = fetch_times
+        # The device whose first sample is the latest relative to the trigger sets the start of the common time grid
+        start = relative_initial_x[:, 0]
+        self.sample_offsets = np.rint((start.max() - start) / x_increment).astype(int)
+
+    @property
+    def residual_skew(self):
+        """Sub-sample difference, in seconds, left between each device and the common time grid after alignment."""
+        start = self.relative_initial_x[:, 0] + self.sample_offsets * self.x_increment
+        return start - start.max()
+
+    def aligned(self):
+        """Return the records of all devices on a common time grid, as a (devices x channels x samples) array.
+
+        When the devices are already aligned (the usual case with TClk), this is the fetched array itself.
+        """
+        if not self.sample_offsets.any():
+            return self.samples
+        length = self.samples.shape[-1] - self.sample_offsets.max()
+        return np.stack([device[:, offset:offset + length] for device, offset in zip(self.samples, self.sample_offsets)])
+
+
+class SynchronizedFetcher:
+    """Fetch the same channels of a list of synchronized NI-SCOPE sessions concurrently.
+
+    Arguments
+    ---------
+    - session_list: NI-SCOPE sessions, synchronized and initiated through NI-TClk.
+    - channels: List of the channels fetched on every device, for example ["0", "1"].
+    - num_samples: Number of samples per record.
+    - dtype: NumPy data type of the samples.
+    - max_workers: Number of worker threads; one per device by default.
+    """
+
+    def __init__(self, session_list, channels, num_samples, dtype=np.float64, max_workers=None):
+        self.session_list = list(session_list)
+        self.channels = [str(channel) for channel in channels]
+        self.num_samples = num_samples
+        self.samples = np.empty((len(self.session_list), len(self.channels), num_samples), dtype=dtype)
+        self._channel_list = ",".join(self.channels)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or len(self.session_list),
+                                                               thread_name_prefix="niscope-fetch")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def fetch(self, timeout=5.0):
+        """Fetch one record of every channel of every device, and return SynchronizedRecords.
+
+        The samples array is reused by every call; copy it if it must outlive the next fetch.
+        """
+        futures = [self._executor.submit(self._fetch_device, index, timeout) for index in range(len(self.session_list))]
+        results = [future.result() for future in futures]
+        relative_initial_x = np.array([[info.relative_initial_x for info in waveform_info] for waveform_info, _ in results])
+        fetch_times = np.array([elapsed for _, elapsed in results])
+        return SynchronizedRecords(self.samples, results[0][0][0].x_increment, relative_initial_x, fetch_times)
+
+    def _fetch_device(self, index, timeout):
+        """Worker: fetch the channels of one device into its (channels x samples) slice of the shared array."""
+        start = time.perf_counter()
+        # With one record per channel, fetch_into() fills the waveform channel after channel
+        waveform_info = self.session_list[index].channels[self._channel_list].fetch_into(waveform=self.samples[index].reshape(-1),
+                                                                                         num_records=1, timeout=timeout)
+        return waveform_info, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    resource_names = ["PXI1Slot1", "PXI1Slot2"]
+    channels = ["0", "1"]
+    num_samples = 1000
+
+    with contextlib.ExitStack() as stack:
+        session_list = [stack.enter_context(niscope.Session(resource_name=name, options={})) for name in resource_names]
+        for session in session_list:
+            session.configure_chan_characteristics(input_impedance=1e6, max_input_frequency=-1.00)
+            session.configure_vertical(range=5.00, coupling=niscope.VerticalCoupling.DC, offset=0, probe_attenuation=1, enabled=True)
+            session.configure_horizontal_timing(min_sample_rate=100e6, min_num_pts=num_samples, ref_position=50, num_records=1, enforce_realtime=True)
+        session_list[0].configure_trigger_edge(trigger_source='0', level=0.00, trigger_coupling=niscope.TriggerCoupling.DC, slope=niscope.TriggerSlope.POSITIVE, holdoff=0, delay=0)
+
+        nitclk.configure_for_homogeneous_triggers(session_list)
+        nitclk.synchronize(session_list, min_tclk_period=0)
+        nitclk.initiate(session_list)
+
+        with SynchronizedFetcher(session_list, channels, num_samples) as fetcher:
+            start_time = time.perf_counter()
+            records = fetcher.fetch()
+            elapsed_time = time.perf_counter() - start_time
+
+        print(f"Fetched {records.samples.shape} (devices x channels x samples) in {elapsed_time * 1e3:.2f} ms")
+        print(f"Per-device fetch times (ms): {np.round(records.fetch_times * 1e3, 2)}")
+        print(f"Sample offsets: {records.sample_offsets}, residual skew (s): {records.residual_skew}")
+        print(f"Aligned shape: {records.aligned().shape}")
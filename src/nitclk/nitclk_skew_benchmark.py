@@ -0,0 +1,202 @@
+"""Inter-Device Skew Benchmark (TClk).
+
+This example demonstrates how to verify how well NI-TClk aligns a group of oscilloscopes.
+
+The same stimulus (for example a fast edge or a burst split to every module) is connected to one channel of each
+digitizer. For every run, the group is re-synchronized, initiated and fetched, and the delay of each device relative to
+the first one is measured by cross-correlating their records. The cross-correlation of all devices is computed at once
+with FFTs, and refined below one sample by least-squares fitting of a band-limited, fractionally shifted record.
+
+After all runs, the skew distribution (mean, standard deviation and worst case) of each device is reported, along with
+the time nitclk.synchronize() took on every run. This can be used to qualify a chassis, or to catch synchronization
+regressions after a driver update.
+"""
+# Module imports
+import time
+
+import numpy as np
+
+import nitclk
+
+from nitclk_group_builder import TClkGroup
+from nitclk_niscope_concurrent_fetch import SynchronizedFetcher
+
+
+def measure_skew(samples, x_increment, relative_initial_x=None, max_lag=None, resolution=0.05, half_window=64):
+    """Return the delay, in seconds, of every record relative to the first one.
+
+    The stimulus must not be periodic within the record (use an edge or a single burst), otherwise the delay is only
+    known modulo the period. The lag is first located within a sample or so by the peak of the cross-correlation of the
+    gradients of the records, then refined by shifting the first record by fractions of a sample (band-limited, in the
+    frequency domain) and maximizing its correlation coefficient with each record around the transition (the largest
+    gradient of the first record, delayed by the lag), wherever it is in the record. This is the least-squares delay,
+    with gain and offset differences between the devices removed, and it is not biased towards whole samples as a
+    parabola through three correlation samples is.
+
+    Arguments
+    ---------
+    - samples: (devices x samples) array, one record of the same stimulus per device.
+    - x_increment: Time between two samples, in seconds.
+    - relative_initial_x: Optional time of the first sample of each record relative to the trigger, in seconds.
+      When given, differences in record start times are included in the skew.
+    - max_lag: Largest delay searched, in samples; a quarter of the record by default.
+    - resolution: Step of the sub-sample search, in samples, before the final parabolic interpolation.
+    - half_window: Half width, in samples, of the window around the transition where the delay is refined; it should
+      hold the whole edge or burst.
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    num_samples = samples.shape[-1]
+    max_lag = num_samples // 4 if max_lag is None else max_lag
+    # The gradients of edges and bursts are short pulses, so the peak of their cross-correlation does not depend on where
+    # the stimulus is in the record. Zero-padding to twice the length turns the circular correlation into a linear one
+    spectra = np.fft.rfft(np.diff(samples, axis=-1), n=2 * num_samples, axis=-1)
+    correlation = np.fft.irfft(spectra * np.conj(spectra[0]), n=2 * num_samples, axis=-1)
+    correlation[..., max_lag + 1:2 * num_samples - max_lag] = -np.inf
+    # Indices past the middle of the correlation are negative lags
+    peak = correlation.argmax(axis=-1)
+    peak = np.where(peak > num_samples, peak - 2 * num_samples, peak)
+
+    # The first record, minus the ramp joining its ends, is periodic without a jump, so shifting it in the frequency
+    # domain does not ring; the ramp itself is shifted exactly
+    t = np.arange(num_samples, dtype=np.float64)
+    reference = samples[0]
+    slope = (reference[-1] - reference[0]) / (num_samples - 1)
+    spectrum = np.fft.rfft(reference - reference[0] - slope * t)
+    frequencies = np.fft.rfftfreq(num_samples)
+    transition = int(np.abs(np.gradient(reference)).argmax())
+
+    offsets = np.arange(-1.5, 1.5 + resolution / 2, resolution)
+    lag = np.empty(samples.shape[0])
+    for device, record in enumerate(samples):
+        delays = peak[device] + offsets
+        phase = np.exp(-2j * np.pi * frequencies * delays[:, np.newaxis])
+        shifted = np.fft.irfft(spectrum * phase, n=num_samples, axis=-1)
+        shifted += reference[0] + slope * (t - delays[:, np.newaxis])
+        # Window around the transition in this record, without the samples the shifted first record wraps around to
+        start = max(transition + peak[device] - half_window, peak[device] + 2, 0)
+        stop = min(transition + peak[device] + half_window + 1, num_samples + peak[device] - 2, num_samples)
+        window = slice(start, stop)
+        score = _correlation_coefficient(shifted[:, window], record[window])
+        best = int(np.clip(score.argmax(), 1, offsets.size - 2))
+        before, at, after = score[best - 1:best + 2]
+        curvature = before - 2 * at + after
+        fraction = 0.5 * (before - after) / curvature if curvature < 0 else 0.0
+        lag[device] = delays[best] + fraction * resolution
+
+    skew = lag * x_increment
+    if relative_initial_x is not None:
+        start = np.asarray(relative_initial_x, dtype=np.float64)
+        skew += start - start[0]
+    return skew
+
+
+def _correlation_coefficient(candidates, record):
+    """Correlation coefficient of every row of 'candidates' with 'record'."""
+    candidates = candidates - candidates.mean(axis=-1, keepdims=True)
+    record = record - record.mean()
+    return candidates @ record / (np.linalg.norm(candidates, axis=-1) * np.linalg.norm(record) + 1e-300)
+
+
+def check_measure_skew(delays=(0.0, 0.1, 0.25, 0.5, 1.0, 2.0, -3.7), positions=(0.1, 0.5, 0.9), num_samples=2000,
+                       tolerance=0.01):
+    """Measure the skew of synthetic edges and bursts delayed by known amounts, and return the worst error in samples.
+
+    The stimuli are placed at every position (fraction of the record), and the first delay is the reference device,
+    so its own skew is checked to be 0 as well.
+
+    Raises AssertionError if an error exceeds 'tolerance' (in samples), so the estimator can be checked before it is
+    trusted with hardware.
+    """
+    t = np.arange(num_samples, dtype=np.float64)
+    delays = np.asarray(delays, dtype=np.float64)
+    worst = 0.0
+    for position in positions:
+        center = position * num_samples + delays[:, np.newaxis]
+        stimuli = {"edge": np.tanh((t - center) / 3.0), "burst": np.exp(-0.5 * ((t - center) / 8.0) ** 2)}
+        for name, records in stimuli.items():
+            errors = measure_skew(records, 1.0) - (delays - delays[0])
+            worst = max(worst, np.abs(errors).max())
+            assert np.abs(errors).max() <= tolerance, f"{name} at {position:.0%}: skew errors of {errors} samples"
+    return worst
+
+
+class SkewStatistics:
+    """Distribution of the skew of every device over all runs, in seconds."""
+
+    def __init__(self, skews, synchronize_times):
+        self.skews = skews                          # runs x devices
+        self.synchronize_times = synchronize_times  # runs
+        self.mean = skews.mean(axis=0)
+        self.std = skews.std(axis=0)
+        self.worst_case = np.abs(skews).max(axis=0)
+
+    @property
+    def group_worst_case(self):
+        """Largest spread between any two devices in any run."""
+        return np.ptp(self.skews, axis=1).max()
+
+
+class SkewBenchmark:
+    """Repeatedly synchronize, acquire and measure the skew of a group of NI-SCOPE sessions.
+
+    Arguments
+    ---------
+    - session_list: Configured NI-SCOPE sessions, all acquiring the same stimulus on 'channel'.
+    - channel: Channel connected to the stimulus on every device.
+    - num_samples: Number of samples per record.
+    - min_tclk_period: Minimum TClk period passed to nitclk.synchronize().
+    """
+
+    def __init__(self, session_list, channel, num_samples, min_tclk_period=0):
+        self.session_list = list(session_list)
+        self.channel = channel
+        self.num_samples = num_samples
+        self.min_tclk_period = min_tclk_period
+
+    def run(self, num_runs, timeout=5.0):
+        """Run the benchmark and return SkewStatistics."""
+        skews = np.empty((num_runs, len(self.session_list)))
+        synchronize_times = np.empty(num_runs)
+        nitclk.configure_for_homogeneous_triggers(self.session_list)
+        with SynchronizedFetcher(self.session_list, [self.channel], self.num_samples) as fetcher:
+            for run in range(num_runs):
+                start = time.perf_counter()
+                nitclk.synchronize(self.session_list, min_tclk_period=self.min_tclk_period)
+                synchronize_times[run] = time.perf_counter() - start
+
+                nitclk.initiate(self.session_list)
+                records = fetcher.fetch(timeout=timeout)
+                skews[run] = measure_skew(records.samples[:, 0], records.x_increment, records.relative_initial_x[:, 0])
+                for session in self.session_list:
+                    session.abort()
+        return SkewStatistics(skews, synchronize_times)
+
+
+if __name__ == "__main__":
+    import niscope
+
+    print(f"Skew estimator check: worst error {check_measure_skew():.4f} samples on synthetic edges and bursts")
+
+    num_runs = 100
+    num_samples = 2000
+
+    # Stimulus connected to channel 0 of every PXIe-5160, and used as the trigger of the master
+    scope_group_config = {
+        "driver": "niscope",
+        "product": "PXIe-5160",
+        "calls": [("configure_vertical", {"range": 2.0, "coupling": niscope.VerticalCoupling.DC}),
+                  ("configure_horizontal_timing", {"min_sample_rate": 1e9, "min_num_pts": num_samples, "ref_position": 50, "num_records": 1, "enforce_realtime": True})],
+        "master_calls": [("configure_trigger_edge", {"trigger_source": "0", "level": 0.2, "trigger_coupling": niscope.TriggerCoupling.DC,
+                                                     "slope": niscope.TriggerSlope.POSITIVE})],
+    }
+
+    with TClkGroup(scope_group_config) as group:
+        statistics = SkewBenchmark(group.sessions, channel="0", num_samples=num_samples).run(num_runs)
+
+    line_format = "{:<20} {:>14} {:>14} {:>14}"
+    print(line_format.format("Device", "Mean (ps)", "Std (ps)", "Worst (ps)"))
+    for name, mean, std, worst in zip(group.resource_names, statistics.mean, statistics.std, statistics.worst_case):
+        print(line_format.format(name, f"{mean * 1e12:.1f}", f"{std * 1e12:.1f}", f"{worst * 1e12:.1f}"))
+    print(f"\nWorst-case spread between devices: {statistics.group_worst_case * 1e12:.1f} ps")
+    print(f"Time to synchronize: mean {statistics.synchronize_times.mean() * 1e3:.2f} ms, "
+          f"max {statistics.synchronize_times.max() * 1e3:.2f} ms")
@@ -0,0 +1,98 @@
+"""Wait Until Done (TClk).
+
+This example demonstrates how to wait for a group of TClk-synchronized sessions to finish generating or acquiring,
+and how long each of them took.
+
+Instead of sleeping for a fixed time, or polling in a tight loop, the sessions that are still running are polled with
+nitclk.is_done() at an interval that starts short and grows exponentially up to a cap. Short operations are detected
+almost immediately, while long ones cost very little CPU time. Once a session is done it is no longer polled.
+"""
+# Module imports
+import time
+
+import nitclk
+
+
+class PollingStrategy:
+    """Exponential backoff used between two polls.
+
+    Arguments
+    ---------
+    - initial_interval: First interval between two polls, in seconds.
+    - max_interval: Largest interval between two polls, in seconds.
+    - factor: Growth of the interval after every poll that found a session still running.
+    """
+
+    def __init__(self, initial_interval=100e-6, max_interval=50e-3, factor=2.0):
+        if initial_interval <= 0 or max_interval < initial_interval or factor < 1.0:
+            raise ValueError("Polling intervals must be positive, with max_interval >= initial_interval and factor >= 1.")
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.factor = factor
+
+    def intervals(self):
+        """Yield the successive intervals between polls."""
+        interval = self.initial_interval
+        while True:
+            yield interval
+            interval = min(interval * self.factor, self.max_interval)
+
+
+def wait_until_done(session_list, timeout=10.0, polling=None):
+    """Wait for every session of a TClk group to be done, and return the time each one took.
+
+    Arguments
+    ---------
+    - session_list: Sessions initiated with nitclk.initiate().
+    - timeout: Maximum time to wait for all sessions, in seconds.
+    - polling: PollingStrategy; the default one starts at 100 us and is capped at 50 ms.
+
+    Returns a list with, for every session, the time in seconds from the call until it was found done. The resolution
+    is the polling interval at that time.
+    Raises TimeoutError if some sessions are still running after the timeout.
+    """
+    polling = polling or PollingStrategy()
+    start = time.perf_counter()
+    deadline = start + timeout
+    completion_times = [None] * len(session_list)
+    pending = list(range(len(session_list)))
+
+    for interval in polling.intervals():
+        still_running = []
+        for index in pending:
+            if nitclk.is_done([session_list[index]]):
+                completion_times[index] = time.perf_counter() - start
+            else:
+                still_running.append(index)
+        pending = still_running
+        if not pending:
+            return completion_times
+
+        now = time.perf_counter()
+        if now >= deadline:
+            raise TimeoutError(f"{len(pending)} of {len(session_list)} sessions were not done after {timeout} s "
+                               f"(session indices {pending}).")
+        time.sleep(min(interval, deadline - now))
+
+
+if __name__ == "__main__":
+    import niscope
+
+    from nitclk_group_builder import TClkGroup
+
+    # Finite acquisitions of 1000 records on every PXIe-5160, started by the trigger of the master
+    scope_group_config = {
+        "driver": "niscope",
+        "product": "PXIe-5160",
+        "calls": [("configure_vertical", {"range": 5.0, "coupling": niscope.VerticalCoupling.DC}),
+                  ("configure_horizontal_timing", {"min_sample_rate": 100e6, "min_num_pts": 1000, "ref_position": 50, "num_records": 1000, "enforce_realtime": True})],
+        "master_calls": [("configure_trigger_edge", {"trigger_source": "0", "level": 0.0, "trigger_coupling": niscope.TriggerCoupling.DC,
+                                                     "slope": niscope.TriggerSlope.POSITIVE})],
+    }
+
+    with TClkGroup(scope_group_config) as group:
+        group.initiate()
+        completion_times = wait_until_done(group.sessions, timeout=10.0, polling=PollingStrategy(initial_interval=1e-3, max_interval=20e-3))
+        for name, elapsed in zip(group.resource_names, completion_times):
+            print(f"{name:<20} done after {elapsed * 1e3:.2f} ms")
+        group.abort()
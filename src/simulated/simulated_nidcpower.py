@@ -0,0 +1,302 @@
+"""Simulated NI-DCPower driver.
+
+Stand-in for nidcpower.Session. Each channel sources into a resistive load; the output settles to every new level with
+a first-order response whose time constant depends on the transient response. Measurements include noise that
+decreases with the aperture time, and the current is clamped at the current limit (in compliance).
+
+Supported: single point and sequence source modes, DC and pulse output functions, set_sequence(), initiate(),
+wait_for_event(), measure_multiple(), fetch_multiple() (including continuous records with ON_MEASURE_TRIGGER) and the
+attributes used by the nidcpower examples.
+"""
+
+# Module imports
+import collections
+import datetime
+import enum
+
+import numpy as np
+
+from simulated_session import RepeatedCapabilities, SimulatedSession
+
+
+class SourceMode(enum.Enum):
+    SINGLE_POINT = 1020
+    SEQUENCE = 1021
+
+
+class OutputFunction(enum.Enum):
+    DC_VOLTAGE = 1006
+    DC_CURRENT = 1007
+    PULSE_VOLTAGE = 1049
+    PULSE_CURRENT = 1050
+
+
+class ApertureTimeUnits(enum.Enum):
+    SECONDS = 1028
+    POWER_LINE_CYCLES = 1029
+
+
+class Event(enum.Enum):
+    SOURCE_COMPLETE = 1030
+    MEASURE_COMPLETE = 1031
+    SEQUENCE_ITERATION_COMPLETE = 1032
+    SEQUENCE_ENGINE_DONE = 1033
+    PULSE_COMPLETE = 1051
+    READY_FOR_PULSE_TRIGGER = 1052
+
+
+class MeasureWhen(enum.Enum):
+    AUTOMATICALLY_AFTER_SOURCE_COMPLETE = 1025
+    ON_DEMAND = 1026
+    ON_MEASURE_TRIGGER = 1027
+
+
+class TransientResponse(enum.Enum):
+    NORMAL = 1038
+    FAST = 1039
+    SLOW = 1041
+    CUSTOM = 1042
+
+
+class TriggerType(enum.Enum):
+    NONE = 1012
+    DIGITAL_EDGE = 1014
+    SOFTWARE_EDGE = 1015
+
+
+Measurement = collections.namedtuple("Measurement", ["voltage", "current", "in_compliance", "channel"])
+
+# Settling time constant of the output, per transient response
+TIME_CONSTANTS = {TransientResponse.SLOW: 100e-6,
+                  TransientResponse.NORMAL: 20e-6,
+                  TransientResponse.FAST: 5e-6,
+                  TransientResponse.CUSTOM: 20e-6}
+MIN_APERTURE_TIME = 1.8e-6
+# Writing one of these while a single point source is running sources the new level and measures it
+LEVEL_ATTRIBUTES = ("voltage_level", "current_level", "pulse_voltage_level", "pulse_current_level")
+
+
+class DeviceChannels(RepeatedCapabilities):
+    """session.channels[...] of a session on a device of unknown size: the channels addressed are added to it."""
+
+    def __getitem__(self, name):
+        view = super().__getitem__(name)
+        for channel in view._channel_list():
+            if channel not in self._session.channel_names:
+                self._session.channel_names.append(channel)
+        return view
+
+
+class Session(SimulatedSession):
+    """Simulated NI-DCPower session.
+
+    Arguments
+    ---------
+    - resource_name, channels, reset, options, independent_channels: As nidcpower.Session; options are ignored. Without
+      'channels', the session uses all the channels of the device, as the driver does.
+    - num_channels: Number of channels of the simulated device. When it is None, the device has one channel plus every
+      channel addressed through session.channels[...], so that examples written for single and multiple channel
+      devices both run.
+    - load_resistance: Resistance of the simulated load on every channel, in ohms.
+    - noise: Measurement noise with a 1 ms aperture time, in volts (and volts / load_resistance in amperes).
+    - timing, seed: See simulated_session.SimulatedSession.
+    """
+
+    DEFAULTS = {"source_mode": SourceMode.SINGLE_POINT,
+                "output_function": OutputFunction.DC_VOLTAGE,
+                "output_enabled": True,
+                "voltage_level": 0.0,
+                "current_level": 0.0,
+                "voltage_limit": 1.0,
+                "current_limit": 0.01,
+                "voltage_level_range": 6.0,
+                "current_limit_range": 0.01,
+                "voltage_level_autorange": False,
+                "current_level_autorange": False,
+                "current_limit_autorange": False,
+                "pulse_voltage_level": 0.0,
+                "pulse_current_level": 0.0,
+                "pulse_bias_voltage_level": 0.0,
+                "pulse_bias_current_level": 0.0,
+                "pulse_current_limit": 0.01,
+                "pulse_voltage_limit": 1.0,
+                "pulse_on_time": 1e-3,
+                "pulse_off_time": 1e-3,
+                "pulse_bias_delay": 0.0,
+                "aperture_time": 2e-3,
+                "aperture_time_units": ApertureTimeUnits.SECONDS,
+                "source_delay": 0.0,
+                "measure_when": MeasureWhen.AUTOMATICALLY_AFTER_SOURCE_COMPLETE,
+                "measure_record_length": 1,
+                "measure_record_length_is_finite": True,
+                "measure_buffer_size": 1000,
+                "sequence_loop_count": 1,
+                "sequence_loop_count_is_finite": True,
+                "transient_response": TransientResponse.NORMAL,
+                "voltage_gain_bandwidth": 5000.0,
+                "voltage_compensation_frequency": 50000.0,
+                "voltage_pole_zero_ratio": 0.16,
+                "current_gain_bandwidth": 40000.0,
+                "current_compensation_frequency": 250000.0,
+                "current_pole_zero_ratio": 4000.0,
+                "source_trigger_type": TriggerType.NONE,
+                "measure_trigger_type": TriggerType.NONE,
+                "instrument_model": "Simulated NI PXIe-4139"}
+
+    def __init__(self, resource_name="", channels=None, reset=False, options=None, independent_channels=True,
+                 num_channels=None, load_resistance=1e3, noise=10e-6, timing=None, seed=None):
+        if channels is None:
+            channel_names = [str(channel) for channel in range(num_channels or 1)]
+        elif isinstance(channels, (list, tuple, range)):
+            channel_names = [str(channel) for channel in channels]
+        else:
+            channel_names = [name.strip() for name in str(channels).split(",")]
+        super().__init__(resource_name, timing, seed, channel_names)
+        self.__dict__.update(load_resistance=load_resistance, noise=noise, sequences={}, backlog={})
+        if channels is None and num_channels is None:
+            self.__dict__["channels"] = DeviceChannels(self)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in LEVEL_ATTRIBUTES and self._root.running:
+            for channel in self._channel_list():
+                view = self.channels[channel]
+                if (view.source_mode == SourceMode.SINGLE_POINT
+                        and view.measure_when == MeasureWhen.AUTOMATICALLY_AFTER_SOURCE_COMPLETE):
+                    measurements = view._measurements(channel, np.array([view._level(channel)]))
+                    self._root.backlog.setdefault(channel, []).extend(measurements)
+
+    @property
+    def io_resource_descriptor(self):
+        return self.resource_name
+
+    @property
+    def measure_record_delta_time(self):
+        return datetime.timedelta(seconds=self.aperture_time)
+
+    @property
+    def fetch_backlog(self):
+        return sum(len(self._root.backlog.get(channel, ())) for channel in self._channel_list())
+
+    def set_sequence(self, values, source_delays):
+        self.timing.call(len(values))
+        if len(values) != len(source_delays):
+            raise ValueError("values and source_delays must have the same length.")
+        for channel in self._channel_list():
+            self._root.sequences[channel] = (np.asarray(values, dtype=np.float64), np.asarray(source_delays, dtype=np.float64))
+
+    def configure_aperture_time(self, aperture_time, units=ApertureTimeUnits.SECONDS):
+        self.aperture_time_units = units
+        self.aperture_time = aperture_time
+
+    def create_advanced_sequence(self, sequence_name, property_names, set_as_active_sequence=True):
+        self.timing.call()
+
+    def create_advanced_sequence_step(self, set_as_active_step=True):
+        self.timing.call()
+
+    def delete_advanced_sequence(self, sequence_name):
+        self.timing.call()
+
+    def wait_for_event(self, event_id, timeout=10.0):
+        """Wait for the source or measure operations started by initiate() to complete."""
+        duration = max((self.channels[channel]._duration(channel) for channel in self._channel_list()), default=0.0)
+        self.timing.call(duration=duration)
+
+    def measure_multiple(self):
+        """Measure every channel once, at its current level."""
+        channels = self._channel_list()
+        self.timing.call(len(channels), duration=self.aperture_time)
+        return [self.channels[channel]._measurements(channel, np.array([self.channels[channel]._level(channel)]))[0] for channel in channels]
+
+    def fetch_multiple(self, count, timeout=10.0):
+        """Fetch 'count' measurements of every channel."""
+        channels = self._channel_list()
+        self.timing.call(count * len(channels))
+        measurements = []
+        for channel in channels:
+            backlog = self._root.backlog.setdefault(channel, [])
+            view = self.channels[channel]
+            if not view.measure_record_length_is_finite and len(backlog) < count:
+                backlog.extend(view._record(channel, count - len(backlog)))
+            # A sequence that loops forever takes a new measure record on every iteration
+            while (view.measure_when == MeasureWhen.ON_MEASURE_TRIGGER and not view.sequence_loop_count_is_finite
+                   and len(backlog) < count):
+                backlog.extend(view._record(channel, view.measure_record_length))
+            if len(backlog) < count:
+                raise TimeoutError(f"Only {len(backlog)} of {count} measurements available on channel {channel}.")
+            measurements.extend(backlog[:count])
+            del backlog[:count]
+        return measurements
+
+    def _coerce(self, name, value):
+        if name == "aperture_time":
+            return max(value, MIN_APERTURE_TIME)
+        return value
+
+    def _on_initiate(self):
+        """Compute the measurements of the sequence (or single point) that was just started."""
+        for channel in self._channel_list():
+            view = self.channels[channel]
+            if view.measure_when == MeasureWhen.ON_MEASURE_TRIGGER:
+                self._root.backlog[channel] = view._record(channel, view.measure_record_length)
+            else:
+                levels = self._root.sequences[channel][0] if view.source_mode == SourceMode.SEQUENCE else np.array([view._level(channel)])
+                self._root.backlog[channel] = view._measurements(channel, np.tile(levels, view.sequence_loop_count))
+
+    # The helpers below are called on the view of a single channel, so they read the attributes of that channel
+
+    def _level(self, channel):
+        """Forced level of a channel in single point mode."""
+        return {OutputFunction.DC_VOLTAGE: self.voltage_level,
+                OutputFunction.DC_CURRENT: self.current_level,
+                OutputFunction.PULSE_VOLTAGE: self.pulse_voltage_level,
+                OutputFunction.PULSE_CURRENT: self.pulse_current_level}[self.output_function]
+
+    def _duration(self, channel):
+        """Time taken by the sequence (or single point) of a channel."""
+        if self.source_mode == SourceMode.SEQUENCE and channel in self._root.sequences:
+            levels, source_delays = self._root.sequences[channel]
+            return float(source_delays.sum() + levels.size * self.aperture_time) * self.sequence_loop_count
+        if self.output_function in (OutputFunction.PULSE_VOLTAGE, OutputFunction.PULSE_CURRENT):
+            return self.pulse_bias_delay + self.pulse_on_time + self.pulse_off_time
+        return self.source_delay + self.aperture_time
+
+    def _measurements(self, channel, levels):
+        """Settled measurements at the given forced levels."""
+        return self._to_measurements(channel, levels, levels)
+
+    def _record(self, channel, count):
+        """Continuous record of 'count' measurements, one per aperture time, following the settling of the sequence."""
+        dt = self.aperture_time
+        levels, source_delays = self._root.sequences.get(channel, (np.array([self._level(channel)]), np.array([0.0])))
+        # Every step lasts its source delay (at least one sample); the sequence repeats until the record is complete
+        step_samples = np.maximum(1, np.rint(source_delays / dt).astype(int))
+        repeats = -(-count // int(step_samples.sum()))
+        run_levels, run_samples = np.tile(levels, repeats), np.tile(step_samples, repeats)
+        # First-order response to every step, computed one constant-level run at a time
+        decay = np.exp(-dt / TIME_CONSTANTS[self.transient_response])
+        output = np.empty(int(run_samples.sum()))
+        value, start = 0.0, 0
+        for level, samples in zip(run_levels, run_samples):
+            output[start:start + samples] = level + (value - level) * decay ** np.arange(1, samples + 1)
+            value, start = output[start + samples - 1], start + samples
+        targets = np.repeat(run_levels, run_samples)
+        return self._to_measurements(channel, targets[:count], output[:count])
+
+    def _to_measurements(self, channel, targets, output):
+        """Measurements of a channel whose output is 'output' while it forces 'targets'."""
+        noise = self.noise * np.sqrt(1e-3 / self.aperture_time)
+        if self.output_function in (OutputFunction.DC_VOLTAGE, OutputFunction.PULSE_VOLTAGE):
+            limit = self.current_limit if self.output_function == OutputFunction.DC_VOLTAGE else self.pulse_current_limit
+            current = np.clip(output / self.load_resistance, -limit, limit)
+            in_compliance = np.abs(targets / self.load_resistance) > limit
+            voltage = np.where(in_compliance, current * self.load_resistance, output)
+        else:
+            limit = self.voltage_limit if self.output_function == OutputFunction.DC_CURRENT else self.pulse_voltage_limit
+            voltage = np.clip(output * self.load_resistance, -limit, limit)
+            in_compliance = np.abs(targets * self.load_resistance) > limit
+            current = voltage / self.load_resistance
+        voltage = voltage + noise * self.rng.standard_normal(voltage.size)
+        current = current + noise / self.load_resistance * self.rng.standard_normal(current.size)
+        return [Measurement(float(v), float(i), bool(c), channel) for v, i, c in zip(voltage, current, in_compliance)]
@@ -0,0 +1,158 @@
+"""Simulated NI-Digital Pattern driver.
+
+Stand-in for nidigital.Session, for PPMU measurements. The pin map is read to know the pins, groups, sites and
+channels. Every pin of every site behaves like a DUT pin with clamping diodes and a small leakage resistance:
+forcing a current measures a diode drop, forcing a voltage measures the leakage current. Measurements settle after
+ppmu_source() with a time constant that is longer on low current ranges, and their noise decreases with the aperture
+time.
+
+Supported: load_pin_map(), pin and group repeated capabilities, the PPMU attributes, ppmu_source(), ppmu_measure() and
+get_pin_results_pin_information().
+"""
+
+# Module imports
+import collections
+import enum
+import math
+import time
+import xml.etree.ElementTree as ElementTree
+
+from simulated_session import SimulatedSession
+
+
+class SelectedFunction(enum.Enum):
+    DIGITAL = 1100
+    PPMU = 1101
+    OFF = 1102
+    DISCONNECT = 1103
+    RIO = 1104
+
+
+class PPMUApertureTimeUnits(enum.Enum):
+    SECONDS = 2100
+
+
+class PPMUOutputFunction(enum.Enum):
+    VOLTAGE = 1300
+    CURRENT = 1301
+
+
+class PPMUMeasurementType(enum.Enum):
+    CURRENT = 2400
+    VOLTAGE = 2401
+
+
+PinInfo = collections.namedtuple("PinInfo", ["pin_name", "site_number", "channel_name"])
+
+PIN_MAP_NAMESPACE = "{http://www.ni.com/TestStand/SemiconductorModule/PinMap.xsd}"
+DIODE_DROP = 0.65           # V
+LEAKAGE_RESISTANCE = 1e9    # ohms
+VOLTAGE_NOISE = 1e-3        # V rms with a 20 us aperture time
+CURRENT_NOISE = 1e-9        # A rms with a 20 us aperture time
+
+
+class Session(SimulatedSession):
+    """Simulated NI-Digital Pattern session.
+
+    Arguments
+    ---------
+    - resource_name, channels, reset_device, options: As nidigital.Session; options are ignored.
+    - timing, seed: See simulated_session.SimulatedSession.
+
+    Attributes are stored per pin: setting one on a group sets it on each of its pins.
+    """
+
+    DEFAULTS = {"selected_function": SelectedFunction.DISCONNECT,
+                "ppmu_aperture_time": 20e-6,
+                "ppmu_aperture_time_units": PPMUApertureTimeUnits.SECONDS,
+                "ppmu_output_function": PPMUOutputFunction.VOLTAGE,
+                "ppmu_voltage_level": 0.0,
+                "ppmu_current_level": 0.0,
+                "ppmu_current_level_range": 2e-6,
+                "ppmu_current_limit_range": 2e-6,
+                "ppmu_voltage_limit_low": -2.0,
+                "ppmu_voltage_limit_high": 6.0,
+                "instrument_model": "Simulated NI PXIe-6570"}
+
+    def __init__(self, resource_name="", channels=None, reset_device=False, options=None, timing=None, seed=None):
+        super().__init__(resource_name, timing, seed, [])
+        self.__dict__.update(groups={}, connections=[], sites=[0], source_times={}, pin_offsets={})
+
+    def load_pin_map(self, file_path):
+        """Read the pins, groups, sites and connections of a .pinmap file."""
+        self.timing.call(duration=10e-3)
+        root = ElementTree.parse(file_path).getroot()
+
+        def section(name):
+            element = root.find(PIN_MAP_NAMESPACE + name)
+            return [] if element is None else list(element)
+
+        pins = [element.get("name") for element in section("Pins")]
+        self._root.channel_names = pins
+        self._root.groups = {element.get("name"): [reference.get("pin") for reference in element] for element in section("PinGroups")}
+        self._root.sites = [int(element.get("siteNumber")) for element in section("Sites")] or [0]
+        self._root.connections = [(element.get("pin"), int(element.get("siteNumber", 0)),
+                                   f'{element.get("instrument")}/{element.get("channel")}') for element in section("Connections")]
+        # Small, fixed differences between the pins, as on a real DUT
+        self._root.pin_offsets = {(pin, site): 1.0 + 0.05 * self.rng.standard_normal()
+                                  for pin, site, _ in self._root.connections}
+
+    def get_pin_results_pin_information(self):
+        self.timing.call()
+        return [PinInfo(pin, site, channel) for pin, site, channel in self._connections()]
+
+    def ppmu_source(self):
+        """Start forcing the configured level on the pins."""
+        self.timing.call()
+        now = time.perf_counter()
+        for pin in self._keys():
+            self._root.source_times[pin] = now
+
+    def ppmu_measure(self, measurement_type):
+        """Measure every pin of every site, in the order of get_pin_results_pin_information()."""
+        connections = self._connections()
+        aperture_time = self.ppmu_aperture_time
+        self.timing.call(len(connections), duration=aperture_time)
+        now = time.perf_counter()
+
+        measurements = []
+        for pin, site, _ in connections:
+            pin_view = self.channels[pin]
+            output_function = pin_view.ppmu_output_function
+            if output_function == PPMUOutputFunction.CURRENT:
+                current = pin_view.ppmu_current_level
+                voltage = math.copysign(DIODE_DROP, current) * self._root.pin_offsets.get((pin, site), 1.0) if current else 0.0
+                voltage = min(max(voltage, pin_view.ppmu_voltage_limit_low), pin_view.ppmu_voltage_limit_high)
+                current_range = pin_view.ppmu_current_level_range
+            else:
+                voltage = pin_view.ppmu_voltage_level
+                current_range = pin_view.ppmu_current_limit_range
+                current = min(max(voltage / LEAKAGE_RESISTANCE * self._root.pin_offsets.get((pin, site), 1.0), -current_range), current_range)
+
+            # Lower current ranges settle more slowly; without realtime timing, measurements are always settled
+            settled = 1.0
+            if self.timing.realtime and pin in self._root.source_times:
+                time_constant = 20e-6 * math.sqrt(128e-6 / current_range)
+                settled = 1.0 - math.exp(-(now - self._root.source_times[pin]) / time_constant)
+            noise = self.rng.standard_normal() * math.sqrt(20e-6 / aperture_time)
+            if measurement_type == PPMUMeasurementType.VOLTAGE:
+                measurements.append(voltage * settled + VOLTAGE_NOISE * noise)
+            else:
+                measurements.append(current * settled + CURRENT_NOISE * min(1.0, current_range / 10e-6) * noise)
+        return measurements
+
+    def _keys(self):
+        """Pins of this session or view; group names are replaced by their pins."""
+        if not self._channel:
+            return list(self.channel_names)
+        pins = []
+        for name in self._channel_list():
+            pins.extend(self._root.groups.get(name, [name]))
+        return list(dict.fromkeys(pins))
+
+    def _connections(self):
+        """(pin, site, channel) of the pins of this session or view, site by site."""
+        pins = self._keys()
+        order = {pin: index for index, pin in enumerate(pins)}
+        connections = [connection for connection in self._root.connections if connection[0] in order]
+        return sorted(connections, key=lambda connection: (connection[1], order[connection[0]]))
@@ -0,0 +1,218 @@
+"""Simulated NI-DMM driver.
+
+Stand-in for nidmm.Session. The DMM measures a DC level (or a sine wave, in waveform acquisition) with noise that
+matches the configured resolution; each reading takes one aperture time, and multipoint and waveform acquisitions
+become available as they are acquired. A continuous acquisition never finishes: without realtime timing, read_status()
+reports a bounded backlog.
+
+Supported: configure_measurement_absolute/digits(), configure_waveform_acquisition(), configure_trigger(),
+configure_multi_point(), initiate(), read(), read_multi_point(), fetch(), fetch_multi_point(), fetch_waveform(),
+read_waveform() and read_status().
+"""
+
+# Module imports
+import enum
+import math
+import time
+
+import numpy as np
+
+from simulated_session import SimulatedSession
+
+
+class Function(enum.Enum):
+    DC_VOLTS = 1
+    AC_VOLTS = 2
+    DC_CURRENT = 3
+    AC_CURRENT = 4
+    TWO_WIRE_RES = 5
+    FOUR_WIRE_RES = 101
+    FREQ = 104
+    PERIOD = 105
+    WAVEFORM_VOLTAGE = 1003
+    WAVEFORM_CURRENT = 1004
+
+
+class TriggerSource(enum.Enum):
+    IMMEDIATE = 'Immediate'
+    EXTERNAL = 'External'
+    SOFTWARE_TRIG = 'Software'
+    TTL0 = 'TTL0'
+    TTL1 = 'TTL1'
+    TTL2 = 'TTL2'
+    PXI_TRIG0 = 'PXI_Trig0'
+    PXI_TRIG1 = 'PXI_Trig1'
+    PXI_TRIG2 = 'PXI_Trig2'
+    PXI_TRIG3 = 'PXI_Trig3'
+    PXI_STAR = 'PXI_Star'
+
+
+class SampleTrigger(enum.Enum):
+    IMMEDIATE = 'Immediate'
+    EXTERNAL = 'External'
+    SOFTWARE_TRIG = 'Software'
+    INTERVAL = 'Interval'
+    PXI_TRIG0 = 'PXI_Trig0'
+    PXI_TRIG1 = 'PXI_Trig1'
+
+
+class MeasurementCompleteDest(enum.Enum):
+    NONE = 'None'
+    EXTERNAL = 'External'
+    TTL0 = 'TTL0'
+    PXI_TRIG0 = 'PXI_Trig0'
+    PXI_TRIG1 = 'PXI_Trig1'
+    LBR_TRIG0 = 'LBR_Trig0'
+
+
+class AcquisitionStatus(enum.Enum):
+    RUNNING = 0
+    FINISHED_WITH_BACKLOG = 1
+    FINISHED_WITH_NO_BACKLOG = 2
+    PAUSED = 3
+    NO_ACQUISITION_IN_PROGRESS = 4
+
+
+# Readings a continuous acquisition (sample count 0) has ahead of the fetches when read_status() is called without realtime
+# timing, e.g. one scan of a switch module
+CONTINUOUS_BACKLOG = 16
+
+
+class Session(SimulatedSession):
+    """Simulated NI-DMM session.
+
+    Arguments
+    ---------
+    - resource_name, id_query, reset_device, options: As nidmm.Session; options are ignored.
+    - level: DC level measured, in the units of the measurement function.
+    - signal_frequency: Frequency of the sine wave measured by waveform acquisitions, in Hz (amplitude 'level').
+    - timing, seed: See simulated_session.SimulatedSession.
+    """
+
+    DEFAULTS = {"function": Function.DC_VOLTS,
+                "range": 10.0,
+                "resolution_absolute": 1e-6,
+                "resolution_digits": 6.5,
+                "aperture_time": 1e-3,
+                "waveform_rate": 1e6,
+                "waveform_points": 500,
+                "trigger_source": TriggerSource.IMMEDIATE,
+                "trigger_delay": 0.0,
+                "trigger_count": 1,
+                "sample_count": 1,
+                "sample_trigger": SampleTrigger.IMMEDIATE,
+                "sample_interval": 0.0,
+                "meas_complete_dest": MeasurementCompleteDest.NONE,
+                "instrument_model": "Simulated NI PXIe-4081"}
+
+    def __init__(self, resource_name="", id_query=False, reset_device=False, options=None, level=1.0, signal_frequency=60.0,
+                 timing=None, seed=None):
+        super().__init__(resource_name, timing, seed)
+        self.__dict__.update(level=level, signal_frequency=signal_frequency, acquisition_start=0.0, points_fetched=0,
+                             raw_attributes={})
+
+    def configure_measurement_absolute(self, measurement_function, range, resolution_absolute):
+        self.function = measurement_function
+        self.range = range
+        self.resolution_absolute = resolution_absolute
+
+    def configure_measurement_digits(self, measurement_function, range, resolution_digits):
+        self.function = measurement_function
+        self.range = range
+        self.resolution_absolute = range / 10 ** math.floor(resolution_digits)
+
+    def configure_waveform_acquisition(self, measurement_function, range, rate, waveform_points):
+        self.function = measurement_function
+        self.range = range
+        self.waveform_rate = rate
+        self.waveform_points = waveform_points
+
+    def configure_trigger(self, trigger_source, trigger_delay=-1.0):
+        self.trigger_source = trigger_source
+        self.trigger_delay = max(trigger_delay, 0.0)
+
+    def configure_multi_point(self, trigger_count, sample_count, sample_trigger=SampleTrigger.IMMEDIATE, sample_interval=-1.0):
+        self.trigger_count = trigger_count
+        self.sample_count = sample_count
+        self.sample_trigger = sample_trigger
+        self.sample_interval = max(sample_interval, 0.0)
+
+    def _set_attribute_vi_int32(self, attribute_id, attribute_value):
+        self.timing.call()
+        self._root.raw_attributes[attribute_id] = attribute_value
+
+    def read(self, maximum_time=None):
+        self.initiate()
+        return self.fetch(maximum_time)
+
+    def fetch(self, maximum_time=None):
+        return self.fetch_multi_point(1, maximum_time)[0]
+
+    def read_multi_point(self, array_size, maximum_time=None):
+        self.initiate()
+        return self.fetch_multi_point(array_size, maximum_time)
+
+    def fetch_multi_point(self, array_size, maximum_time=None):
+        """Fetch 'array_size' readings, waiting until they are acquired."""
+        self._wait_for(array_size, self._reading_time())
+        self.timing.call(array_size)
+        noise = max(self.resolution_absolute, 1e-7) * self.rng.standard_normal(array_size)
+        return (self.level + noise).tolist()
+
+    def read_waveform(self, array_size, maximum_time=None):
+        self.initiate()
+        return self.fetch_waveform(array_size, maximum_time)
+
+    def fetch_waveform(self, array_size, maximum_time=None):
+        """Fetch 'array_size' points of the waveform acquisition, waiting until they are acquired."""
+        first = self._root.points_fetched
+        self._wait_for(array_size, 1.0 / self.waveform_rate)
+        self.timing.call(array_size)
+        t = (first + np.arange(array_size)) / self.waveform_rate
+        noise = self.range * 1e-5 * self.rng.standard_normal(array_size)
+        return (self.level * np.sin(2 * math.pi * self.signal_frequency * t) + noise).tolist()
+
+    def read_status(self):
+        """Return the backlog (number of readings available) and the acquisition status."""
+        self.timing.call()
+        total = self._total_points()
+        point_time = 1.0 / self.waveform_rate if self._is_waveform() else self._reading_time()
+        if self.timing.realtime:
+            acquired = max(0, int((time.perf_counter() - self._root.acquisition_start) / point_time))
+            acquired = acquired if total is None else min(total, acquired)
+        elif total is None:
+            # Without realtime timing, a continuous acquisition stays a fixed number of readings ahead of the fetches
+            acquired = self._root.points_fetched + CONTINUOUS_BACKLOG
+        else:
+            acquired = total
+        backlog = max(0, acquired - self._root.points_fetched)
+        if not self._root.running:
+            status = AcquisitionStatus.NO_ACQUISITION_IN_PROGRESS
+        elif total is None or acquired < total:
+            status = AcquisitionStatus.RUNNING
+        else:
+            status = AcquisitionStatus.FINISHED_WITH_BACKLOG if backlog else AcquisitionStatus.FINISHED_WITH_NO_BACKLOG
+        return backlog, status
+
+    def _on_initiate(self):
+        self._root.acquisition_start = time.perf_counter() + self.trigger_delay
+        self._root.points_fetched = 0
+
+    def _is_waveform(self):
+        return self.function in (Function.WAVEFORM_VOLTAGE, Function.WAVEFORM_CURRENT)
+
+    def _total_points(self):
+        if self._is_waveform():
+            return self.waveform_points
+        # A sample count of 0 acquires continuously, without a total
+        return self.trigger_count * self.sample_count if self.sample_count else None
+
+    def _reading_time(self):
+        return max(self.aperture_time, self.sample_interval)
+
+    def _wait_for(self, points, point_time):
+        """Wait until 'points' more readings are acquired, and mark them as fetched."""
+        ready = self._root.acquisition_start + (self._root.points_fetched + points) * point_time
+        self._root.points_fetched += points
+        if self.timing.realtime:
+            time.sleep(max(0.0, ready - time.perf_counter()))
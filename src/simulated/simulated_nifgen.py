@@ -0,0 +1,185 @@
+"""Simulated NI-FGEN driver.
+
+Stand-in for nifgen.Session. Waveforms, sequences and standard function settings are kept in memory, downloads take
+the time to transfer their samples, and software triggers are timestamped so trigger scheduling can be measured.
+output() returns the samples the generator would output, for analysis or to feed a simulated digitizer.
+
+Supported: configure_standard_waveform(), create_waveform(), delete_waveform(), create_arb_sequence(),
+configure_arb_waveform(), configure_arb_sequence(), clear_arb_memory(), initiate(), is_done() and
+send_software_edge_trigger().
+"""
+
+# Module imports
+import enum
+import math
+import time
+
+import numpy as np
+
+from simulated_session import SimulatedSession
+
+
+class OutputMode(enum.Enum):
+    FUNC = 0
+    ARB = 1
+    SEQ = 2
+    FREQ_LIST = 101
+    SCRIPT = 102
+
+
+class Waveform(enum.Enum):
+    SINE = 1
+    SQUARE = 2
+    TRIANGLE = 3
+    RAMP_UP = 4
+    RAMP_DOWN = 5
+    DC = 6
+    NOISE = 101
+    USER = 102
+
+
+class TriggerMode(enum.Enum):
+    SINGLE = 1
+    CONTINUOUS = 2
+    STEPPED = 3
+    BURST = 4
+
+
+class StartTriggerType(enum.Enum):
+    TRIGGER_IMMEDIATE = 'None'
+    DIGITAL_EDGE = 'Digital Edge'
+    SOFTWARE_EDGE = 'Software Edge'
+    P2P_ENDPOINT_FULLNESS = 'P2P Endpoint Fullness'
+
+
+class Trigger(enum.Enum):
+    START = 1004
+    SCRIPT = 101
+
+
+# One period of each standard waveform, as a function of the position in the period (0 to 1)
+STANDARD_WAVEFORMS = {Waveform.SINE: lambda x: np.sin(2 * math.pi * x),
+                      Waveform.SQUARE: lambda x: np.where(x < 0.5, 1.0, -1.0),
+                      Waveform.TRIANGLE: lambda x: 1.0 - 4.0 * np.abs(x - 0.5),
+                      Waveform.RAMP_UP: lambda x: 2.0 * x - 1.0,
+                      Waveform.RAMP_DOWN: lambda x: 1.0 - 2.0 * x,
+                      Waveform.DC: lambda x: np.zeros_like(x)}
+
+
+class Session(SimulatedSession):
+    """Simulated NI-FGEN session.
+
+    Arguments
+    ---------
+    - resource_name, channel_name, reset_device, options: As nifgen.Session; options are ignored.
+    - generation_time: Time taken by one (finite) generation, after which is_done() returns True, in seconds.
+    - timing, seed: See simulated_session.SimulatedSession.
+
+    Attributes
+    ----------
+    - trigger_times: time.perf_counter() of every software trigger received.
+    """
+
+    DEFAULTS = {"output_mode": OutputMode.FUNC,
+                "output_enabled": False,
+                "arb_sample_rate": 100e6,
+                "arb_gain": 1.0,
+                "arb_offset": 0.0,
+                "func_waveform": Waveform.SINE,
+                "func_amplitude": 0.01,
+                "func_frequency": 1000.0,
+                "func_dc_offset": 0.0,
+                "func_start_phase": 0.0,
+                "trigger_mode": TriggerMode.CONTINUOUS,
+                "start_trigger_type": StartTriggerType.TRIGGER_IMMEDIATE,
+                "instrument_model": "Simulated NI PXIe-5433"}
+
+    def __init__(self, resource_name="", channel_name=None, reset_device=False, options=None, generation_time=1e-3,
+                 timing=None, seed=None):
+        super().__init__(resource_name, timing, seed)
+        self.__dict__.update(generation_time=generation_time, waveforms={}, sequences={}, next_handle=1,
+                             arb_waveform=None, arb_sequence=None, initiated_at=None, trigger_times=[])
+
+    def configure_standard_waveform(self, waveform, amplitude, frequency, dc_offset=0.0, start_phase=0.0):
+        self.func_waveform = waveform
+        self.func_amplitude = amplitude
+        self.func_frequency = frequency
+        self.func_dc_offset = dc_offset
+        self.func_start_phase = start_phase
+
+    def create_waveform(self, waveform_data_array):
+        data = np.array(waveform_data_array, dtype=np.float64)
+        self.timing.call(data.size)
+        if np.abs(data).max(initial=0.0) > 1.0:
+            raise ValueError("Waveform data must be normalized to +/-1.0.")
+        return self._store(self._root.waveforms, data)
+
+    def delete_waveform(self, waveform_handle):
+        self.timing.call()
+        del self._root.waveforms[waveform_handle]
+
+    def create_arb_sequence(self, waveform_handles_array, loop_counts_array):
+        self.timing.call(len(waveform_handles_array))
+        for handle in waveform_handles_array:
+            if handle not in self._root.waveforms:
+                raise ValueError(f"Invalid waveform handle {handle}.")
+        return self._store(self._root.sequences, (list(waveform_handles_array), list(loop_counts_array)))
+
+    def configure_arb_waveform(self, waveform_handle, gain, offset):
+        self.timing.call()
+        self._root.arb_waveform = waveform_handle
+        self.arb_gain = gain
+        self.arb_offset = offset
+
+    def configure_arb_sequence(self, sequence_handle, gain, offset):
+        self.timing.call()
+        self._root.arb_sequence = sequence_handle
+        self.arb_gain = gain
+        self.arb_offset = offset
+
+    def clear_arb_memory(self):
+        self.timing.call()
+        self._root.waveforms.clear()
+        self._root.sequences.clear()
+
+    def send_software_edge_trigger(self, trigger=Trigger.START, trigger_id=""):
+        self.timing.call()
+        self._root.trigger_times.append(time.perf_counter())
+
+    def is_done(self):
+        self.timing.call()
+        if self._root.initiated_at is None:
+            return True
+        if self.trigger_mode == TriggerMode.CONTINUOUS:
+            return False
+        return time.perf_counter() - self._root.initiated_at >= self.generation_time
+
+    def output(self, num_samples):
+        """Return the first 'num_samples' samples generated in the current output mode (not a driver method)."""
+        if self.output_mode == OutputMode.FUNC:
+            t = np.arange(num_samples) / self.arb_sample_rate
+            position = np.mod(t * self.func_frequency + self.func_start_phase / 360.0, 1.0)
+            if self.func_waveform == Waveform.NOISE:
+                shape = self.rng.uniform(-1.0, 1.0, num_samples)
+            else:
+                shape = STANDARD_WAVEFORMS[self.func_waveform](position)
+            return self.func_amplitude / 2 * shape + self.func_dc_offset
+        if self.output_mode == OutputMode.SEQ:
+            handles, loop_counts = self._root.sequences[self._root.arb_sequence]
+            data = np.concatenate([np.tile(self._root.waveforms[handle], count) for handle, count in zip(handles, loop_counts)])
+        else:
+            data = self._root.waveforms[self._root.arb_waveform]
+        return self.arb_gain * np.resize(data, num_samples) + self.arb_offset
+
+    def _on_initiate(self):
+        self._root.initiated_at = time.perf_counter()
+
+    def abort(self):
+        super().abort()
+        self._root.initiated_at = None
+
+    def _store(self, table, value):
+        handle = self._root.next_handle
+        self._root.next_handle += 1
+        table[handle] = value
+        return handle
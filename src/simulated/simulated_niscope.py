@@ -0,0 +1,246 @@
+"""Simulated NI-SCOPE driver.
+
+Stand-in for niscope.Session. Every channel acquires a sine wave plus noise (or any signal given as a function of time).
+With an edge trigger, each record is triggered on a rising zero crossing at the reference position, with a random
+sub-sample trigger offset; records are triggered at a fixed rate, with jitter, and become available for fetching as
+they are acquired.
+
+Supported: configure_vertical(), configure_horizontal_timing(), configure_trigger_edge/immediate/software(),
+configure_chan_characteristics(), initiate(), read(), fetch(), fetch_into() (float64 or int8/int16/int32 with gain and
+offset), fetch_array_measurement() (MULTI_ACQ_AVERAGE) and acquisition_status().
+"""
+
+# Module imports
+import enum
+import math
+import time
+
+import numpy as np
+
+from simulated_session import SimulatedSession
+
+
+class VerticalCoupling(enum.Enum):
+    AC = 0
+    DC = 1
+    GND = 2
+
+
+class TriggerCoupling(enum.Enum):
+    AC = 0
+    DC = 1
+    HF_REJECT = 3
+    LF_REJECT = 4
+    AC_PLUS_HF_REJECT = 1001
+
+
+class TriggerSlope(enum.Enum):
+    NEGATIVE = 0
+    POSITIVE = 1
+
+
+class TriggerType(enum.Enum):
+    EDGE = 1
+    IMMEDIATE = 415
+    SOFTWARE = 414
+
+
+class FetchRelativeTo(enum.Enum):
+    READ_POINTER = 388
+    PRETRIGGER = 477
+    NOW = 481
+    START = 482
+    TRIGGER = 483
+
+
+class ArrayMeasurement(enum.Enum):
+    NO_MEASUREMENT = 4000
+    MULTI_ACQ_AVERAGE = 4016
+
+
+class AcquisitionStatus(enum.Enum):
+    COMPLETE = 1
+    IN_PROGRESS = 0
+    STATUS_UNKNOWN = -1
+
+
+class WaveformInfo:
+    """Same attributes as niscope.WaveformInfo."""
+
+    def __init__(self, absolute_initial_x, relative_initial_x, x_increment, channel, record, gain, offset, samples):
+        self.absolute_initial_x = absolute_initial_x
+        self.relative_initial_x = relative_initial_x
+        self.x_increment = x_increment
+        self.channel = channel
+        self.record = record
+        self.gain = gain
+        self.offset = offset
+        self.samples = samples
+        self.actual_samples = len(samples)
+
+
+MAX_SAMPLE_RATE = 2.5e9
+INTEGER_BITS = {np.dtype(np.int8): 8, np.dtype(np.int16): 16, np.dtype(np.int32): 32}
+
+
+class Session(SimulatedSession):
+    """Simulated NI-SCOPE session.
+
+    Arguments
+    ---------
+    - resource_name, options: As niscope.Session; options are ignored.
+    - num_channels: Number of channels of the digitizer.
+    - signal: Function of (time array relative to the trigger, channel index) returning volts. A 1 MHz, 1 V sine by default.
+    - noise: RMS noise added to the signal, in volts.
+    - trigger_rate: Rate of the triggers of consecutive records, in triggers per second.
+    - trigger_jitter: Standard deviation of the trigger intervals, in seconds.
+    - timing, seed: See simulated_session.SimulatedSession.
+    """
+
+    DEFAULTS = {"vertical_range": 10.0,
+                "vertical_offset": 0.0,
+                "vertical_coupling": VerticalCoupling.DC,
+                "probe_attenuation": 1.0,
+                "channel_enabled": True,
+                "input_impedance": 1e6,
+                "max_input_frequency": -1.0,
+                "horz_sample_rate": 250e6,
+                "horz_min_num_pts": 1000,
+                "horz_record_length": 1000,
+                "horz_num_records": 1,
+                "horz_record_ref_position": 50.0,
+                "horz_enforce_realtime": True,
+                "allow_more_records_than_memory": False,
+                "trigger_type": TriggerType.IMMEDIATE,
+                "trigger_source": "0",
+                "trigger_level": 0.0,
+                "trigger_slope": TriggerSlope.POSITIVE,
+                "trigger_coupling": TriggerCoupling.DC,
+                "trigger_holdoff": 0.0,
+                "trigger_delay_time": 0.0,
+                "instrument_model": "Simulated NI PXIe-5160"}
+
+    def __init__(self, resource_name="", options=None, num_channels=2, signal=None, noise=1e-3, trigger_rate=10e3,
+                 trigger_jitter=0.0, timing=None, seed=None, **kwargs):
+        super().__init__(resource_name, timing, seed, [str(channel) for channel in range(num_channels)])
+        self.__dict__.update(signal=signal or (lambda t, channel: np.sin(2 * math.pi * 1e6 * t)), noise=noise,
+                             trigger_rate=trigger_rate, trigger_jitter=trigger_jitter,
+                             acquisition_start=0.0, trigger_times=np.zeros(0))
+
+    def configure_vertical(self, range, coupling, offset=0.0, probe_attenuation=1.0, enabled=True):
+        self.vertical_range = range
+        self.vertical_coupling = coupling
+        self.vertical_offset = offset
+        self.probe_attenuation = probe_attenuation
+        self.channel_enabled = enabled
+
+    def configure_chan_characteristics(self, input_impedance, max_input_frequency):
+        self.input_impedance = input_impedance
+        self.max_input_frequency = max_input_frequency
+
+    def configure_horizontal_timing(self, min_sample_rate, min_num_pts, ref_position, num_records, enforce_realtime):
+        # The sample rate is the maximum sample rate divided by an integer, at least min_sample_rate
+        self.horz_sample_rate = MAX_SAMPLE_RATE / max(1, math.floor(MAX_SAMPLE_RATE / min_sample_rate))
+        self.horz_min_num_pts = min_num_pts
+        self.horz_record_length = min_num_pts
+        self.horz_record_ref_position = ref_position
+        self.horz_num_records = num_records
+        self.horz_enforce_realtime = enforce_realtime
+
+    def configure_trigger_edge(self, trigger_source, level, trigger_coupling, slope=TriggerSlope.POSITIVE, holdoff=0.0, delay=0.0):
+        self.trigger_type = TriggerType.EDGE
+        self.trigger_source = trigger_source
+        self.trigger_level = level
+        self.trigger_coupling = trigger_coupling
+        self.trigger_slope = slope
+        self.trigger_holdoff = holdoff
+        self.trigger_delay_time = delay
+
+    def configure_trigger_immediate(self):
+        self.trigger_type = TriggerType.IMMEDIATE
+
+    def configure_trigger_software(self, holdoff=0.0, delay=0.0):
+        self.trigger_type = TriggerType.SOFTWARE
+
+    def acquisition_status(self):
+        self.timing.call()
+        return AcquisitionStatus.COMPLETE
+
+    def read(self, num_samples=None, relative_to=FetchRelativeTo.PRETRIGGER, offset=0, record_number=0, num_records=None, timeout=5.0):
+        self.initiate()
+        return self.fetch(num_samples, relative_to, offset, record_number, num_records, timeout)
+
+    def fetch(self, num_samples=None, relative_to=FetchRelativeTo.PRETRIGGER, offset=0, record_number=0, num_records=None, timeout=5.0):
+        num_samples = num_samples or self.horz_record_length
+        num_records = num_records or self.horz_num_records - record_number
+        waveform = np.empty(len(self._channel_list()) * num_records * num_samples)
+        waveform_info = self.fetch_into(waveform, relative_to, offset, record_number, num_records, timeout)
+        for info in waveform_info:
+            info.samples = memoryview(info.samples)
+        return waveform_info
+
+    def fetch_into(self, waveform, relative_to=FetchRelativeTo.PRETRIGGER, offset=0, record_number=0, num_records=None, timeout=5.0):
+        channels = self._channel_list()
+        num_records = num_records or self.horz_num_records - record_number
+        num_samples = waveform.size // (len(channels) * num_records)
+        if record_number + num_records > self.horz_num_records:
+            raise ValueError(f"Records {record_number} to {record_number + num_records - 1} were not configured.")
+
+        # Wait until the last record is acquired
+        wait = 0.0
+        if self.timing.realtime:
+            ready = self._root.acquisition_start + self._root.trigger_times[record_number + num_records - 1] + num_samples / self.horz_sample_rate
+            wait = max(0.0, ready - time.perf_counter())
+        self.timing.call(waveform.size, duration=wait)
+
+        dt = 1.0 / self.horz_sample_rate
+        records = np.arange(record_number, record_number + num_records)
+        if self.trigger_type == TriggerType.EDGE:
+            # Sub-sample position of the trigger within the sample interval
+            relative_initial_x = -(self.horz_record_ref_position / 100.0 * self.horz_record_length) * dt - self.rng.random(num_records) * dt
+            relative_initial_x += offset * dt
+        else:
+            relative_initial_x = self.rng.random(num_records) * 1e-3 - 0.5e-3
+        t = relative_initial_x[:, np.newaxis] + np.arange(num_samples) * dt
+
+        data = waveform.reshape(len(channels), num_records, num_samples)
+        integer_bits = INTEGER_BITS.get(waveform.dtype)
+        waveform_info = []
+        for channel_index, channel in enumerate(channels):
+            view = self.channels[channel]
+            volts = self.signal(t, self.channel_names.index(channel) if channel in self.channel_names else 0)
+            volts = np.clip(volts + self.noise * self.rng.standard_normal(volts.shape), -view.vertical_range / 2, view.vertical_range / 2)
+            if integer_bits is None:
+                data[channel_index] = volts
+                gain, volts_offset = 1.0, 0.0
+            else:
+                gain, volts_offset = view.vertical_range / 2 ** integer_bits, view.vertical_offset
+                data[channel_index] = np.clip(np.rint((volts - volts_offset) / gain), -2 ** (integer_bits - 1), 2 ** (integer_bits - 1) - 1)
+            for index, record in enumerate(records):
+                waveform_info.append(WaveformInfo(absolute_initial_x=float(self._root.trigger_times[record] + relative_initial_x[index]),
+                                                  relative_initial_x=float(relative_initial_x[index]),
+                                                  x_increment=dt, channel=channel, record=int(record),
+                                                  gain=gain, offset=volts_offset, samples=data[channel_index, index]))
+        return waveform_info
+
+    def fetch_array_measurement(self, array_meas_function, meas_wfm_size=None, relative_to=FetchRelativeTo.PRETRIGGER,
+                                offset=0, record_number=0, num_records=None, meas_num_samples=None, timeout=5.0):
+        """Return, for every channel, the average of the records (the only array measurement simulated)."""
+        num_samples = self.horz_record_length if meas_num_samples in (None, -1) else meas_num_samples
+        num_records = num_records or self.horz_num_records - record_number
+        waveform_info = self.fetch(num_samples, relative_to, offset, record_number, num_records, timeout)
+        averages = []
+        for channel_index in range(len(self._channel_list())):
+            infos = waveform_info[channel_index * num_records:(channel_index + 1) * num_records]
+            samples = np.mean([np.frombuffer(info.samples) for info in infos], axis=0)
+            averages.append(WaveformInfo(infos[0].absolute_initial_x, infos[0].relative_initial_x, infos[0].x_increment,
+                                         infos[0].channel, 0, 1.0, 0.0, memoryview(samples)))
+        return averages
+
+    def _on_initiate(self):
+        """Schedule the triggers of all the records."""
+        intervals = np.full(self.horz_num_records, 1.0 / self.trigger_rate)
+        if self.trigger_jitter:
+            intervals = np.maximum(0.0, intervals + self.trigger_jitter * self.rng.standard_normal(intervals.size))
+        self._root.trigger_times = np.cumsum(intervals) - intervals[0]
+        self._root.acquisition_start = time.perf_counter()
@@ -0,0 +1,158 @@
+"""Simulated NI-SWITCH driver.
+
+Stand-in for niswitch.Session. Relays are tracked individually, with their operation counts; a relay operation or a
+connection takes the settling time of the module to debounce, and a scan list advances by one entry per trigger.
+
+Supported: relay_control(), get_relay_position(), get_relay_count(), wait_for_debounce(), connect(), disconnect(),
+disconnect_all(), scan lists with initiate(), send_software_trigger() and wait_for_scan_complete().
+"""
+
+# Module imports
+import enum
+import time
+
+from simulated_session import SimulatedSession
+
+
+class RelayAction(enum.Enum):
+    OPEN = 20
+    CLOSE = 21
+
+
+class RelayPosition(enum.Enum):
+    OPEN = 10
+    CLOSED = 11
+
+
+class TriggerInput(enum.Enum):
+    IMMEDIATE = 1
+    EXTERNAL = 2
+    SOFTWARE_TRIG = 3
+    TTL0 = 111
+    TTL1 = 112
+    TTL2 = 113
+    PXI_STAR = 125
+
+
+class ScanAdvancedOutput(enum.Enum):
+    NONE = 0
+    EXTERNAL = 2
+    TTL0 = 111
+    TTL1 = 112
+    TTL2 = 113
+    PXI_STAR = 125
+
+
+class ScanMode(enum.Enum):
+    NONE = 0
+    BREAK_BEFORE_MAKE = 1
+    BREAK_AFTER_MAKE = 2
+
+
+class Session(SimulatedSession):
+    """Simulated NI-SWITCH session.
+
+    Arguments
+    ---------
+    - resource_name, topology, simulate, reset_device: As niswitch.Session.
+    - settling_time: Time a relay takes to settle after it is operated, in seconds.
+    - timing, seed: See simulated_session.SimulatedSession.
+
+    Attributes
+    ----------
+    - relays: Dictionary of relay or path name to RelayPosition.
+    - relay_counts: Dictionary of relay name to number of times it was closed.
+    - scan_position: Index of the current scan list entry.
+    """
+
+    DEFAULTS = {"scan_list": "",
+                "scan_mode": ScanMode.BREAK_BEFORE_MAKE,
+                "trigger_input": TriggerInput.IMMEDIATE,
+                "scan_advanced_output": ScanAdvancedOutput.NONE,
+                "continuous_scan": False,
+                "scan_delay": 0.0,
+                "settling_time": 1e-3,
+                "instrument_model": "Simulated NI PXI-2564"}
+
+    def __init__(self, resource_name="", topology="Configured Topology", simulate=False, reset_device=False,
+                 settling_time=1e-3, timing=None, seed=None):
+        super().__init__(resource_name, timing, seed)
+        self.__dict__.update(topology=topology, relays={}, relay_counts={}, scan_position=0, settling_until=0.0)
+        self.settling_time = settling_time
+
+    def relay_control(self, relay_name, relay_action):
+        self.timing.call()
+        self._operate(relay_name, relay_action == RelayAction.CLOSE)
+
+    def get_relay_position(self, relay_name):
+        self.timing.call()
+        return self._root.relays.get(relay_name, RelayPosition.OPEN)
+
+    def get_relay_count(self, relay_name):
+        self.timing.call()
+        return self._root.relay_counts.get(relay_name, 0)
+
+    def connect(self, channel1, channel2):
+        self.timing.call()
+        self._operate(f"{channel1}->{channel2}", True)
+
+    def disconnect(self, channel1, channel2):
+        self.timing.call()
+        self._operate(f"{channel1}->{channel2}", False)
+
+    def disconnect_all(self):
+        self.timing.call()
+        for name in list(self._root.relays):
+            self._operate(name, False)
+
+    def wait_for_debounce(self, maximum_time_ms=5000):
+        """Wait until every operated relay has settled."""
+        wait = max(0.0, self._root.settling_until - time.perf_counter()) if self.timing.realtime else self.settling_time
+        self.timing.call(duration=wait)
+
+    def send_software_trigger(self):
+        """Advance the scan list to its next entry."""
+        self.timing.call()
+        self._advance()
+
+    def wait_for_scan_complete(self, maximum_time_ms=5000):
+        """Run the remaining entries of a finite scan list, one per trigger."""
+        entries = self._scan_entries()
+        while self._root.running and self._root.scan_position < len(entries):
+            self._advance()
+        self.timing.call()
+
+    @property
+    def is_scanning(self):
+        return self._root.running and (self.continuous_scan or self._root.scan_position < len(self._scan_entries()))
+
+    def _on_initiate(self):
+        """Connect the first scan list entry."""
+        self._root.scan_position = 0
+        if self.trigger_input == TriggerInput.IMMEDIATE:
+            self.wait_for_scan_complete()
+        elif self._scan_entries():
+            self._connect_entry(self._scan_entries()[0])
+
+    def _advance(self):
+        entries = self._scan_entries()
+        if not entries:
+            return
+        self._connect_entry(entries[self._root.scan_position % len(entries)], disconnect=True)
+        self._root.scan_position += 1
+        if self.continuous_scan or self._root.scan_position < len(entries):
+            self._connect_entry(entries[self._root.scan_position % len(entries)])
+
+    def _scan_entries(self):
+        """Entries of the scan list, e.g. 'ch0->com0;ch1->com0;' -> ['ch0->com0', 'ch1->com0']."""
+        return [entry.strip() for entry in self.scan_list.split(";") if entry.strip()]
+
+    def _connect_entry(self, entry, disconnect=False):
+        for path in entry.split("&"):
+            self._operate(path.strip(), not disconnect)
+
+    def _operate(self, name, close):
+        self._root.relays[name] = RelayPosition.CLOSED if close else RelayPosition.OPEN
+        if close:
+            self._root.relay_counts[name] = self._root.relay_counts.get(name, 0) + 1
+        self._root.settling_until = time.perf_counter() + self.settling_time
@@ -0,0 +1,128 @@
+"""Simulated NI System Configuration API.
+
+Stand-in for nisyscfg.Session. Each target is a system described by a list of hardware resources and software
+components (a PXI chassis filled with modules by default); find_hardware() takes one call plus the time to transfer
+every resource it returns, as the real query is dominated by the number of resources.
+
+Supported: create_filter(), find_hardware(), get_installed_software_components(), the resource properties read by the
+examples (get_property() included) and session.resource.system_start_time/current_time.
+"""
+
+# Module imports
+import datetime
+
+import simulated_session
+
+# Products installed in the slots of the default system, by slot number
+DEFAULT_MODULES = {2: "PXIe-4139", 3: "PXIe-4139", 4: "PXIe-5160", 5: "PXIe-4081", 6: "PXIe-5433", 7: "PXI-2564",
+                   8: "PXIe-6570"}
+DEFAULT_SOFTWARE = [("ni-dcpower", "NI-DCPower", "2023 Q3"), ("ni-scope", "NI-SCOPE", "2023 Q3"),
+                    ("ni-dmm", "NI-DMM", "2023 Q1"), ("ni-fgen", "NI-FGEN", "2023 Q1"), ("ni-switch", "NI-SWITCH", "2023 Q1"),
+                    ("ni-digital", "NI-Digital Pattern Driver", "2023 Q3"), ("ni-syscfg", "NI System Configuration", "2023 Q3")]
+
+systems = {}    # target -> (list of Resource, list of SoftwareComponent); default_system() for unknown targets
+
+
+class Resource:
+    """Hardware resource, with the properties of a nisyscfg resource."""
+
+    def __init__(self, name, product_name, serial_number=None, slot_number=None, is_chassis=False,
+                 connects_to_link_name=None, provides_link_name=None, firmware_revision=None):
+        self.expert_user_alias = [name]
+        self.product_name = product_name
+        self.serial_number = serial_number
+        self.is_chassis = is_chassis
+        self.is_device = not is_chassis
+        self.is_present = True
+        self.is_ni_product = True
+        self.connects_to_link_name = connects_to_link_name
+        self.provides_link_name = provides_link_name
+        self.firmware_revision = firmware_revision
+        self.supports_firmware_update = firmware_revision is not None
+        if slot_number is not None:
+            self.slot_number = slot_number
+
+    def get_property(self, name, default=None):
+        return getattr(self, name, default)
+
+
+class SoftwareComponent:
+    """Installed software component, with the attributes of a nisyscfg component."""
+
+    def __init__(self, id, title, version, type=0, details=0):
+        self.id = id
+        self.title = title
+        self.version = version
+        self.type = type
+        self.details = details
+
+
+class Filter:
+    """Hardware filter: the properties set on it must match those of the resources found."""
+
+
+class SystemResource:
+    """session.resource: the system itself."""
+
+    def __init__(self, system_start_time):
+        self.system_start_time = system_start_time
+
+    @property
+    def current_time(self):
+        return datetime.datetime.now()
+
+
+def default_system(target, num_chassis=1, modules=None):
+    """Return the resources and software components of a system with PXI chassis filled with 'modules'."""
+    modules = modules or DEFAULT_MODULES
+    resources = []
+    for chassis in range(1, num_chassis + 1):
+        link = f"PXI{chassis - 1}"
+        resources.append(Resource(f"PXIChassis{chassis}", "PXIe-1085", f"{target}-C{chassis}", is_chassis=True, provides_link_name=link))
+        for slot, product in modules.items():
+            resources.append(Resource(f"PXI{chassis}Slot{slot}", product, f"{target}-{chassis:02d}{slot:02d}", slot,
+                                      connects_to_link_name=link, firmware_revision="23.0.0"))
+    software = [SoftwareComponent(id, title, version) for id, title, version in DEFAULT_SOFTWARE]
+    return resources, software
+
+
+class Session:
+    """Simulated nisyscfg session.
+
+    Arguments
+    ---------
+    - target, username, password, language, force_property_refresh, timeout: As nisyscfg.Session; only target is used.
+    - timing: TimingModel of the session (simulated_session.default_timing by default).
+    """
+
+    def __init__(self, target="localhost", username=None, password=None, language=None, force_property_refresh=True,
+                 timeout=300.0, timing=None):
+        self.target = target
+        self.timing = timing or simulated_session.default_timing
+        self.resources, self.software = systems.get(target) or default_system(target)
+        self.resource = SystemResource(datetime.datetime(2026, 1, 1))
+        self.timing.call()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.timing.call()
+
+    def create_filter(self):
+        return Filter()
+
+    def find_hardware(self, filter=None, filter_mode=None, expert_names=None):
+        """Return the resources matching every property set on the filter."""
+        criteria = dict(vars(filter)) if filter is not None else {}
+        found = [resource for resource in self.resources
+                 if all(getattr(resource, name, None) == value for name, value in criteria.items())]
+        self.timing.call(len(found))
+        return iter(found)
+
+    def get_installed_software_components(self, item_types=None, cached=False):
+        self.timing.call(len(self.software))
+        return list(self.software)
@@ -0,0 +1,221 @@
+"""Simulated driver sessions.
+
+This module is the common base of the simulated_<driver>.py modules, which provide pure-Python stand-ins for the
+Session classes of nidcpower, niscope, nidmm, nifgen, niswitch, nidigital and nisyscfg. They accept the same calls as
+the examples make and return synthetic but realistic data, so the acquisition and analysis code can run, be
+benchmarked and be regression-tested on machines without NI hardware or drivers.
+
+The time every driver call takes is modeled by a TimingModel: a fixed latency per call, plus the time to transfer the
+data at a given throughput. The model either really waits (realtime) or only accounts for the time, so benchmarks can
+measure the Python overhead alone.
+
+install() registers the simulated modules under the names of the real drivers, so unmodified examples use them:
+
+    import simulated_session
+    simulated_session.install()
+    import niscope      # simulated_niscope
+"""
+
+# Module imports
+import importlib
+import sys
+import time
+
+import numpy as np
+
+DRIVERS = ("nidcpower", "niscope", "nidmm", "nifgen", "niswitch", "nidigital", "nisyscfg")
+
+
+class TimingModel:
+    """Time taken by the driver calls of a simulated session.
+
+    Arguments
+    ---------
+    - call_latency: Time taken by every driver call, in seconds.
+    - throughput: Number of samples transferred per second by fetches and waveform downloads.
+    - jitter: Standard deviation of the call latency, relative to it.
+    - realtime: Wait for the modeled time; when False, the time is only added to simulated_time.
+    - seed: Seed of the jitter.
+
+    Attributes
+    ----------
+    - simulated_time: Total modeled time, in seconds.
+    - calls: Number of driver calls.
+    """
+
+    def __init__(self, call_latency=20e-6, throughput=float("inf"), jitter=0.0, realtime=True, seed=None):
+        self.call_latency = call_latency
+        self.throughput = throughput
+        self.jitter = jitter
+        self.realtime = realtime
+        self.simulated_time = 0.0
+        self.calls = 0
+        self._rng = np.random.default_rng(seed)
+
+    def call(self, samples=0, duration=0.0):
+        """Model one driver call transferring 'samples', which also lasts 'duration' on the instrument. Returns its time."""
+        latency = self.call_latency
+        if self.jitter:
+            latency *= max(0.0, 1.0 + self.jitter * self._rng.standard_normal())
+        total = latency + samples / self.throughput + duration
+        self.simulated_time += total
+        self.calls += 1
+        if self.realtime and total > 0:
+            time.sleep(total)
+        return total
+
+
+default_timing = TimingModel()
+
+
+class RepeatedCapabilities:
+    """session.channels[...] of a simulated session."""
+
+    def __init__(self, session):
+        self._session = session
+
+    def __getitem__(self, name):
+        if isinstance(name, (list, tuple, range)):
+            name = ",".join(str(item) for item in name)
+        view = object.__new__(type(self._session))
+        view.__dict__.update(self._session.__dict__)
+        view.__dict__["_channel"] = str(name)
+        return view
+
+
+class _Running:
+    """Returned by initiate(): aborts when used as a context manager."""
+
+    def __init__(self, session):
+        self._session = session
+
+    def __enter__(self):
+        return self._session
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._session.abort()
+
+
+class SimulatedSession:
+    """Base of the simulated sessions.
+
+    Attributes are stored per channel (or per pin, for nidigital): setting one through session.channels[...] only
+    affects those channels, setting it on the session affects all of them. Reading an attribute that was never set
+    returns the driver default from DEFAULTS, and reading one the simulated driver does not know raises AttributeError.
+
+    Arguments
+    ---------
+    - resource_name: Resource name, only stored.
+    - timing: TimingModel of the session (default_timing by default).
+    - seed: Seed of the synthetic data.
+    """
+
+    DEFAULTS = {}
+
+    def __init__(self, resource_name="", timing=None, seed=None, channel_names=("0",)):
+        self.__dict__.update(_root=None, _channel="", _attributes={}, resource_name=resource_name,
+                             timing=timing or default_timing, rng=np.random.default_rng(seed),
+                             channel_names=list(channel_names), running=False, closed=False)
+        self.__dict__["_root"] = self
+        self.__dict__["channels"] = RepeatedCapabilities(self)
+        self.timing.call()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attributes = self.__dict__["_attributes"]
+        for key in self._keys() + [""]:
+            if (key, name) in attributes:
+                return attributes[(key, name)]
+        if name in self.DEFAULTS:
+            return self.DEFAULTS[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__ or name.startswith("_"):
+            self.__dict__[name] = value
+            return
+        self.timing.call()
+        value = self._coerce(name, value)
+        attributes = self._attributes
+        if not self._channel:
+            for key in [key for key in attributes if key[1] == name]:
+                del attributes[key]
+        for key in self._keys():
+            attributes[(key, name)] = value
+
+    @property
+    def root(self):
+        """The session itself, for views created by session.channels[...]."""
+        return self._root
+
+    def initiate(self):
+        self.timing.call()
+        self._root.running = True
+        self._on_initiate()
+        return _Running(self)
+
+    def abort(self):
+        self.timing.call()
+        self._root.running = False
+
+    def commit(self):
+        self.timing.call()
+
+    def reset(self):
+        self.timing.call()
+        self._attributes.clear()
+
+    def close(self):
+        if not self._root.closed:
+            self.timing.call()
+            self._root.running = False
+            self._root.closed = True
+
+    def _keys(self):
+        """Keys under which the attributes of this session or view are stored."""
+        return self._channel_list() if self._channel else [""]
+
+    def _channel_list(self):
+        """Channel names of this session or view."""
+        if not self._channel:
+            return list(self.channel_names)
+        return [name.strip() for name in self._channel.split(",") if name.strip()]
+
+    def _coerce(self, name, value):
+        """Coerce a written attribute value, as the driver would."""
+        return value
+
+    def _on_initiate(self):
+        """Start the simulated acquisition or generation."""
+
+
+def install(drivers=DRIVERS, timing=None):
+    """Register the simulated modules under the names of the real drivers and return them.
+
+    Arguments
+    ---------
+    - drivers: Names of the drivers to replace.
+    - timing: TimingModel used by default by all the simulated sessions.
+    """
+    global default_timing
+    if timing is not None:
+        default_timing = timing
+    modules = {}
+    for driver in drivers:
+        modules[driver] = sys.modules[driver] = importlib.import_module(f"simulated_{driver}")
+    return modules
+
+
+def uninstall(drivers=DRIVERS):
+    """Remove the simulated modules registered by install()."""
+    for driver in drivers:
+        module = sys.modules.get(driver)
+        if module is not None and module.__name__ == f"simulated_{driver}":
+            del sys.modules[driver]